@@ -52,6 +52,14 @@ def parse_args(argv: list[str] | None = None):
         choices=["gemini", "groq", "sambanova"],
         help="LLM provider (default: from LLM_PROVIDER env or gemini)",
     )
+    parser.add_argument(
+        "--scrape-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Time budget for job scraping and for company research, each; "
+        "partial results are used when it runs out, 0 = no limit "
+        "(default: from SCRAPE_BUDGET env or 90)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -168,6 +176,9 @@ def run_pipeline_from_cli(args) -> int:
     
     # Resolve provider: CLI arg > env var > default
     provider = args.provider or os.getenv("LLM_PROVIDER", "gemini")
+    scrape_budget = args.scrape_budget
+    if scrape_budget is None:
+        scrape_budget = float(os.getenv("SCRAPE_BUDGET", "90"))
 
     # Build initial context
     ctx = {
@@ -176,6 +187,7 @@ def run_pipeline_from_cli(args) -> int:
         "questions": [q.strip() for q in args.questions if q.strip()],
         "skip_notion": args.skip_notion,
         "provider": provider,
+        "scrape_budget": scrape_budget,
     }
 
     # Dry run
@@ -233,6 +245,10 @@ def run_pipeline_from_cli(args) -> int:
 def main():
     args = parse_args()
     return_code = run_pipeline_from_cli(args)
+
+    # Let a background company-research refresh land before exiting
+    from modules.job_scraper import wait_for_research_refreshes
+    wait_for_research_refreshes(log=Console().print)
     sys.exit(return_code)
 
 
@@ -0,0 +1,328 @@
+"""Shared warm Chromium for scraping and company research, and the form
+filler's own headed browser.
+
+Launching Chromium costs 1–3s and hundreds of MB, so instead of a fresh
+browser per call one headless Chromium serves the whole process: it runs
+as a Playwright browser server (a websocket endpoint on 127.0.0.1 whose
+path is a random token, so other local processes cannot drive it), and
+each thread that needs a page connects its own Playwright driver to it and
+opens an isolated context per page. Concurrent pages are capped per
+process, and the browser is restarted after BROWSER_RECYCLE_PAGES pages or
+BROWSER_RECYCLE_MINUTES, once no page is open.
+
+When BROWSER_WS_ENDPOINT is set (web_ui.py runs one BrowserServer for its
+pipeline subprocesses and recycles it between runs), headless pages connect
+to that endpoint instead. web_ui.py cannot count the pages its
+subprocesses open, so its server is recycled by BROWSER_RECYCLE_MINUTES
+only. A machine where the server cannot start falls back to one browser
+launched per thread.
+
+Pages record / replay their traffic under SCRAPE_FIXTURES (see
+modules/scrape_fixtures.py).
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import tempfile
+import threading
+import subprocess
+from contextlib import contextmanager
+
+from modules import scrape_fixtures
+
+BROWSER_WS_ENDPOINT = os.getenv("BROWSER_WS_ENDPOINT", "")
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "4"))  # per process
+BROWSER_RECYCLE_PAGES = int(os.getenv("BROWSER_RECYCLE_PAGES", "50"))
+BROWSER_RECYCLE_MINUTES = float(os.getenv("BROWSER_RECYCLE_MINUTES", "30"))
+
+_SERVER_START_TIMEOUT = 10  # seconds for a new browser server to print its endpoint
+
+_page_slots = threading.BoundedSemaphore(BROWSER_MAX_PAGES)
+_local = threading.local()
+
+
+class _WarmBrowser:
+    """One Playwright driver + browser connection, owned by one thread.
+
+    Playwright's sync API objects cannot cross threads, hence one per
+    thread; headless ones are connections to the shared Chromium.
+    """
+
+    def __init__(self, headless: bool):
+        self.headless = headless
+        self.playwright = None
+        self.browser = None
+        self.generation = None  # Server generation the connection belongs to
+        self.pages_served = 0
+
+    def driver(self):
+        if self.playwright is None:
+            from playwright.sync_api import sync_playwright
+            self.playwright = sync_playwright().start()
+        return self.playwright
+
+    def get(self, endpoint: str = "", generation=None):
+        """The browser: a connection to `endpoint` (reconnected when the
+        server was restarted), or a locally launched one."""
+        stale = (
+            self.browser is None
+            or not self.browser.is_connected()
+            or generation != self.generation
+        )
+        if not stale and not endpoint and self.pages_served >= BROWSER_RECYCLE_PAGES:
+            stale = True
+        if stale:
+            self.close_browser()
+            self.browser = self._connect_or_launch(endpoint)
+            self.generation = generation
+            self.pages_served = 0
+        return self.browser
+
+    def _connect_or_launch(self, endpoint: str):
+        if endpoint:
+            try:
+                return self.driver().chromium.connect(endpoint)
+            except Exception:
+                pass  # Shared browser gone — launch locally
+        return self.driver().chromium.launch(headless=self.headless)
+
+    def close_browser(self):
+        if self.browser is not None:
+            try:
+                # For a server connection this only disconnects
+                self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+
+    def stop(self):
+        self.close_browser()
+        if self.playwright is not None:
+            try:
+                self.playwright.stop()
+            except Exception:
+                pass
+            self.playwright = None
+
+
+def _thread_browser(headless: bool) -> _WarmBrowser:
+    browsers = getattr(_local, "browsers", None)
+    if browsers is None:
+        browsers = _local.browsers = {}
+    if headless not in browsers:
+        browsers[headless] = _WarmBrowser(headless)
+    return browsers[headless]
+
+
+@contextmanager
+def browser_page(headless: bool = True, **context_kwargs):
+    """Yield a new page in an isolated context on the process's warm browser.
+
+    Blocks while BROWSER_MAX_PAGES pages are already open in this process.
+    The context (cookies, storage) is discarded on exit.
+    """
+    with _page_slots:
+        warm = _thread_browser(headless)
+        lease = _lease_shared_browser(warm) if headless else None
+        try:
+            endpoint, generation = lease or ("", None)
+            context = warm.get(endpoint, generation).new_context(**context_kwargs)
+            scrape_fixtures.attach_to_context(context)
+            try:
+                yield context.new_page()
+            finally:
+                try:
+                    context.close()
+                except Exception:
+                    pass
+                warm.pages_served += 1
+        finally:
+            if lease and not BROWSER_WS_ENDPOINT:
+                _process_server.release()
+
+
+@contextmanager
+def interactive_page(**context_kwargs):
+    """Yield a page in a headed browser of its own, for a user to watch and
+    act in (the form filler). It does not count against BROWSER_MAX_PAGES
+    and is never recorded or replayed under SCRAPE_FIXTURES.
+    """
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=False)
+        try:
+            yield browser.new_context(**context_kwargs).new_page()
+        finally:
+            try:
+                browser.close()
+            except Exception:
+                pass
+
+
+def _lease_shared_browser(warm: _WarmBrowser) -> tuple[str, int] | None:
+    """(endpoint, generation) of the shared headless Chromium: web_ui's, or
+    this process's own, started on first use. None to launch locally."""
+    if BROWSER_WS_ENDPOINT:
+        return BROWSER_WS_ENDPOINT, 0
+    return _process_server.acquire()
+
+
+def shutdown():
+    """Close this thread's browsers and Playwright drivers."""
+    for warm in getattr(_local, "browsers", {}).values():
+        warm.stop()
+    _local.browsers = {}
+
+
+# ─── Shared Browser Server ───────────────────────────────────────
+
+
+def _read_endpoint(process: subprocess.Popen) -> str:
+    """The first line the server prints (its ws endpoint), or "" if none
+    comes within _SERVER_START_TIMEOUT. Later output is drained."""
+    lines = queue.Queue()
+
+    def pump():
+        for line in process.stdout:
+            lines.put(line.strip())
+        lines.put("")  # Exited without an endpoint
+
+    threading.Thread(target=pump, name="browser-server-stdout", daemon=True).start()
+    try:
+        return lines.get(timeout=_SERVER_START_TIMEOUT)
+    except queue.Empty:
+        return ""
+
+
+def start_browser_server() -> tuple[subprocess.Popen, str] | None:
+    """Start a long-lived headless Chromium behind Playwright's browser server.
+
+    Returns (process, ws endpoint) once the server is listening, or None
+    when Playwright or its Chromium is not installed or does not start. The
+    caller owns the process. The endpoint's path is a random token, and
+    Chromium gets Playwright's usual launch flags (no sandbox as root).
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", prefix="jobquest-browser-", delete=False
+    ) as config:
+        json.dump({"headless": True, "host": "127.0.0.1"}, config)
+    try:
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "playwright", "launch-server",
+                "--browser", "chromium", "--config", config.name,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except OSError:
+        os.unlink(config.name)
+        return None
+    try:
+        endpoint = _read_endpoint(process)
+    finally:
+        os.unlink(config.name)
+    if not endpoint.startswith("ws://"):
+        _terminate(process)
+        return None
+    return process, endpoint
+
+
+def _terminate(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+class BrowserServer:
+    """A shared headless Chromium that is restarted when due: after
+    BROWSER_RECYCLE_PAGES pages (counted by acquire/release, so only for
+    this process's own server) or BROWSER_RECYCLE_MINUTES, and only while
+    no page is open on it. Each restart bumps `generation`, so connected
+    threads know to reconnect."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.process: subprocess.Popen | None = None
+        self.endpoint = ""
+        self.generation = 0
+        self.unavailable = False  # Chromium missing or failed to start
+        self._started_at = 0.0
+        self._pages_served = 0
+        self._open_pages = 0
+
+    def _running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def _due(self) -> bool:
+        age = time.monotonic() - self._started_at
+        return self._pages_served >= BROWSER_RECYCLE_PAGES or (
+            BROWSER_RECYCLE_MINUTES > 0 and age >= BROWSER_RECYCLE_MINUTES * 60
+        )
+
+    def _restart(self) -> bool:
+        self._stop()
+        server = start_browser_server()
+        if server is None:
+            self.unavailable = True
+            print(
+                "browser_pool: shared Chromium did not start; "
+                "launching one browser per thread instead",
+                file=sys.stderr,
+            )
+            return False
+        self.process, self.endpoint = server
+        self.generation += 1
+        self._started_at = time.monotonic()
+        self._pages_served = 0
+        return True
+
+    def _stop(self):
+        if self.process is not None:
+            _terminate(self.process)
+        self.process = None
+        self.endpoint = ""
+
+    def acquire(self) -> tuple[str, int] | None:
+        """(endpoint, generation) for one page, starting or recycling the
+        browser first if needed; pair with release()."""
+        with self._lock:
+            if self.unavailable:
+                return None
+            if not self._running() or (self._due() and not self._open_pages):
+                if not self._restart():
+                    return None
+            self._open_pages += 1
+            return self.endpoint, self.generation
+
+    def release(self):
+        with self._lock:
+            self._open_pages -= 1
+            self._pages_served += 1
+
+    def recycle_if_due(self) -> str:
+        """Start the browser, or restart it if due; for a caller that knows
+        no page is open (web_ui.py between runs). Returns the endpoint."""
+        with self._lock:
+            if not self.unavailable and (not self._running() or self._due()):
+                self._restart()
+            return self.endpoint if self._running() else ""
+
+    def stop(self):
+        with self._lock:
+            self._stop()
+
+
+# This process's own shared browser (unused when BROWSER_WS_ENDPOINT is set)
+_process_server = BrowserServer()
+
+# Registered last so it runs first: drivers disconnect, then Chromium stops
+atexit.register(_process_server.stop)
+atexit.register(shutdown)
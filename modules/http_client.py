@@ -0,0 +1,568 @@
+"""Shared HTTP transport for job scraping and company research.
+
+One pooled requests.Session per process: keep-alive, per-host connection
+limits, retry with backoff on transient errors, and configurable timeouts.
+Every fetch in modules/job_scraper.py goes through here, so connection reuse
+can be reported per run (how many TCP/TLS handshakes were saved).
+
+Responses fetched with cache=True are persisted under .scrape_cache/ with their
+ETag / Last-Modified validators: fresh entries are served from disk, stale ones
+are revalidated with a conditional request.
+
+Page fetches can be streamed with a byte cap, an early-stop predicate and
+a Content-Type check (http_get max_bytes / stop_at / content_types), so
+multi-megabyte pages are neither held in memory nor parsed in full.
+
+Under SCRAPE_FIXTURES=record / replay (modules/scrape_fixtures.py) the
+session records every response, or is served from recorded fixtures by a
+local stand-in server; the disk cache is bypassed in both modes.
+
+Inside deadline_scope(seconds) every request's timeout is capped to the time
+left, retries do not wait past it, and requests fail fast with
+DeadlineExceeded once it is used up. A Deadline can also be cancelled from
+another thread (hedged scrapes stop their losing strategies that way).
+"""
+
+import os
+import json
+import math
+import time
+import base64
+import hashlib
+import threading
+from contextlib import contextmanager
+from functools import partial
+from contextvars import ContextVar
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util.retry import Retry
+
+from modules import scrape_fixtures
+
+# Timeouts (seconds): connect is short, read is the per-call default
+HTTP_CONNECT_TIMEOUT = float(os.getenv("SCRAPER_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("SCRAPER_READ_TIMEOUT", "15"))
+
+# Pool sizing: number of hosts kept warm, and max open connections per host
+HTTP_POOL_HOSTS = int(os.getenv("SCRAPER_POOL_HOSTS", "20"))
+HTTP_POOL_PER_HOST = int(os.getenv("SCRAPER_POOL_PER_HOST", "4"))
+# Max wait for a free pooled connection when all of a host's are checked out
+HTTP_POOL_TIMEOUT = float(os.getenv("SCRAPER_POOL_TIMEOUT", "10"))
+
+# Retries on connection errors and 429/5xx, with exponential backoff
+HTTP_RETRIES = int(os.getenv("SCRAPER_HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("SCRAPER_HTTP_BACKOFF", "0.5"))
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Streamed page fetches: body cap (decompressed bytes) and read chunk size
+HTTP_MAX_PAGE_BYTES = int(os.getenv("SCRAPER_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+_CHUNK_BYTES = 64 * 1024
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+# On-disk response cache (set SCRAPE_CACHE_TTL=0 to disable)
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = PROJECT_ROOT / ".scrape_cache"
+CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", str(24 * 3600)))  # 24 hours
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0, "connections": 0, "bytes": 0,
+    "cache_hits": 0, "revalidated": 0, "truncated": 0,
+}
+
+
+def _count(key: str, n: int = 1):
+    with _stats_lock:
+        _stats[key] += n
+
+
+# Connection classes that count real socket connects. urllib3 reconnects a
+# dropped keep-alive connection in place, so pool.num_connections undercounts.
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _count("connections")
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _count("connections")
+        super().connect()
+
+
+class _BoundedWaitPool:
+    """The pools block when a host's connections are all checked out; wait at
+    most HTTP_POOL_TIMEOUT (or the time left in the deadline) for one back,
+    so a connection that is never released cannot hang every later request."""
+
+    def _get_conn(self, timeout=None):
+        if timeout is None:
+            timeout = budget_timeout(HTTP_POOL_TIMEOUT)
+        return super()._get_conn(timeout=timeout)
+
+
+class _CountingHTTPPool(_BoundedWaitPool, HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSPool(_BoundedWaitPool, HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools record requests and new connections."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPPool,
+            "https": _CountingHTTPSPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        _count("requests")
+        try:
+            if scrape_fixtures.replaying():
+                return self._send_replay(request, *args, **kwargs)
+            resp = super().send(request, *args, **kwargs)
+        except EmptyPoolError as e:
+            raise requests.ConnectionError(e, request=request)
+        except requests.ConnectionError as e:
+            # requests wraps whatever urllib3's retry loop raises, including
+            # _DeadlineRetry's DeadlineExceeded: pass that on as itself
+            if e.args and isinstance(e.args[0], DeadlineExceeded):
+                raise e.args[0]
+            raise
+        if scrape_fixtures.recording():
+            scrape_fixtures.record_response(request, resp)
+        if not kwargs.get("stream"):
+            _count("bytes", len(resp.content or b""))
+        return resp
+
+    def _send_replay(self, request, *args, **kwargs):
+        original_url = scrape_fixtures.to_replay(request)
+        resp = super().send(request, *args, **kwargs)
+        if scrape_fixtures.replay_missed(resp):
+            resp.close()
+            raise requests.ConnectionError(
+                f"No fixture for {request.method} {original_url}", request=request
+            )
+        # Redirects and resp.url are resolved against the recorded URL
+        request.url = resp.url = original_url
+        if not kwargs.get("stream"):
+            _count("bytes", len(resp.content or b""))
+        return resp
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first call."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = _DeadlineRetry(
+                    total=HTTP_RETRIES,
+                    backoff_factor=HTTP_BACKOFF,
+                    status_forcelist=_RETRY_STATUSES,
+                    # Ashby's GraphQL POST is a read-only query, safe to retry
+                    allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+                    raise_on_status=False,
+                )
+                adapter = _CountingAdapter(
+                    pool_connections=HTTP_POOL_HOSTS,
+                    pool_maxsize=HTTP_POOL_PER_HOST,
+                    pool_block=True,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+class UnexpectedContent(requests.RequestException):
+    """The response's Content-Type is not one the caller can parse."""
+
+
+def _timeout(timeout: float | None) -> tuple[float, float]:
+    read = budget_timeout(HTTP_READ_TIMEOUT if timeout is None else timeout)
+    return (min(HTTP_CONNECT_TIMEOUT, read), read)
+
+
+def _read_limited(
+    resp: requests.Response, max_bytes: int, stop_at, content_types
+) -> requests.Response:
+    """Read a streamed response body, stopping at `max_bytes` or as soon as
+    stop_at(body, start) is true (`start`: offset of the newest chunk).
+
+    The body read so far becomes resp.content; resp.truncated tells whether
+    the download was cut off (its connection is then dropped, not pooled).
+    """
+    ctype = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_types and resp.ok and ctype and ctype not in content_types:
+        resp.close()
+        raise UnexpectedContent(f"Unexpected content type {ctype} for {resp.url}")
+
+    body = bytearray()
+    truncated = False
+    for chunk in resp.iter_content(_CHUNK_BYTES):
+        if budget_expired():
+            resp.close()
+            raise DeadlineExceeded(f"time budget used up while reading {resp.url}")
+        start = len(body)
+        body += chunk
+        if len(body) >= max_bytes or (stop_at and stop_at(body, start)):
+            truncated = True
+            break
+    if truncated:
+        resp.close()
+        _count("truncated")
+    _count("bytes", len(body))
+    resp._content = bytes(body[:max_bytes])
+    resp._content_consumed = True
+    resp.truncated = truncated
+    return resp
+
+
+# ─── Deadlines ───────────────────────────────────────────────────
+
+
+class DeadlineExceeded(requests.Timeout):
+    """The time budget of the enclosing deadline_scope() is used up."""
+
+
+class Deadline:
+    """A time budget on the monotonic clock (math.inf: none). cancel() ends
+    it early, from any thread."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.cancelled = False
+        self._woken = threading.Event()
+
+    def cancel(self):
+        self.cancelled = True
+        self.expires_at = time.monotonic()
+        self._woken.set()
+
+    def sleep(self, seconds: float):
+        """Sleep `seconds`, waking early if cancelled."""
+        self._woken.wait(seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, default: float) -> float:
+        """`default` capped to the time left; raises once nothing is left."""
+        left = self.remaining()
+        if self.cancelled:
+            raise DeadlineExceeded("cancelled")
+        if left <= 0:
+            raise DeadlineExceeded(f"time budget of {self.seconds:g}s used up")
+        return min(default, left)
+
+
+# Context-local so concurrent scrapes keep separate budgets. Worker threads
+# only see it when started with contextvars.copy_context().run (asyncio.to_thread does).
+_deadline: ContextVar[Deadline | None] = ContextVar("scrape_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: float | None):
+    """Run the block under a time budget (None or <= 0: no limit).
+
+    A nested scope never extends an enclosing one. Yields the active
+    Deadline (or None).
+    """
+    parent = _deadline.get()
+    if not seconds or seconds <= 0:
+        yield parent
+        return
+    deadline = Deadline(seconds)
+    if parent and parent.expires_at < deadline.expires_at:
+        deadline = parent
+    with use_deadline(deadline):
+        yield deadline
+
+
+def child_deadline() -> Deadline:
+    """A Deadline of its own (so it can be cancelled) that ends no later than
+    the current one; run work under it with use_deadline()."""
+    parent = _deadline.get()
+    return Deadline(parent.remaining() if parent else math.inf)
+
+
+@contextmanager
+def use_deadline(deadline: Deadline | None):
+    """Run the block under `deadline`."""
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def budget_timeout(default: float) -> float:
+    """`default` seconds, capped to the current deadline's remaining budget."""
+    deadline = _deadline.get()
+    return deadline.timeout(default) if deadline else default
+
+
+def budget_expired() -> bool:
+    deadline = _deadline.get()
+    return bool(deadline and deadline.expired())
+
+
+def budget_cancelled() -> bool:
+    """True if the current deadline was cancelled (not merely used up)."""
+    deadline = _deadline.get()
+    return bool(deadline and deadline.cancelled)
+
+
+class _DeadlineRetry(Retry):
+    """Retry whose waits (backoff, or a 429/503's Retry-After) respect the
+    current deadline: a retry that could not start before it ends raises
+    DeadlineExceeded instead of sleeping past it."""
+
+    def sleep(self, response=None):
+        deadline = _deadline.get()
+        if deadline is None:
+            return super().sleep(response)
+        wait = 0.0
+        if self.respect_retry_after_header and response:
+            wait = self.get_retry_after(response) or 0.0
+        wait = wait or self.get_backoff_time()
+        deadline.timeout(wait)  # raises if already used up or cancelled
+        if wait >= deadline.remaining():
+            raise DeadlineExceeded(
+                f"retry in {wait:g}s would outlast the time budget of {deadline.seconds:g}s"
+            )
+        deadline.sleep(wait)
+        deadline.timeout(wait)  # cancelled while waiting
+
+
+# ─── Disk Cache ──────────────────────────────────────────────────
+
+
+def _cache_path(namespace: str, key: str) -> Path:
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return CACHE_DIR / namespace / f"{digest}.json"
+
+
+def cache_get(namespace: str, key: str, ttl: float | None = None) -> dict | None:
+    """Load a cached JSON entry if it is younger than `ttl` seconds.
+
+    Entries carry a `stored_at` timestamp. Returns None on miss, expiry,
+    or a corrupt file.
+    """
+    ttl = CACHE_TTL if ttl is None else ttl
+    if ttl <= 0 or scrape_fixtures.active():
+        return None
+    entry = _cache_read(_cache_path(namespace, key))
+    if entry and time.time() - entry.get("stored_at", 0) < ttl:
+        return entry
+    return None
+
+
+def cache_put(namespace: str, key: str, entry: dict):
+    """Persist a JSON-serialisable entry, stamping it with `stored_at`."""
+    if CACHE_TTL <= 0 or scrape_fixtures.active():
+        return
+    entry = {**entry, "stored_at": time.time()}
+    path = _cache_path(namespace, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry))
+        tmp.replace(path)  # atomic: parallel pipeline runs share the cache
+    except OSError:
+        pass
+
+
+def _cache_read(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _request_key(method: str, url: str, kwargs: dict) -> str:
+    """Cache key: method + URL + query params + request body."""
+    body = kwargs.get("json")
+    if body is not None:
+        body = json.dumps(body, sort_keys=True)
+    else:
+        body = kwargs.get("data") or ""
+    params = json.dumps(kwargs.get("params") or {}, sort_keys=True)
+    return f"{method} {url} {params} {body}"
+
+
+def _entry_from_response(resp: requests.Response) -> dict:
+    headers = {
+        k: v for k, v in resp.headers.items()
+        if k.lower() in ("etag", "last-modified", "content-type")
+    }
+    return {
+        "url": resp.url,
+        "status": resp.status_code,
+        "headers": headers,
+        "encoding": resp.encoding,
+        "body": base64.b64encode(resp.content).decode("ascii"),
+        "truncated": getattr(resp, "truncated", False),
+    }
+
+
+def _response_from_entry(entry: dict) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = entry["status"]
+    resp.url = entry["url"]
+    resp.headers.update(entry.get("headers", {}))
+    resp.encoding = entry.get("encoding")
+    resp._content = base64.b64decode(entry["body"])
+    resp.truncated = entry.get("truncated", False)
+    resp.from_cache = True
+    return resp
+
+
+def _cached_request(
+    method: str, url: str, timeout: float | None, ttl: float | None, kwargs: dict,
+    read=None,
+) -> requests.Response:
+    """`read` finishes a streamed response (see _read_limited) before caching."""
+    read = read or (lambda resp: resp)
+    ttl = CACHE_TTL if ttl is None else ttl
+    if ttl <= 0 or scrape_fixtures.active():
+        return read(get_session().request(method, url, timeout=_timeout(timeout), **kwargs))
+
+    key = _request_key(method, url, kwargs)
+    path = _cache_path("http", key)
+    entry = _cache_read(path)
+    if entry and time.time() - entry.get("stored_at", 0) < ttl:
+        _count("cache_hits")
+        return _response_from_entry(entry)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry:
+        validators = {k.lower(): v for k, v in entry.get("headers", {}).items()}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last-modified"):
+            headers["If-Modified-Since"] = validators["last-modified"]
+
+    try:
+        resp = get_session().request(
+            method, url, headers=headers, timeout=_timeout(timeout), **kwargs
+        )
+        if resp.status_code != 304:
+            resp = read(resp)
+    except UnexpectedContent:
+        raise
+    except requests.RequestException:
+        if entry:
+            # Serve stale rather than fail a re-run on a flaky network
+            return _response_from_entry(entry)
+        raise
+
+    if resp.status_code == 304 and entry:
+        resp.close()  # Streamed and unread: hand its connection back to the pool
+        _count("revalidated")
+        cache_put("http", key, {k: v for k, v in entry.items() if k != "stored_at"})
+        return _response_from_entry(entry)
+    if resp.ok:
+        cache_put("http", key, _entry_from_response(resp))
+    return resp
+
+
+# ─── Public API ──────────────────────────────────────────────────
+
+
+def http_get(
+    url: str,
+    timeout: float | None = None,
+    cache: bool = False,
+    ttl: float | None = None,
+    max_bytes: int | None = None,
+    stop_at=None,
+    content_types: tuple[str, ...] | None = None,
+    **kwargs,
+) -> requests.Response:
+    """GET through the shared session. `timeout` is the read timeout in seconds.
+
+    With cache=True the response is served from / stored in the disk cache
+    (`ttl` seconds, default SCRAPE_CACHE_TTL) and revalidated when stale.
+
+    With max_bytes, stop_at or content_types the body is streamed: other
+    Content-Types raise UnexpectedContent before it is read, and the
+    download stops at max_bytes (default SCRAPER_MAX_PAGE_BYTES) or once
+    stop_at(body, start) returns True. resp.truncated tells which happened.
+    """
+    reader = None
+    if max_bytes or stop_at or content_types:
+        kwargs["stream"] = True
+        reader = partial(
+            _read_limited, max_bytes=max_bytes or HTTP_MAX_PAGE_BYTES,
+            stop_at=stop_at, content_types=content_types,
+        )
+
+    if cache:
+        return _cached_request("GET", url, timeout, ttl, kwargs, reader)
+    resp = get_session().get(url, timeout=_timeout(timeout), **kwargs)
+    return reader(resp) if reader else resp
+
+
+def http_post(
+    url: str,
+    timeout: float | None = None,
+    cache: bool = False,
+    ttl: float | None = None,
+    **kwargs,
+) -> requests.Response:
+    """POST through the shared session. Cacheable for read-only APIs (GraphQL)."""
+    if cache:
+        return _cached_request("POST", url, timeout, ttl, kwargs)
+    return get_session().post(url, timeout=_timeout(timeout), **kwargs)
+
+
+def http_head(url: str, timeout: float | None = None, **kwargs) -> requests.Response:
+    """HEAD through the shared session."""
+    return get_session().head(url, timeout=_timeout(timeout), **kwargs)
+
+
+def transport_stats() -> dict:
+    """Connection reuse counters since process start.
+
+    Returns dict: requests, connections (new TCP/TLS handshakes), reused,
+    bytes (response bodies received), cache_hits (served from disk),
+    revalidated (304 Not Modified), truncated (streamed pages cut off early)
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["reused"] = max(0, stats["requests"] - stats["connections"])
+    return stats
+
+
+def format_transport_stats() -> str:
+    """One-line summary of transport_stats() for pipeline logs."""
+    s = transport_stats()
+    return (
+        f"HTTP: {s['requests']} requests over {s['connections']} connections "
+        f"({s['reused']} handshakes saved), {s['bytes'] // 1024} KB, "
+        f"{s['cache_hits']} cache hits, {s['revalidated']} revalidated"
+        + (f", {s['truncated']} truncated" if s["truncated"] else "")
+    )
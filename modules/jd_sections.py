@@ -0,0 +1,270 @@
+"""Job description sectioning for the LLM steps.
+
+Splits a scraped JD into sections (intro, responsibilities, requirements,
+benefits, about, legal, other) by its headings, and builds a per-step view
+that drops what the step has no use for: EEO / privacy text, benefits lists,
+company marketing. Heuristic and conservative — unrecognised headings are
+kept, and a JD without recognisable structure is passed through whole.
+"""
+
+import re
+
+# Heading patterns, checked in this order ("About you" is requirements,
+# "About the role" responsibilities, any other "About ..." company marketing)
+_HEADING_KINDS = [
+    ("legal", re.compile(
+        r"equal (employment )?opportunit|\beeo\b|diversity|inclusion|privacy|"
+        r"data protection|gdpr|accommodation|disclaimer|recruit(ment|ing) agenc|"
+        r"datenschutz|chancengleichheit", re.I)),
+    ("benefits", re.compile(
+        r"benefit|perks|what we offer|we offer|why (join|work)|compensation|salary|"
+        r"what you('ll)? get|what's in it|in return|package|rewards|"
+        r"unser angebot|wir bieten|was wir bieten", re.I)),
+    ("requirements", re.compile(
+        r"requirement|qualification|what you('ll)? (bring|need|have)|you (bring|have|are)|"
+        r"who you are|about you|skills|experience|must.have|nice.to.have|bonus|"
+        r"your profile|ideal candidate|we('re| are) looking for|looking for|"
+        r"your background|what we need|"
+        r"ihr profil|dein profil|was du mitbringst|was sie mitbringen", re.I)),
+    ("responsibilities", re.compile(
+        r"responsibilit|what you('ll| will) (do|work on|own)|you will|your (role|tasks|"
+        r"mission|impact|day)|the (role|job|position|opportunity)|in this role|"
+        r"about (the|this) (role|job|position)|tasks|day.to.day|"
+        r"how you('ll| will) (contribute|help|make)|ihre aufgaben|deine aufgaben|"
+        r"aufgaben", re.I)),
+    ("about", re.compile(
+        r"about|who we are|our (mission|story|team|company|culture|values)|"
+        r"meet (the|our) team|the company|company (overview|description)|"
+        r"über uns", re.I)),
+]
+
+# Trailing nouns that make a plain line a heading of a kept kind, whatever
+# precedes them ("Minimum Qualifications", "Who we're looking for"). Only
+# for kinds every step keeps, so a false match never drops text.
+_HEADING_TAILS = [
+    ("requirements", re.compile(
+        r"(qualifications?|requirements|looking for|from you|background|profile|"
+        r"skills|experience)$", re.I)),
+    ("responsibilities", re.compile(
+        r"(responsibilities|day.to.day|contribute|tasks)$", re.I)),
+]
+
+# Paragraphs that are legal boilerplate wherever they appear
+_LEGAL_PARAGRAPH = re.compile(
+    r"equal opportunity employer|without regard to (race|age|sex|gender)|"
+    r"recruitment agencies|unsolicited (resumes|cvs)|e-verify|"
+    r"we (do not|don't) discriminate", re.I,
+)
+# Topics that are boilerplate in prose but real work in a responsibilities
+# or requirements bullet ("Drive our data protection roadmap ...")
+_LEGAL_TOPIC_PARAGRAPH = re.compile(
+    r"reasonable accommodation|privacy (policy|notice)|data protection", re.I,
+)
+# Boilerplate runs to full sentences; shorter lines are bullets that may
+# just mention a topic ("Familiarity with GDPR and data protection")
+_MIN_LEGAL_PARAGRAPH_CHARS = 100
+
+# Sections each pipeline step receives (everything not listed is dropped)
+STEP_SECTIONS = {
+    "analysis": ("intro", "responsibilities", "requirements", "other"),
+    "tailor": ("intro", "responsibilities", "requirements", "other"),
+    "ats": ("intro", "responsibilities", "requirements", "other"),
+    "qa": ("intro", "responsibilities", "requirements", "about", "other"),
+}
+
+# Pipeline step number of each view, and the most JD characters it sends
+# (None: the whole view)
+STEP_LABELS = {"analysis": "3a", "tailor": "3b", "ats": "5", "qa": "8"}
+STEP_CHAR_LIMITS = {"analysis": None, "tailor": None, "ats": None, "qa": 3000}
+
+# Short "Location: Berlin" style facts stay with the intro whatever section
+# they sit in
+_FACT_LINE = re.compile(r"^[A-Z][\w /&-]{1,25}:\s+\S.{0,60}$")
+
+_MAX_HEADING_CHARS = 70
+_MAX_PLAIN_HEADING_WORDS = 6
+
+# Leading words a plain heading may carry before its keyword ("The Role",
+# "Our Benefits")
+_HEADING_ARTICLE = re.compile(r"^(the|our|your)\s+", re.I)
+
+
+# Sections holding lists: inside them an unprefixed item can start with a
+# keyword too ("Data protection compliance for payouts"), so a plain line
+# only starts a new section when the keyword is the whole line
+# ("Benefits", "About us", "Skills and experience")
+_LIST_KINDS = ("responsibilities", "requirements")
+_HEADING_REST = re.compile(r"\w*(\s+(us|you|&\s+\w+|and\s+\w+))?")
+
+_BULLETS = ("- ", "• ", "* ", "– ", "+ ")
+
+# Dropped sections that are not trusted past an unknown heading-like line
+_UNSURE_KINDS = ("about", "benefits", "legal")
+
+
+def _heading(line: str, in_list: bool = False) -> tuple[str, bool] | None:
+    """(section kind, marked) if `line` looks like a heading, else None.
+
+    A line is a heading when it is marked as one (markdown "#", a whole-line
+    **bold** / __bold__, or a trailing colon), or when it is a short plain
+    line without digits that starts with a section keyword (`in_list`: is
+    nothing but the keyword) or ends with a requirements / responsibilities
+    noun. Requirement bullets that merely mention a keyword ("Familiarity
+    with GDPR ...") stay body text.
+    """
+    stripped = line.strip()
+    if stripped.startswith(_BULLETS):
+        return None
+    bare = stripped.rstrip(":").rstrip()
+    marked = stripped.startswith("#") or (
+        len(bare) > 4 and bare[:2] in ("**", "__") and bare.endswith(bare[:2])
+    )
+    text = stripped.lstrip("#").strip().strip("*_").strip()
+    if not text or len(text) > _MAX_HEADING_CHARS:
+        return None
+    ends_colon = text.endswith(":")
+    text = text.rstrip(":").strip()
+    if marked or ends_colon:
+        for kind, pattern in _HEADING_KINDS:
+            if pattern.search(text):
+                return kind, True
+        return "other", True
+    if not _plain_heading_shape(text):
+        return None
+    for candidate in (text, _HEADING_ARTICLE.sub("", text)):
+        for kind, pattern in _HEADING_KINDS:
+            match = pattern.match(candidate)
+            if match and (
+                not in_list or _HEADING_REST.fullmatch(candidate[match.end():])
+            ):
+                return kind, False
+    for kind, pattern in _HEADING_TAILS:
+        if pattern.search(text):
+            return kind, False
+    return None
+
+
+def _plain_heading_shape(text: str) -> bool:
+    """Short, no digits, no sentence punctuation: could be a plain heading."""
+    return not (
+        text[-1:] in ".!?,;"
+        or len(text.split()) > _MAX_PLAIN_HEADING_WORDS
+        or any(c.isdigit() for c in text)
+    )
+
+
+def _unknown_heading(line: str) -> bool:
+    """A Title Case line shaped like a heading that _heading() did not know
+    ("Engineering Principles"): what follows may not belong to the section."""
+    text = line.strip()
+    words = text.split()
+    return (
+        len(words) >= 2
+        and not text.startswith(_BULLETS)
+        and _plain_heading_shape(text)
+        and all(w[0].isupper() for w in words if len(w) > 3)
+    )
+
+
+def _legal_paragraph(line: str, in_list: bool = False) -> bool:
+    """True if `line` is a legal boilerplate paragraph.
+
+    Privacy / accommodation topics only count outside list sections
+    (`in_list`) and bullets, where they are notices rather than duties.
+    """
+    stripped = line.strip()
+    if len(stripped) < _MIN_LEGAL_PARAGRAPH_CHARS:
+        return False
+    if _LEGAL_PARAGRAPH.search(stripped):
+        return True
+    return (
+        not in_list
+        and not stripped.startswith(_BULLETS)
+        and bool(_LEGAL_TOPIC_PARAGRAPH.search(stripped))
+    )
+
+
+def split_sections(description: str) -> list[dict]:
+    """Split a JD into [{"kind", "heading", "text"}] in document order.
+
+    Text before the first heading is "intro", as are short "Label: value"
+    facts. Legal paragraphs are moved to a trailing "legal" section wherever
+    they occur (privacy notices only outside list sections). A plain-line
+    heading with nothing under it was not a heading: it goes back into the
+    section before it as body text. An about / benefits / legal section with
+    text after an unknown Title Case line is marked "unsure".
+    """
+    sections = [{"kind": "intro", "heading": "", "marked": True, "lines": []}]
+    legal_lines = []
+
+    def fold_empty_plain_heading():
+        last = sections[-1]
+        if not last["marked"] and not "".join(last["lines"]).strip():
+            sections.pop()
+            sections[-1]["lines"].append(last["heading"])
+
+    def text_after_unknown(section):
+        start = section.get("unknown_at")
+        return start is not None and bool("".join(section["lines"][start + 1:]).strip())
+
+    for line in description.splitlines():
+        heading = _heading(line, in_list=sections[-1]["kind"] in _LIST_KINDS)
+        if heading:
+            fold_empty_plain_heading()
+            kind, marked = heading
+            sections.append(
+                {"kind": kind, "heading": line.strip(), "marked": marked, "lines": []}
+            )
+        elif _legal_paragraph(line, in_list=sections[-1]["kind"] in _LIST_KINDS):
+            legal_lines.append(line)
+        elif _FACT_LINE.match(line.strip()):
+            sections[0]["lines"].append(line)
+        else:
+            last = sections[-1]
+            if (
+                last["kind"] in _UNSURE_KINDS
+                and "unknown_at" not in last
+                and _unknown_heading(line)
+            ):
+                last["unknown_at"] = len(last["lines"])
+            last["lines"].append(line)
+    fold_empty_plain_heading()
+    if legal_lines:
+        sections.append({"kind": "legal", "heading": "", "lines": legal_lines})
+
+    return [
+        {
+            "kind": s["kind"],
+            "heading": s["heading"],
+            "text": "\n".join(s["lines"]).strip(),
+            "unsure": text_after_unknown(s),
+        }
+        for s in sections
+        if s["heading"] or "".join(s["lines"]).strip()
+    ]
+
+
+def build_view(sections: list[dict], step: str, full_text: str) -> str:
+    """The JD text a step should see: its relevant sections, headings kept.
+
+    Falls back to the full text when the JD has no recognised
+    responsibilities or requirements section (nothing safe to cut), or when
+    a section it would drop is "unsure" (may hold requirements under a
+    heading that was not recognised).
+    """
+    kinds = {s["kind"] for s in sections}
+    if not kinds & {"responsibilities", "requirements"}:
+        return full_text
+    wanted = STEP_SECTIONS[step]
+    if any(s.get("unsure") and s["kind"] not in wanted for s in sections):
+        return full_text
+    parts = []
+    for s in sections:
+        if s["kind"] in wanted:
+            parts.append("\n".join(p for p in (s["heading"], s["text"]) if p))
+    return "\n\n".join(p for p in parts if p)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token for English prose)."""
+    return len(text) // 4
@@ -1,21 +1,52 @@
 """Job posting scraper and company research module.
 
-Supports structured APIs for Greenhouse, Lever, Ashby, and Workable.
+Supports structured APIs for Greenhouse, Lever, Ashby, Workable,
+SmartRecruiters, Recruitee and JOIN, and Personio's XML feed.
 Falls back to generic HTML scraping, Firecrawl, then Playwright for JS-heavy pages.
 Company research via Google (primary) with DuckDuckGo fallback.
+All HTTP goes through the pooled session in modules/http_client.py.
+Batches of URLs: scrape_many() (async, per-host concurrency caps).
 """
 
 import os
 import re
 import json
-import requests
+import hashlib
+import time
+import io
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from html import unescape
+from html.parser import HTMLParser
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
+from defusedxml import ElementTree
 from rich.console import Console
 
+from modules.http_client import (
+    http_get, http_post, http_head, cache_get, cache_put,
+    budget_cancelled, budget_expired, budget_timeout, current_deadline,
+    deadline_scope, child_deadline, use_deadline, Deadline, HTML_CONTENT_TYPES,
+)
+from modules.browser_pool import browser_page
+
 # Firecrawl API for enhanced web scraping (handles anti-bot, JS rendering)
 FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY", "")
 
+# Hedged fallback: start the next generic strategy after this many seconds
+# without an adequate result (SCRAPE_HEDGED=0 restores the sequential chain)
+SCRAPE_HEDGED = os.getenv("SCRAPE_HEDGED", "1") == "1"
+SCRAPE_HEDGE_DELAY = float(os.getenv("SCRAPE_HEDGE_DELAY", "5"))
+
+
+
+def _budget_ms(default_ms: int) -> int:
+    """Playwright / Firecrawl timeout in ms, capped to the scrape's time budget."""
+    return int(budget_timeout(default_ms / 1000) * 1000)
+
 
 # ─── ATS URL Patterns ────────────────────────────────────────────
 
@@ -30,8 +61,9 @@ _LEVER_PATTERN = re.compile(
 )
 
 # Personio: {company}.jobs.personio.de/job/{id} or {company}.jobs.personio.com/job/{id}
+# (the board is the whole host: feeds live on the posting's own domain)
 _PERSONIO_PATTERN = re.compile(
-    r"([\w-]+)\.jobs\.personio\.(?:de|com)/job/(\d+)"
+    r"([\w-]+\.jobs\.personio\.(?:de|com))/job/(\d+)"
 )
 
 # Screenloop: app.screenloop.com/careers/{company}/job_posts/{id}
@@ -49,6 +81,21 @@ _WORKABLE_PATTERN = re.compile(
     r"apply\.workable\.com/([\w-]+)/j/([\w-]+)"
 )
 
+# SmartRecruiters: jobs.smartrecruiters.com/{company}/{posting_id}-{slug}
+_SMARTRECRUITERS_PATTERN = re.compile(
+    r"(?:jobs|careers)\.smartrecruiters\.com/([\w-]+)/(\d+)"
+)
+
+# Recruitee: {company}.recruitee.com/o/{slug}
+_RECRUITEE_PATTERN = re.compile(
+    r"([\w-]+)\.recruitee\.com/o/([\w-]+)"
+)
+
+# JOIN: join.com/companies/{company}/{job_id}-{slug}
+_JOIN_PATTERN = re.compile(
+    r"join\.com/companies/([\w-]+)/(\d+)"
+)
+
 _HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -58,23 +105,161 @@ _HEADERS = {
 }
 
 
+# ─── Board Snapshots ─────────────────────────────────────────────
+
+# One board download per TTL serves every posting on that board. Held in
+# memory for this process and on disk (HTTP cache) across pipeline runs.
+BOARD_SNAPSHOTS = os.getenv("BOARD_SNAPSHOTS", "1") == "1"
+BOARD_SNAPSHOT_TTL = int(os.getenv("BOARD_SNAPSHOT_TTL", str(6 * 3600)))  # 6 hours
+
+_board_snapshots: dict[tuple[str, str], tuple[float, dict]] = {}
+_board_locks: dict[tuple[str, str], threading.Lock] = {}
+_board_locks_guard = threading.Lock()
+
+
+def _board_index(ats: str, board: str, loader) -> dict:
+    """Return the indexed snapshot of an ATS board (usually {job_id: job}),
+    loading it at most once per TTL.
+
+    `loader(board)` fetches and indexes the board; it should pass
+    ttl=BOARD_SNAPSHOT_TTL to the HTTP cache so other processes reuse it.
+    A failed load returns {} (not cached) so callers fall back to the
+    single-posting endpoint.
+    """
+    key = (ats, board)
+    with _board_locks_guard:
+        lock = _board_locks.setdefault(key, threading.Lock())
+    # Concurrent scrapes of one board (scrape_many) wait for a single download
+    with lock:
+        hit = _board_snapshots.get(key)
+        if hit and time.time() - hit[0] < BOARD_SNAPSHOT_TTL:
+            return hit[1]
+        try:
+            index = loader(board)
+        except Exception:
+            return {}
+        _board_snapshots[key] = (time.time(), index)
+        return index
+
+
+# ─── HTML Fragments ──────────────────────────────────────────────
+
+# ATS APIs return descriptions as small HTML fragments. A streaming stdlib
+# parser turns them into text without building a soup per fragment; block
+# tags become line breaks and list items become "- " bullets.
+_BLOCK_TAGS = frozenset({
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt",
+    "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "ol", "p", "pre", "section", "table", "tr", "ul",
+})
+_SKIPPED_TAGS = frozenset({"script", "style"})
+
+
+class _FragmentText(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines = []
+        self.current = []
+        self.bullet = False
+        self.skipping = 0
+
+    def flush(self):
+        line = " ".join("".join(self.current).split())
+        self.current = []
+        if line:
+            self.lines.append(f"- {line}" if self.bullet else line)
+            self.bullet = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self.skipping += 1
+        elif tag in _BLOCK_TAGS:
+            self.flush()
+            if tag == "li":
+                self.bullet = True
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self.skipping = max(0, self.skipping - 1)
+        elif tag in _BLOCK_TAGS:
+            self.flush()
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.flush()
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.current.append(data)
+
+
+# Converted fragments by content digest, least recently used first. Keyed on
+# a 16-byte hash so the cache holds the text, not the (larger) HTML too.
+_FRAGMENT_CACHE_SIZE = 512
+_fragment_cache: OrderedDict[bytes, str] = OrderedDict()
+_fragment_cache_lock = threading.Lock()
+
+
+def _fragment_to_text(fragment: str) -> str:
+    """Plain text of an HTML fragment, one line per block / list item.
+
+    Cached: board snapshots and re-runs convert the same fragments repeatedly.
+    """
+    if not fragment:
+        return ""
+    if "<" not in fragment:
+        return " ".join(unescape(fragment).split())
+    key = hashlib.blake2b(fragment.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _fragment_cache_lock:
+        text = _fragment_cache.get(key)
+        if text is not None:
+            _fragment_cache.move_to_end(key)
+            return text
+    text = _html_lines(fragment)
+    with _fragment_cache_lock:
+        _fragment_cache[key] = text
+        if len(_fragment_cache) > _FRAGMENT_CACHE_SIZE:
+            _fragment_cache.popitem(last=False)
+    return text
+
+
+def _html_lines(html: str) -> str:
+    """Plain text of HTML, one line per block / list item (uncached)."""
+    parser = _FragmentText()
+    parser.feed(html)
+    parser.close()
+    parser.flush()
+    return "\n".join(parser.lines)
+
+
 # ─── Public ATS APIs ─────────────────────────────────────────────
 
 
+def _load_greenhouse_board(board: str) -> dict:
+    url = f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs?content=true"
+    resp = http_get(url, cache=True, ttl=BOARD_SNAPSHOT_TTL)
+    resp.raise_for_status()
+    return {str(j.get("id")): j for j in resp.json().get("jobs", [])}
+
+
 def _scrape_greenhouse(board: str, job_id: str) -> dict:
     """Greenhouse public boards API — returns structured JSON including
     application questions.
     Docs: https://developers.greenhouse.io/job-board.html
     """
-    url = f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs/{job_id}"
-    resp = requests.get(url, timeout=15)
-    resp.raise_for_status()
-    data = resp.json()
+    data = None
+    if BOARD_SNAPSHOTS:
+        data = _board_index("greenhouse", board, _load_greenhouse_board).get(job_id)
 
-    content_html = data.get("content", "")
-    description = BeautifulSoup(content_html, "html.parser").get_text(
-        separator="\n", strip=True
-    )
+    if data is None:
+        # Not in the snapshot (posted since, or snapshots disabled)
+        url = f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs/{job_id}"
+        resp = http_get(url, cache=True)
+        resp.raise_for_status()
+        data = resp.json()
+
+    # Greenhouse returns content HTML-entity-escaped (&lt;p&gt;...)
+    description = _fragment_to_text(unescape(data.get("content", "")))
 
     questions = [
         q.get("label", "")
@@ -84,7 +269,7 @@ def _scrape_greenhouse(board: str, job_id: str) -> dict:
 
     # Company can be nested under "company" or directly as "company_name"
     # Also fallback to board name (usually matches company slug)
-    company = data.get("company", {}).get("name", "")
+    company = (data.get("company") or {}).get("name", "")
     if not company:
         company = data.get("company_name", "")
     if not company:
@@ -101,30 +286,37 @@ def _scrape_greenhouse(board: str, job_id: str) -> dict:
     }
 
 
+def _load_lever_board(company: str) -> dict:
+    url = f"https://api.lever.co/v0/postings/{company}?mode=json"
+    resp = http_get(url, cache=True, ttl=BOARD_SNAPSHOT_TTL)
+    resp.raise_for_status()
+    return {p.get("id", ""): p for p in resp.json()}
+
+
 def _scrape_lever(company: str, posting_id: str) -> dict:
     """Lever public postings API (v0) — no auth required.
     Docs: https://github.com/lever/postings-api
     """
-    url = f"https://api.lever.co/v0/postings/{company}/{posting_id}?mode=json"
-    resp = requests.get(url, timeout=15)
-    resp.raise_for_status()
-    data = resp.json()
+    data = None
+    if BOARD_SNAPSHOTS:
+        data = _board_index("lever", company, _load_lever_board).get(posting_id)
+
+    if data is None:
+        url = f"https://api.lever.co/v0/postings/{company}/{posting_id}?mode=json"
+        resp = http_get(url, cache=True)
+        resp.raise_for_status()
+        data = resp.json()
 
     # Lever returns description as HTML and descriptionPlain
-    desc_html = data.get("description", "") + "\n" + data.get(
-        "additional", ""
-    )
-    description = BeautifulSoup(desc_html, "html.parser").get_text(
-        separator="\n", strip=True
+    description = _fragment_to_text(
+        data.get("description", "") + "\n" + data.get("additional", "")
     )
 
     # Lever lists sections with body content
     for section in data.get("lists", []):
         description += (
             f"\n\n{section.get('text', '')}:\n"
-            + BeautifulSoup(
-                section.get("content", ""), "html.parser"
-            ).get_text(separator="\n", strip=True)
+            + _fragment_to_text(section.get("content", ""))
         )
 
     return {
@@ -137,64 +329,124 @@ def _scrape_lever(company: str, posting_id: str) -> dict:
     }
 
 
-def _scrape_ashby(company: str, slug: str | None) -> dict:
-    """Ashby public job posting API — returns all jobs for a company.
-    If slug is provided, finds the matching job.
-    Docs: https://developers.ashbyhq.com/docs/public-job-posting-api
-    """
-    api_url = f"https://jobs.ashbyhq.com/api/non-user-graphql"
-    # Ashby uses a GraphQL endpoint for its public API
+_ASHBY_API = "https://jobs.ashbyhq.com/api/non-user-graphql"
+
+_UUID_PATTERN = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I
+)
+
+# Single posting: one small payload instead of the whole board
+_ASHBY_POSTING_FIELDS = """
+        jobPosting(
+            organizationHostedJobsPageName: $organizationHostedJobsPageName
+            jobPostingId: $jobPostingId
+        ) {
+            id
+            title
+            descriptionHtml
+            locationName
+            employmentType
+        }
+"""
+
+# ... and the organization's display name in the same request
+_ASHBY_POSTING_QUERY = """
+    query ApiJobPosting(
+        $organizationHostedJobsPageName: String!, $jobPostingId: String!
+    ) {""" + _ASHBY_POSTING_FIELDS + """        organization: organizationFromHostedJobsPageName(
+            organizationHostedJobsPageName: $organizationHostedJobsPageName
+        ) {
+            name
+        }
+    }
+"""
+
+# Posting only, for when the organization lookup errors
+_ASHBY_POSTING_ONLY_QUERY = """
+    query ApiJobPosting(
+        $organizationHostedJobsPageName: String!, $jobPostingId: String!
+    ) {""" + _ASHBY_POSTING_FIELDS + """    }
+"""
+
+# Board index for slug resolution only: ids and titles, no descriptions
+_ASHBY_BOARD_QUERY = """
+    query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {
+        jobBoard: jobBoardWithTeams(
+            organizationHostedJobsPageName: $organizationHostedJobsPageName
+        ) {
+            jobPostings {
+                id
+                title
+            }
+        }
+    }
+"""
+
+
+def _load_ashby_board(company: str) -> dict:
     payload = {
         "operationName": "ApiJobBoardWithTeams",
         "variables": {"organizationHostedJobsPageName": company},
-        "query": """
-            query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {
-                jobBoard: jobBoardWithTeams(
-                    organizationHostedJobsPageName: $organizationHostedJobsPageName
-                ) {
-                    teams {
-                        ... on JobBoardTeam {
-                            jobs {
-                                id
-                                title
-                                descriptionHtml
-                                locationName
-                                employmentType
-                            }
-                        }
-                    }
-                    jobBoardSetting {
-                        organizationName
-                    }
-                }
-            }
-        """,
+        "query": _ASHBY_BOARD_QUERY,
     }
+    resp = http_post(
+        _ASHBY_API, json=payload, headers=_HEADERS,
+        cache=True, ttl=BOARD_SNAPSHOT_TTL,
+    )
+    resp.raise_for_status()
+    board = (resp.json().get("data") or {}).get("jobBoard") or {}
+    return {j.get("id", ""): j for j in board.get("jobPostings") or []}
+
 
-    resp = requests.post(api_url, json=payload, headers=_HEADERS, timeout=15)
+def _fetch_ashby_posting(company: str, job_id: str, query: str) -> tuple[dict, list]:
+    """Run a single-posting query; returns (data, GraphQL errors)."""
+    payload = {
+        "operationName": "ApiJobPosting",
+        "variables": {
+            "organizationHostedJobsPageName": company,
+            "jobPostingId": job_id,
+        },
+        "query": query,
+    }
+    resp = http_post(_ASHBY_API, json=payload, headers=_HEADERS, cache=True)
     resp.raise_for_status()
-    data = resp.json()
+    body = resp.json()
+    return body.get("data") or {}, body.get("errors") or []
 
-    board = data.get("data", {}).get("jobBoard", {})
-    org_name = (
-        board.get("jobBoardSetting", {}).get("organizationName", company)
-    )
 
-    # Flatten all jobs from all teams
-    all_jobs = []
-    for team in board.get("teams", []):
-        all_jobs.extend(team.get("jobs", []))
+def _resolve_ashby_slug(company: str, slug: str) -> str | None:
+    """Map a non-UUID slug (id prefix or title slug) to a job posting id.
+    Needs the board index, so None when snapshots are disabled."""
+    if not BOARD_SNAPSHOTS:
+        return None
+    slug_lower = slug.lower()
+    for job_id, j in _board_index("ashby", company, _load_ashby_board).items():
+        if slug_lower in job_id.lower() or slug_lower in j.get(
+            "title", ""
+        ).lower().replace(" ", "-"):
+            return job_id
+    return None
 
-    # Find matching job by slug (partial ID match) or return first
-    job = None
+
+def _scrape_ashby(company: str, slug: str | None) -> dict:
+    """Ashby public job posting API — fetches a single posting by UUID.
+    Non-UUID slugs are resolved through a cached board index first.
+    Docs: https://developers.ashbyhq.com/docs/public-job-posting-api
+    """
+    job_id = None
     if slug:
-        slug_lower = slug.lower()
-        for j in all_jobs:
-            if slug_lower in j.get("id", "").lower() or slug_lower in j.get(
-                "title", ""
-            ).lower().replace(" ", "-"):
-                job = j
-                break
+        job_id = slug if _UUID_PATTERN.match(slug) else _resolve_ashby_slug(company, slug)
+
+    job = None
+    org_name = company
+    if job_id:
+        data, errors = _fetch_ashby_posting(company, job_id, _ASHBY_POSTING_QUERY)
+        if errors and not data.get("jobPosting"):
+            # A failing organization field nulls or rejects the whole query;
+            # the posting alone is still worth having
+            data, _ = _fetch_ashby_posting(company, job_id, _ASHBY_POSTING_ONLY_QUERY)
+        job = data.get("jobPosting")
+        org_name = (data.get("organization") or {}).get("name") or company
 
     if not job:
         # No match (slug mismatch or empty board) — fall back to HTML scraping
@@ -202,9 +454,7 @@ def _scrape_ashby(company: str, slug: str | None) -> dict:
             f"https://jobs.ashbyhq.com/{company}/{slug or ''}"
         )
 
-    description = BeautifulSoup(
-        job.get("descriptionHtml", ""), "html.parser"
-    ).get_text(separator="\n", strip=True)
+    description = _fragment_to_text(job.get("descriptionHtml", ""))
 
     return {
         "title": job.get("title", ""),
@@ -216,29 +466,35 @@ def _scrape_ashby(company: str, slug: str | None) -> dict:
     }
 
 
-def _scrape_workable(company: str, slug: str) -> dict:
-    """Workable public widget API — no auth required.
-    Docs: https://workable.readme.io/
-    """
-    # First get job list to find the matching job
+def _load_workable_account(company: str) -> dict:
+    """Workable widget listing, indexed by shortcode and URL slug (lowercase)."""
     list_url = (
         f"https://apply.workable.com/api/v1/widget/accounts/{company}"
     )
-    resp = requests.get(list_url, headers=_HEADERS, timeout=15)
+    resp = http_get(list_url, headers=_HEADERS, cache=True, ttl=BOARD_SNAPSHOT_TTL)
     resp.raise_for_status()
     data = resp.json()
 
-    # Find matching job by shortcode (slug)
-    job = None
+    jobs = {}
     for j in data.get("jobs", []):
-        if j.get("shortcode", "").lower() == slug.lower():
-            job = j
-            break
-        # Also try matching by URL slug
-        job_url = j.get("url", "")
-        if slug.lower() in job_url.lower():
-            job = j
-            break
+        url_slug = urlparse(j.get("url", "")).path.rstrip("/").rsplit("/", 1)[-1]
+        if url_slug:
+            jobs.setdefault(url_slug.lower(), j)
+        if j.get("shortcode"):
+            jobs[j["shortcode"].lower()] = j  # shortcode wins over URL slug
+    return {"name": data.get("name", ""), "jobs": jobs}
+
+
+def _scrape_workable(company: str, slug: str) -> dict:
+    """Workable public widget API — no auth required.
+    Docs: https://workable.readme.io/
+    """
+    if BOARD_SNAPSHOTS:
+        account = _board_index("workable", company, _load_workable_account)
+        job = account.get("jobs", {}).get(slug.lower())
+    else:
+        # No account listing: the URL slug is usually the shortcode
+        account, job = {}, {"shortcode": slug}
 
     if not job:
         # Fallback to HTML scraping if job not found in widget API
@@ -253,27 +509,19 @@ def _scrape_workable(company: str, slug: str) -> dict:
         f"{company}/jobs/{shortcode}"
     )
     try:
-        detail_resp = requests.get(
-            detail_url, headers=_HEADERS, timeout=15
-        )
+        detail_resp = http_get(detail_url, headers=_HEADERS, cache=True)
         detail_resp.raise_for_status()
         detail = detail_resp.json()
-        description = BeautifulSoup(
-            detail.get("description", ""), "html.parser"
-        ).get_text(separator="\n", strip=True)
+        description = _fragment_to_text(detail.get("description", ""))
 
         # Workable sometimes has requirements separately
         requirements = detail.get("requirements", "")
         if requirements:
-            description += "\n\nRequirements:\n" + BeautifulSoup(
-                requirements, "html.parser"
-            ).get_text(separator="\n", strip=True)
+            description += "\n\nRequirements:\n" + _fragment_to_text(requirements)
 
         benefits = detail.get("benefits", "")
         if benefits:
-            description += "\n\nBenefits:\n" + BeautifulSoup(
-                benefits, "html.parser"
-            ).get_text(separator="\n", strip=True)
+            description += "\n\nBenefits:\n" + _fragment_to_text(benefits)
 
         questions = [
             q.get("label", "") or q.get("body", "")
@@ -281,12 +529,18 @@ def _scrape_workable(company: str, slug: str) -> dict:
             if q.get("label") or q.get("body")
         ]
     except Exception:
+        if not job.get("title"):
+            # Slug was not a shortcode (snapshots disabled)
+            return _scrape_generic(
+                f"https://apply.workable.com/{company}/j/{slug}/"
+            )
+        detail = {}
         description = job.get("title", "")
         questions = []
 
     return {
-        "title": job.get("title", ""),
-        "company": data.get("name", company.replace("-", " ").title()),
+        "title": job.get("title") or detail.get("title", ""),
+        "company": account.get("name") or company.replace("-", " ").title(),
         "description": description,
         "url": job.get("url", f"https://apply.workable.com/{company}/j/{slug}/"),
         "source": "workable_api",
@@ -297,10 +551,89 @@ def _scrape_workable(company: str, slug: str) -> dict:
 # ─── Personio & Screenloop ────────────────────────────────────────
 
 
-def _scrape_personio(company: str, job_id: str) -> dict:
-    """Personio job postings - uses HTML scraping with better selectors."""
-    url = f"https://{company}.jobs.personio.de/job/{job_id}"
-    resp = requests.get(url, headers=_HEADERS, timeout=15)
+def _personio_host(board: str) -> str:
+    """Board host from the posting URL; a bare company slug means .de."""
+    return board if "." in board else f"{board}.jobs.personio.de"
+
+
+def _load_personio_feed(board: str) -> dict:
+    """Personio's public XML feed: every open position, indexed by id.
+
+    Streamed with iterparse; each <position> is reduced to a dict and its
+    element cleared, so large feeds never sit in memory as a full tree.
+    The feed is untrusted input: defusedxml rejects any DTD, and with it
+    entity expansion and external entities.
+    """
+    url = f"https://{_personio_host(board)}/xml"
+    resp = http_get(url, headers=_HEADERS, cache=True, ttl=BOARD_SNAPSHOT_TTL)
+    resp.raise_for_status()
+
+    positions = {}
+    events = ElementTree.iterparse(
+        io.BytesIO(resp.content), events=("end",), forbid_dtd=True
+    )
+    for _, el in events:
+        if el.tag != "position":
+            continue
+        position = {
+            field: (el.findtext(field) or "").strip()
+            for field in (
+                "id", "name", "subcompany", "office", "department",
+                "employmentType", "schedule", "seniority",
+            )
+        }
+        position["sections"] = [
+            ((d.findtext("name") or "").strip(), d.findtext("value") or "")
+            for d in el.iter("jobDescription")
+        ]
+        if position["id"]:
+            positions[position["id"]] = position
+        el.clear()
+    return positions
+
+
+def _scrape_personio(board: str, job_id: str) -> dict:
+    """Personio job postings from the company's cached XML feed, falling back
+    to HTML scraping for positions not (yet) in the feed, or when board
+    snapshots are disabled. `board` is the posting's host (.de or .com)."""
+    host = _personio_host(board)
+    company = host.split(".", 1)[0]
+    position = None
+    if BOARD_SNAPSHOTS:
+        position = _board_index("personio", host, _load_personio_feed).get(job_id)
+    if not position:
+        return _scrape_personio_html(host, job_id)
+
+    details = [
+        ("Location", position["office"]),
+        ("Department", position["department"]),
+        ("Employment", ", ".join(
+            v for v in (position["employmentType"], position["schedule"]) if v
+        )),
+        ("Seniority", position["seniority"]),
+    ]
+    parts = ["\n".join(f"{label}: {value}" for label, value in details if value)]
+    for name, value in position["sections"]:
+        text = _fragment_to_text(value)
+        if text:
+            parts.append(f"{name}:\n{text}" if name else text)
+
+    return {
+        "title": position["name"],
+        "company": position["subcompany"] or company.replace("-", " ").title(),
+        "description": "\n\n".join(p for p in parts if p),
+        "url": f"https://{host}/job/{job_id}",
+        "source": "personio",
+        "questions": [],
+    }
+
+
+def _scrape_personio_html(board: str, job_id: str) -> dict:
+    """Personio job page - HTML scraping with Personio-specific selectors."""
+    host = _personio_host(board)
+    company = host.split(".", 1)[0]
+    url = f"https://{host}/job/{job_id}"
+    resp = http_get(url, headers=_HEADERS, cache=True)
     resp.raise_for_status()
     soup = BeautifulSoup(resp.text, "html.parser")
 
@@ -333,14 +666,15 @@ def _scrape_personio(company: str, job_id: str) -> dict:
 
     # Job description
     desc_el = soup.select_one(".job-description, [data-testid='job-description'], .job-details")
+    page_chars = None
     if desc_el:
         description = desc_el.get_text(separator="\n", strip=True)
     else:
         for tag in soup(["script", "style", "nav", "footer", "header"]):
             tag.decompose()
-        description = soup.get_text(separator="\n", strip=True)
+        description, page_chars = _main_or_page_text(soup)
 
-    return {
+    result = {
         "title": title,
         "company": company_name,
         "description": description,
@@ -348,21 +682,25 @@ def _scrape_personio(company: str, job_id: str) -> dict:
         "source": "personio",
         "questions": [],
     }
+    if page_chars is not None:
+        result["page_chars"] = page_chars
+    return result
 
 
 def _scrape_screenloop(company: str, job_id: str) -> dict:
     """Screenloop job postings - JS-heavy, requires Playwright."""
-    from playwright.sync_api import sync_playwright
-
     url = f"https://app.screenloop.com/careers/{company}/job_posts/{job_id}"
     company_name = company.replace("-", " ").title()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(url, wait_until="networkidle", timeout=30000)
+    captured = _try_xhr_template(url)
+    if captured:
+        return captured
+
+    with browser_page() as page:
+        recorder = _XhrRecorder(page)
+        page.goto(url, wait_until="networkidle", timeout=_budget_ms(30000))
         html = page.content()
-        browser.close()
+        payloads = recorder.payloads()
 
     soup = BeautifulSoup(html, "html.parser")
 
@@ -387,25 +725,280 @@ def _scrape_screenloop(company: str, job_id: str) -> dict:
 
     for tag in soup(["script", "style", "nav", "footer", "header"]):
         tag.decompose()
-    description = soup.get_text(separator="\n", strip=True)
+    description, page_chars = _main_or_page_text(soup)
 
-    return {
+    result = {
         "title": title,
         "company": company_name,
         "description": description,
         "url": url,
         "source": "screenloop",
         "questions": [],
+        "page_chars": page_chars,
+    }
+    if payloads and not _needs_enhanced(result):
+        _learn_xhr_template(url, result, payloads)
+    return result
+
+
+# ─── SmartRecruiters, Recruitee & JOIN ───────────────────────────
+
+# Only Recruitee serves whole postings in its board listing, so only it goes
+# through _board_index. SmartRecruiters' company listing returns summaries
+# (no jobAd sections, 100 per page), and JOIN has no API at all, just a
+# server-rendered page per posting: a snapshot of either would still need
+# one request per posting, so they rely on the per-URL HTTP cache.
+
+def _scrape_smartrecruiters(company: str, posting_id: str) -> dict:
+    """SmartRecruiters public Posting API — no auth required.
+    Docs: https://developers.smartrecruiters.com/docs/posting-api
+    """
+    url = f"https://api.smartrecruiters.com/v1/companies/{company}/postings/{posting_id}"
+    resp = http_get(url, headers=_HEADERS, cache=True)
+    resp.raise_for_status()
+    data = resp.json()
+
+    # jobAd.sections: companyDescription, jobDescription, qualifications,
+    # additionalInformation — each {title, text (HTML)}
+    parts = []
+    sections = (data.get("jobAd") or {}).get("sections") or {}
+    for key in ("jobDescription", "qualifications", "additionalInformation", "companyDescription"):
+        section = sections.get(key) or {}
+        text = _fragment_to_text(section.get("text", ""))
+        if text:
+            title = section.get("title", "")
+            parts.append(f"{title}:\n{text}" if title else text)
+
+    return {
+        "title": data.get("name", ""),
+        "company": (data.get("company") or {}).get("name")
+        or company.replace("-", " ").title(),
+        "description": "\n\n".join(parts),
+        "url": data.get("postingUrl")
+        or f"https://jobs.smartrecruiters.com/{company}/{posting_id}",
+        "source": "smartrecruiters_api",
+        "questions": [],
+    }
+
+
+def _load_recruitee_board(company: str) -> dict:
+    url = f"https://{company}.recruitee.com/api/offers/"
+    resp = http_get(url, headers=_HEADERS, cache=True, ttl=BOARD_SNAPSHOT_TTL)
+    resp.raise_for_status()
+    return {o.get("slug", ""): o for o in resp.json().get("offers", [])}
+
+
+def _scrape_recruitee(company: str, slug: str) -> dict:
+    """Recruitee public careers-site API — no auth required.
+    Docs: https://docs.recruitee.com/reference/offers
+    """
+    offer = None
+    if BOARD_SNAPSHOTS:
+        offer = _board_index("recruitee", company, _load_recruitee_board).get(slug)
+
+    if offer is None:
+        url = f"https://{company}.recruitee.com/api/offers/{slug}"
+        resp = http_get(url, headers=_HEADERS, cache=True)
+        resp.raise_for_status()
+        offer = resp.json().get("offer") or {}
+
+    description = _fragment_to_text(offer.get("description", ""))
+    requirements = _fragment_to_text(offer.get("requirements", ""))
+    if requirements:
+        description += "\n\nRequirements:\n" + requirements
+
+    return {
+        "title": offer.get("title", ""),
+        "company": offer.get("company_name") or company.replace("-", " ").title(),
+        "description": description,
+        "url": offer.get("careers_url") or f"https://{company}.recruitee.com/o/{slug}",
+        "source": "recruitee_api",
+        "questions": [],
+    }
+
+
+def _find_join_job(data, job_id: str) -> dict | None:
+    """Depth-first search of JOIN's __NEXT_DATA__ for the job object."""
+    if isinstance(data, dict):
+        if str(data.get("id")) == job_id and data.get("title"):
+            return data
+        values = data.values()
+    elif isinstance(data, list):
+        values = data
+    else:
+        return None
+    for value in values:
+        found = _find_join_job(value, job_id)
+        if found:
+            return found
+    return None
+
+
+def _scrape_join(company: str, job_id: str) -> dict:
+    """JOIN job pages are server-rendered Next.js: the posting is embedded as
+    JSON in __NEXT_DATA__, so no browser is needed. Falls back to the page's
+    JSON-LD / HTML extraction if that shape changes, and raises (so the
+    generic chain takes over) when that comes back thin too."""
+    url = f"https://join.com/companies/{company}/{job_id}"
+    resp = http_get(url, headers=_HEADERS, cache=True)
+    resp.raise_for_status()
+
+    match = re.search(
+        r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', resp.text, re.DOTALL
+    )
+    job = None
+    if match:
+        try:
+            job = _find_join_job(json.loads(match.group(1)), job_id)
+        except json.JSONDecodeError:
+            job = None
+    if not job:
+        result = _extract_from_html(resp.text, url)
+        if _needs_enhanced(result):
+            raise ValueError("posting not found in __NEXT_DATA__")
+        result["source"] = "join"
+        return result
+
+    parts = []
+    for key in ("description", "intro", "tasks", "requirements", "benefits", "outro"):
+        value = job.get(key)
+        text = _fragment_to_text(value) if isinstance(value, str) else ""
+        if text:
+            parts.append(text)
+
+    company_data = job.get("company") if isinstance(job.get("company"), dict) else {}
+    return {
+        "title": job.get("title", ""),
+        "company": company_data.get("name") or company.replace("-", " ").title(),
+        "description": "\n\n".join(parts),
+        "url": url,
+        "source": "join",
+        "questions": [],
+    }
+
+
+# ─── Embedded ATS Fingerprinting ─────────────────────────────────
+
+# Company career pages that wrap an ATS embed: the job id rides in a query
+# parameter (?gh_jid=, ?ashby_jid=) or an iframe, the board in embed scripts
+_GH_EMBED_APP = re.compile(r"greenhouse\.io/embed/job_app\?[^\"'<>\s]+")
+_GH_BOARD_IN_PAGE = re.compile(
+    r"greenhouse\.io/embed/job_board(?:/js)?\?(?:[^\"'<>\s]*?[&;])?for=([\w-]+)"
+    r"|boards-api\.greenhouse\.io/v1/boards/([\w-]+)"
+    r"|(?:boards|job-boards(?:\.eu)?)\.greenhouse\.io/(?!embed\b)([\w-]+)"
+)
+# Lever embeds: the postings API script, or the lever-jobs-embed widget
+# (whose options carry the account name)
+_LEVER_EMBED_IN_PAGE = re.compile(r"api\.lever\.co/v0/postings/([\w-]+)")
+_LEVER_WIDGET_ACCOUNT = re.compile(r"accountName[\"']?\s*:\s*[\"']([\w-]+)")
+_LEVER_LINK_IN_PAGE = re.compile(r"jobs\.lever\.co/([\w-]+)")
+_ASHBY_COMPANY_IN_PAGE = re.compile(r"jobs\.ashbyhq\.com/([\w-]+)")
+_UUID_IN_TEXT = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I
+)
+_H1_IN_PAGE = re.compile(r"<h1\b[^>]*>(.*?)</h1>", re.I | re.S)
+_OG_TITLE_IN_PAGE = re.compile(
+    r"<meta[^>]+property=[\"']og:title[\"'][^>]+content=[\"']([^\"']*)", re.I
+)
+
+
+def _first_group(match: re.Match | None) -> str:
+    return next((g for g in match.groups() if g), "") if match else ""
+
+
+def _normalized_title(text: str) -> str:
+    return " ".join(re.sub(r"<[^>]+>|[^\w\s]", " ", unescape(text)).lower().split())
+
+
+def _page_shows_title(html: str, title: str) -> bool:
+    """True if the page's <h1> or og:title names the posting `title`."""
+    title = _normalized_title(title)
+    if not title:
+        return False
+    shown = [m.group(1) for m in (_H1_IN_PAGE.search(html), _OG_TITLE_IN_PAGE.search(html)) if m]
+    return any(title in _normalized_title(text) for text in shown)
+
+
+def _embedded_ats(url: str, html: str) -> tuple | None:
+    """(adapter, args, verify) when a career page wraps a Greenhouse, Ashby
+    or Lever posting, else None. `verify`: the match is a guess, use the
+    result only if the page's title names the same posting."""
+    query = parse_qs(urlparse(url).query)
+
+    # Greenhouse: job_app iframe (for=board&token=id), or ?gh_jid= + board script
+    gh_jid = (query.get("gh_jid") or [""])[0]
+    for match in _GH_EMBED_APP.finditer(html):
+        params = parse_qs(urlparse(unescape(match.group(0))).query)
+        token = (params.get("token") or [gh_jid])[0]
+        if params.get("for") and token.isdigit():
+            return _scrape_greenhouse, (params["for"][0], token), False
+    if gh_jid.isdigit():
+        board = _first_group(_GH_BOARD_IN_PAGE.search(html))
+        if board:
+            return _scrape_greenhouse, (board, gh_jid), False
+
+    # Ashby: ?ashby_jid=<uuid> + jobs.ashbyhq.com/{company}/embed script
+    ashby_jid = (query.get("ashby_jid") or [""])[0]
+    if _UUID_PATTERN.match(ashby_jid):
+        company = _first_group(_ASHBY_COMPANY_IN_PAGE.search(html))
+        if company:
+            return _scrape_ashby, (company, ashby_jid), False
+
+    # Lever, explicit: an embed on the page plus a ?lever...= posting id
+    company = _first_group(_LEVER_EMBED_IN_PAGE.search(html))
+    if not company and "lever-jobs-embed" in html:
+        company = _first_group(_LEVER_WIDGET_ACCOUNT.search(html))
+    lever_ids = {
+        u.lower() for key, values in query.items() if key.lower().startswith("lever")
+        for value in values for u in _UUID_IN_TEXT.findall(value)
     }
+    if company and len(lever_ids) == 1:
+        return _scrape_lever, (company, lever_ids.pop()), False
+
+    # Lever, guessed: a posting UUID in the page URL, or a single posting
+    # linked from the page (could be a sidebar link to another role)
+    company = company or _first_group(_LEVER_LINK_IN_PAGE.search(html))
+    if company:
+        ids = {u.lower() for u in _UUID_IN_TEXT.findall(url)}
+        if not ids:
+            ids = {
+                u.lower() for u in re.findall(
+                    rf"jobs\.lever\.co/{re.escape(company)}/({_UUID_IN_TEXT.pattern})",
+                    html, re.I,
+                )
+            }
+        if len(ids) == 1:
+            return _scrape_lever, (company, ids.pop()), True
+    return None
 
 
 # ─── Generic Scraping ────────────────────────────────────────────
 
 
 def _scrape_generic(url: str) -> dict:
-    """Generic HTML scraping via requests + BeautifulSoup."""
-    resp = requests.get(url, headers=_HEADERS, timeout=15)
+    """Generic HTML scraping via the shared HTTP session + BeautifulSoup.
+
+    Pages wrapping a Greenhouse / Ashby / Lever embed go to that ATS's API.
+    The download stops early once a complete JSON-LD posting has arrived.
+    """
+    resp = http_get(
+        url, headers=_HEADERS, cache=True,
+        stop_at=_jsonld_posting_arrived, content_types=HTML_CONTENT_TYPES,
+    )
     resp.raise_for_status()
+
+    if not any(pattern.search(url) for _, _, pattern, _ in _ATS_ADAPTERS):
+        embedded = _embedded_ats(url, resp.text)
+        if embedded:
+            adapter, args, verify = embedded
+            try:
+                result = adapter(*args)
+                if not _needs_enhanced(result) and (
+                    not verify or _page_shows_title(resp.text, result["title"])
+                ):
+                    return result
+            except Exception:
+                pass  # Embed guessed wrong or API down — scrape the page itself
     return _extract_from_html(resp.text, url)
 
 
@@ -420,7 +1013,9 @@ def _scrape_with_firecrawl(url: str) -> dict:
         raise ImportError("firecrawl-py not installed")
 
     app = FirecrawlApp(api_key=FIRECRAWL_API_KEY)
-    doc = app.scrape(url, formats=["markdown", "html"], wait_for=3000)
+    doc = app.scrape(
+        url, formats=["markdown", "html"], wait_for=3000, timeout=_budget_ms(60000)
+    )
 
     # Extract from markdown (cleaner) or fall back to HTML
     markdown = doc.markdown or ""
@@ -453,270 +1048,1114 @@ def _scrape_with_firecrawl(url: str) -> dict:
     }
 
 
-def _scrape_with_playwright(url: str) -> dict:
-    """Fallback: full browser render for JS-heavy pages."""
-    from playwright.sync_api import sync_playwright
+# Slice of a network-idle wait between deadline checks
+_IDLE_WAIT_SLICE_MS = 500
+
+
+def _wait_for_network_idle(page, timeout_ms: int):
+    """Wait for network idle in short slices, so a cancelled or expired
+    deadline frees the page (and its browser slot) within a slice. A render
+    that never goes idle is read as it is after `timeout_ms`."""
+    from playwright.sync_api import TimeoutError as PlaywrightTimeout
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(url, wait_until="networkidle", timeout=30000)
+    waited = 0
+    while waited < timeout_ms:
+        slice_ms = min(_IDLE_WAIT_SLICE_MS, timeout_ms - waited)
+        try:
+            page.wait_for_load_state("networkidle", timeout=slice_ms)
+            return
+        except PlaywrightTimeout:
+            waited += slice_ms
+            budget_timeout(0)  # Raises DeadlineExceeded once cancelled or used up
+
+
+def _scrape_with_playwright(url: str) -> dict:
+    """Fallback: full browser render for JS-heavy pages. JSON responses seen
+    during the render may teach a per-domain endpoint (see XHR Capture)."""
+    with browser_page() as page:
+        recorder = _XhrRecorder(page)
+        page.goto(url, wait_until="domcontentloaded", timeout=_budget_ms(30000))
+        _wait_for_network_idle(page, _budget_ms(30000))
         html = page.content()
-        browser.close()
-        return _extract_from_html(html, url)
+        payloads = recorder.payloads()
+    result = _extract_from_html(html, url)
+    if payloads and not _needs_enhanced(result):
+        _learn_xhr_template(url, result, payloads)
+    return result
 
 
-def _extract_from_html(html: str, url: str) -> dict:
-    """Parse HTML and extract job posting data using multiple strategies."""
-    soup = BeautifulSoup(html, "html.parser")
+# ─── XHR Capture ─────────────────────────────────────────────────
 
-    title = ""
-    company = ""
-    description = ""
+# JS-only career pages load the posting from a JSON endpoint. While Playwright
+# renders one, JSON XHR/fetch responses are recorded; the one carrying the
+# posting becomes a per-domain endpoint template (URL path segments become
+# {segN} placeholders), so later postings on that domain are a plain cached
+# HTTP request instead of a full render.
+XHR_CAPTURE = os.getenv("XHR_CAPTURE", "1") == "1"
+XHR_TEMPLATE_TTL = float(os.getenv("XHR_TEMPLATE_TTL_DAYS", "30")) * 86400
 
-    # Strategy 1: JSON-LD structured data (most reliable when present)
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(script.string)
-            # Handle array of objects
-            if isinstance(data, list):
-                for item in data:
-                    if item.get("@type") == "JobPosting":
-                        data = item
-                        break
-            if data.get("@type") == "JobPosting":
-                title = title or data.get("title", "")
-                company = company or data.get("hiringOrganization", {}).get("name", "")
-                description = description or data.get("description", "")
-                if "<" in description:
-                    description = BeautifulSoup(description, "html.parser").get_text(
-                        separator="\n", strip=True
-                    )
-        except (json.JSONDecodeError, TypeError, AttributeError):
-            continue
+_XHR_MAX_RESPONSES = 50
+_XHR_MAX_BYTES = 2_000_000
+_XHR_KEPT_HEADERS = ("accept", "content-type")
+_ID_PREFIX = re.compile(
+    r"^(\d{3,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})", re.I
+)
+_PLACEHOLDER = re.compile(r"\{(seg\d+(?:_id)?)\}")
 
-    # Strategy 2: Open Graph meta tags (widely used)
-    if not title:
-        og_title = soup.select_one("meta[property='og:title']")
-        if og_title:
-            title = og_title.get("content", "")
 
-    if not company:
-        og_site = soup.select_one("meta[property='og:site_name']")
-        if og_site:
-            company = og_site.get("content", "")
+class _XhrRecorder:
+    """Collects the JSON XHR/fetch responses of one page render."""
 
-    # Strategy 3: Common CSS selectors for job boards
-    if not title:
-        for selector in [
-            "h1.job-title",
-            "h1.posting-headline",
-            "[data-qa='job-title']",
-            "[data-testid='job-title']",
-            ".job-title h1",
-            ".job-title",
-            ".posting-title",
-            "[class*='JobTitle']",
-            "[class*='job-title']",
-            "h1",
-        ]:
-            el = soup.select_one(selector)
-            if el and el.get_text(strip=True):
-                title = el.get_text(strip=True)
-                break
+    def __init__(self, page):
+        self.responses = []
+        if XHR_CAPTURE:
+            page.on("response", self._on_response)
 
-    if not company:
-        for selector in [
-            ".company-name",
-            "[data-qa='company-name']",
-            "[data-testid='company-name']",
-            "[class*='CompanyName']",
-            "[class*='company-name']",
-            ".employer-name",
-            ".hiring-company",
-        ]:
-            el = soup.select_one(selector)
-            if el and el.get_text(strip=True):
-                company = el.get_text(strip=True)
-                break
+    def _on_response(self, response):
+        if len(self.responses) >= _XHR_MAX_RESPONSES or response.status != 200:
+            return
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        if "json" in (response.headers.get("content-type") or ""):
+            self.responses.append(response)
 
-    # Strategy 4: Extract company from URL subdomain or path
-    if not company:
-        parsed = urlparse(url)
-        domain = parsed.hostname or ""
-        path = parsed.path
-
-        # Known ATS patterns where company is in subdomain
-        ats_with_subdomain = ["personio", "recruitee", "bamboohr", "workday"]
-        for ats in ats_with_subdomain:
-            if ats in domain:
-                # Company is likely the subdomain: company.jobs.personio.de
-                parts = domain.split(".")
-                if len(parts) > 2:
-                    company = parts[0].replace("-", " ").title()
-                break
+    def payloads(self) -> list[dict]:
+        """Decoded bodies with their requests. Call before the page closes."""
+        captured = []
+        for response in self.responses:
+            try:
+                body = response.body()
+                if len(body) > _XHR_MAX_BYTES:
+                    continue
+                data = json.loads(body)
+            except Exception:
+                continue
+            request = response.request
+            captured.append({
+                "url": response.url,
+                "method": request.method,
+                "body": request.post_data or "",
+                "headers": {
+                    k: v for k, v in request.headers.items()
+                    if k.lower() in _XHR_KEPT_HEADERS
+                },
+                "data": data,
+            })
+        return captured
+
+
+def _url_tokens(url: str) -> dict[str, str]:
+    """Placeholder name → value for each URL path segment and its id prefix
+    (`123-senior-pm` gives seg2=123-senior-pm and seg2_id=123)."""
+    tokens = {}
+    segments = [p for p in urlparse(url).path.split("/") if p]
+    for i, segment in enumerate(segments):
+        tokens[f"seg{i}"] = segment
+        match = _ID_PREFIX.match(segment)
+        if match and match.group(1) != segment:
+            tokens[f"seg{i}_id"] = match.group(1)
+    return tokens
+
+
+def _string_leaves(data, path=()):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _string_leaves(value, path + (key,))
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            yield from _string_leaves(value, path + (i,))
+    elif isinstance(data, str):
+        yield path, data
+
+
+def _json_node(data, path):
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return data
 
-        # Known ATS patterns where company is in path
-        ats_with_path = ["greenhouse", "lever", "ashby", "workable", "screenloop"]
-        if not company:
-            for ats in ats_with_path:
-                if ats in domain:
-                    # Company is in path: /careers/{company}/ or /{company}/jobs/
-                    path_parts = [p for p in path.split("/") if p]
-                    if path_parts:
-                        company = path_parts[0].replace("-", " ").title()
-                    break
 
-        # Last resort: use domain name if not a known ATS
-        if not company:
-            known_ats = [
-                "greenhouse", "lever", "ashby", "workable", "personio",
-                "smartrecruiters", "bamboohr", "recruitee", "screenloop",
-                "workday", "icims", "taleo", "jobvite", "breezy",
-            ]
-            if not any(ats in domain for ats in known_ats):
-                company = domain.split(".")[0].title()
+def _json_at(data, path):
+    data = _json_node(data, path)
+    return data if isinstance(data, str) else ""
 
-    # Clean up HTML for description
-    for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
-        tag.decompose()
 
-    if not description:
-        # Try to find job description container
-        for selector in [
-            ".job-description",
-            "[data-testid='job-description']",
-            ".posting-description",
-            ".job-details",
-            "[class*='JobDescription']",
-            "[class*='job-description']",
-            "main",
-            "article",
-        ]:
-            el = soup.select_one(selector)
-            if el:
-                description = el.get_text(separator="\n", strip=True)
-                if len(description) > 200:
-                    break
+def _id_tokens(tokens: dict[str, str]) -> dict[str, str]:
+    """The URL tokens that identify a posting: id prefixes, and segments
+    with digits (numeric ids, UUIDs) — not words like "jobs" or "careers"."""
+    return {
+        name: value for name, value in tokens.items()
+        if name.endswith("_id") or any(c.isdigit() for c in value)
+    }
 
-        # Fallback to full page text
-        if len(description) < 200:
-            description = soup.get_text(separator="\n", strip=True)
 
+def _id_path(data, parent, ids: dict[str, str]) -> tuple[list, str] | None:
+    """Path and token name of a field beside the title holding the URL's id."""
+    node = _json_node(data, parent)
+    if not isinstance(node, dict):
+        return None
+    for key, value in node.items():
+        if isinstance(value, bool) or not isinstance(value, (str, int)):
+            continue
+        for name, token in ids.items():
+            if str(value).strip() == token:
+                return [*parent, key], name
+    return None
+
+
+def _posting_paths(data, title: str, company: str) -> dict | None:
+    """Locate the posting in a JSON payload: the leaf equal to the rendered
+    title, and the long text leaves beside it (same parent object)."""
+    leaves = list(_string_leaves(data))
+    title_paths = [p for p, v in leaves if v.strip().lower() == title.strip().lower()]
+    if not title_paths:
+        return None
+    title_path = min(title_paths, key=len)
+    parent = title_path[:-1]
+
+    description_paths = []
+    chars = 0
+    for path, value in leaves:
+        if path[:len(parent)] != parent or path == title_path:
+            continue
+        text = _fragment_to_text(value)
+        if len(text) >= 100:
+            description_paths.append(list(path))
+            chars += len(text)
+    if chars < 200:
+        return None
+
+    company_path = next(
+        (list(p) for p, v in leaves
+         if company and p[:len(parent)] == parent and v.strip() == company),
+        None,
+    )
     return {
-        "title": title,
-        "company": company,
-        "description": description,
-        "url": url,
-        "source": "html",
-        "questions": [],
+        "title_path": list(title_path),
+        "description_paths": description_paths,
+        "company_path": company_path,
+        "chars": chars,
     }
 
 
-def _empty_result(url: str) -> dict:
+def _templatize(text: str, tokens: dict[str, str]) -> tuple[str, list[str]]:
+    """Replace URL tokens found in `text` with placeholders, longest first."""
+    used = []
+    for name, value in sorted(tokens.items(), key=lambda t: -len(t[1])):
+        if len(value) < 3:
+            continue
+        pattern = re.compile(rf"(?<![A-Za-z0-9]){re.escape(value)}(?![A-Za-z0-9])")
+        text, n = pattern.subn("{" + name + "}", text)
+        if n:
+            used.append(name)
+    return text, used
+
+
+def _learn_xhr_template(url: str, result: dict, payloads: list[dict]):
+    """Persist an endpoint template for this domain from the captured payload
+    that carries the rendered posting (most description text wins)."""
+    tokens = _url_tokens(url)
+    ids = _id_tokens(tokens)
+    best = None
+    for payload in payloads:
+        paths = _posting_paths(payload["data"], result["title"], result["company"])
+        if not paths:
+            continue
+        api, used = _templatize(payload["url"], tokens)
+        body, used_in_body = _templatize(payload["body"], tokens)
+        used = set(used) | set(used_in_body)
+        if not used & ids.keys():
+            continue  # No posting id in the request — same endpoint for every posting
+        # The id beside the title proves the payload is this posting; without
+        # one, only a single-object payload is trusted (a list index in the
+        # title path means a listing that happens to include it)
+        id_found = _id_path(payload["data"], paths["title_path"][:-1], ids)
+        if not id_found and any(isinstance(k, int) for k in paths["title_path"]):
+            continue
+        if best and paths["chars"] <= best["chars"]:
+            continue
+        segments = [p for p in urlparse(url).path.split("/") if p]
+        best = {
+            "api": api,
+            "method": payload["method"],
+            "body": body,
+            "headers": payload["headers"],
+            "company": result["company"],
+            # Literal page segments a URL must share to reuse the template
+            "path_shape": [
+                None if f"seg{i}" in used or f"seg{i}_id" in used or any(c.isdigit() for c in seg)
+                else seg
+                for i, seg in enumerate(segments)
+            ],
+            "id_path": id_found[0] if id_found else None,
+            "id_token": id_found[1] if id_found else None,
+            **paths,
+        }
+    if best:
+        cache_put("xhr_endpoints", urlparse(url).hostname or "", best)
+
+
+def _xhr_template(url: str) -> dict | None:
+    """The captured endpoint template for this URL's domain, if its path fits."""
+    template = cache_get("xhr_endpoints", urlparse(url).hostname or "", ttl=XHR_TEMPLATE_TTL)
+    if not template or not template.get("api") or "id_path" not in template:
+        return None  # None yet, dropped, or learned before posting ids were checked
+    segments = [p for p in urlparse(url).path.split("/") if p]
+    shape = template["path_shape"]
+    if len(segments) != len(shape):
+        return None
+    if any(lit is not None and lit != seg for lit, seg in zip(shape, segments)):
+        return None
+    tokens = _url_tokens(url)
+    needed = _PLACEHOLDER.findall(template["api"] + template["body"])
+    if template["id_token"]:
+        needed.append(template["id_token"])
+    if not all(name in tokens for name in needed):
+        return None
+    return template
+
+
+def _scrape_xhr_endpoint(url: str, template: dict) -> dict:
+    """Fetch a posting from a captured endpoint template — no browser."""
+    tokens = _url_tokens(url)
+
+    def fill(text: str) -> str:
+        return _PLACEHOLDER.sub(lambda m: tokens[m.group(1)], text)
+
+    headers = {**_HEADERS, **template.get("headers", {})}
+    if template["method"] == "POST":
+        resp = http_post(
+            fill(template["api"]), data=fill(template["body"]).encode("utf-8"),
+            headers=headers, cache=True,
+        )
+    else:
+        resp = http_get(fill(template["api"]), headers=headers, cache=True)
+    resp.raise_for_status()
+    data = resp.json()
+    if template["id_path"]:
+        posting_id = str(_json_node(data, template["id_path"])).strip()
+        if posting_id != tokens[template["id_token"]]:
+            raise ValueError(f"Endpoint returned posting {posting_id}, not this URL's")
+
+    parts = [_fragment_to_text(_json_at(data, p)) for p in template["description_paths"]]
+    company = _json_at(data, template["company_path"]) if template["company_path"] else ""
     return {
-        "title": "",
-        "company": "",
-        "description": "",
+        "title": _json_at(data, template["title_path"]).strip(),
+        "company": company.strip() or template["company"],
+        "description": "\n\n".join(p for p in parts if p),
         "url": url,
-        "source": "empty",
+        "source": "xhr",
         "questions": [],
     }
 
 
-# ─── Main Entry Point ────────────────────────────────────────────
+def _try_xhr_template(url: str, log=None) -> dict | None:
+    """Scrape via this domain's captured endpoint. A template that errors or
+    comes back thin is dropped, so the next render captures a fresh one."""
+    template = _xhr_template(url)
+    if not template:
+        return None
+    if log:
+        log("  [dim]Using captured JSON endpoint (no browser)...[/dim]")
+    try:
+        result = _scrape_xhr_endpoint(url, template)
+        if not _needs_enhanced(result):
+            return result
+    except Exception:
+        pass
+    cache_put("xhr_endpoints", urlparse(url).hostname or "", {})
+    if log:
+        log("  [dim]Captured endpoint no longer works — rendering instead[/dim]")
+    return None
 
 
-def scrape_job_posting(
-    url: str, console: Console | None = None
-) -> dict:
-    """Scrape a job posting URL. Tries ATS APIs first, then HTML,
-    then Playwright.
+# ─── HTML Extraction ─────────────────────────────────────────────
 
-    Returns dict: title, company, description, url, source, questions
+
+def _default_html_parser() -> str:
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+# BeautifulSoup tree builder for full pages: lxml's C parser is several times
+# faster than the stdlib html.parser on large career pages. "auto" = lxml when
+# installed, else html.parser.
+SCRAPER_HTML_PARSER = os.getenv("SCRAPER_HTML_PARSER", "auto")
+HTML_PARSER = (
+    _default_html_parser() if SCRAPER_HTML_PARSER == "auto" else SCRAPER_HTML_PARSER
+)
+
+_JSONLD_PATTERN = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Tags dropped before extracting description text
+_NOISE_TAGS = frozenset({"script", "style", "nav", "footer", "header", "aside"})
+
+_TITLE_SELECTORS = [
+    "h1.job-title",
+    "h1.posting-headline",
+    "[data-qa='job-title']",
+    "[data-testid='job-title']",
+    ".job-title h1",
+    ".job-title",
+    ".posting-title",
+    "[class*='JobTitle']",
+    "[class*='job-title']",
+    "h1",
+]
+
+_COMPANY_SELECTORS = [
+    ".company-name",
+    "[data-qa='company-name']",
+    "[data-testid='company-name']",
+    "[class*='CompanyName']",
+    "[class*='company-name']",
+    ".employer-name",
+    ".hiring-company",
+]
+
+_DESCRIPTION_SELECTORS = [
+    ".job-description",
+    "[data-testid='job-description']",
+    ".posting-description",
+    ".job-details",
+    "[class*='JobDescription']",
+    "[class*='job-description']",
+    "main",
+    "article",
+]
+
+_SIMPLE_SELECTOR = re.compile(
+    r"^(\w+)?(?:\.([\w-]+))?(?:\[([\w-]+)(\*?)='([^']*)'\])?$"
+)
+
+
+def _compile_selector(selector: str) -> tuple:
+    """Compile the `tag.class[attr*='value']` (optionally `ancestor target`)
+    subset of CSS used above into (ancestor, target) match tuples."""
+    parts = [_SIMPLE_SELECTOR.match(p).groups() for p in selector.split()]
+    return (parts[0] if len(parts) == 2 else None, parts[-1])
+
+
+def _matches(el, simple: tuple) -> bool:
+    tag, cls, attr, op, value = simple
+    if tag and el.name != tag:
+        return False
+    if cls and cls not in (el.get("class") or ()):
+        return False
+    if attr:
+        actual = el.get(attr)
+        if actual is None:
+            return False
+        if isinstance(actual, list):
+            actual = " ".join(actual)
+        return value in actual if op else actual == value
+    return True
+
+
+def _index_matchers(groups: list[list[str]]) -> dict:
+    """Index compiled selectors by tag, class token, exact attribute and
+    class substring, so the tree walk does dict lookups per element instead
+    of testing every selector against every element."""
+    index = {"tag": {}, "class": {}, "attr": {}, "class_substring": [], "ancestors": []}
+    for group, selectors in enumerate(groups):
+        for slot, selector in enumerate(selectors):
+            ancestor, target = _compile_selector(selector)
+            entry = (group, slot, ancestor, target)
+            tag, cls, attr, op, value = target
+            if cls:
+                index["class"].setdefault(cls, []).append(entry)
+            elif attr == "class" and op:
+                index["class_substring"].append((value, entry))
+            elif attr:
+                index["attr"].setdefault(attr, {}).setdefault(value, []).append(entry)
+            else:
+                index["tag"].setdefault(tag, []).append(entry)
+            if ancestor and ancestor not in index["ancestors"]:
+                index["ancestors"].append(ancestor)
+    return index
+
+
+_CANDIDATE_INDEX = _index_matchers(
+    [_TITLE_SELECTORS, _COMPANY_SELECTORS, _DESCRIPTION_SELECTORS]
+)
+
+
+def _jsonld_job_posting(html: str) -> dict:
+    """Find a JobPosting in the page's JSON-LD blocks with a regex scan,
+    so pages that carry one never need a DOM parse."""
+    for match in _JSONLD_PATTERN.finditer(html):
+        try:
+            data = json.loads(match.group(1).strip())
+        except (json.JSONDecodeError, TypeError):
+            continue
+        items = data if isinstance(data, list) else [data]
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            # Yoast & co. wrap everything in an @graph
+            candidates = item.get("@graph") if isinstance(item.get("@graph"), list) else [item]
+            for candidate in candidates:
+                if isinstance(candidate, dict) and candidate.get("@type") == "JobPosting":
+                    return candidate
+    return {}
+
+
+def _jsonld_posting_arrived(body: bytearray, start: int) -> bool:
+    """Stop predicate for streamed pages: a JSON-LD JobPosting complete enough
+    for _extract_from_html's early exit is in `body`, so the rest of the page
+    (often megabytes of inlined JS) would never be used."""
+    # Re-check only when the newest chunk closes a <script> block
+    if b"</script" not in body[max(0, start - 8):].lower() or b"JobPosting" not in body:
+        return False
+    html = body.decode("utf-8", errors="replace")
+    title, company, description = _jsonld_fields(_jsonld_job_posting(html))
+    return bool(title and company and len(description) >= 200)
+
+
+def _jsonld_fields(posting: dict) -> tuple[str, str, str]:
+    """(title, company, plain-text description) from a JSON-LD JobPosting."""
+    title = posting.get("title") or ""
+    organization = posting.get("hiringOrganization")
+    company = organization.get("name", "") if isinstance(organization, dict) else ""
+    description = posting.get("description") or ""
+    if "&lt;" in description:
+        description = unescape(description)
+    if "<" in description:
+        description = _fragment_to_text(description)
+    return (
+        title.strip() if isinstance(title, str) else "",
+        company.strip() if isinstance(company, str) else "",
+        description if isinstance(description, str) else "",
+    )
+
+
+def _collect_candidates(soup: BeautifulSoup) -> dict:
+    """Single walk over the tree collecting OG meta, the first element matching
+    each title/company/description selector, and the noise tags to drop.
+
+    Description candidates skip anything inside a noise tag, as if those had
+    already been decomposed.
+    """
+    index = _CANDIDATE_INDEX
+    hits = [
+        [None] * len(_TITLE_SELECTORS),
+        [None] * len(_COMPANY_SELECTORS),
+        [None] * len(_DESCRIPTION_SELECTORS),
+    ]
+    found = {"og:title": None, "og:site_name": None, "noise": []}
+
+    # (element, inside a noise tag, ancestor selectors matched above it)
+    # Tags only: the doctype, comments and text nodes sit at the top level too
+    stack = [
+        (child, False, ()) for child in reversed(soup.contents) if hasattr(child, "attrs")
+    ]
+    while stack:
+        el, in_noise, above = stack.pop()
+        name = el.name
+        classes = el.get("class") or ()
+
+        if name == "meta":
+            prop = el.get("property")
+            if prop in ("og:title", "og:site_name") and found[prop] is None:
+                found[prop] = el.get("content", "")
+
+        is_noise = name in _NOISE_TAGS
+        if is_noise and not in_noise:
+            found["noise"].append(el)
+
+        candidates = list(index["tag"].get(name, ()))
+        for cls in classes:
+            candidates.extend(index["class"].get(cls, ()))
+        for attr, by_value in index["attr"].items():
+            value = el.attrs.get(attr)
+            if value is not None:
+                candidates.extend(by_value.get(value, ()))
+        if classes:
+            joined = " ".join(classes)
+            for substring, entry in index["class_substring"]:
+                if substring in joined:
+                    candidates.append(entry)
+
+        for group, slot, ancestor, target in candidates:
+            if hits[group][slot] is not None:
+                continue
+            if group == 2 and (in_noise or is_noise):
+                continue  # description text never comes from noise tags
+            if ancestor and ancestor not in above:
+                continue
+            if _matches(el, target):
+                hits[group][slot] = el
+
+        matched = tuple(a for a in index["ancestors"] if _matches(el, a))
+        if matched:
+            above = above + matched
+        in_noise = in_noise or is_noise
+        for child in reversed(el.contents):
+            if hasattr(child, "attrs"):
+                stack.append((child, in_noise, above))
+
+    found["title"], found["company"], found["description"] = hits
+    return found
+
+
+def _company_from_url(url: str) -> str:
+    """Guess the company from an ATS subdomain / path, or the site's domain."""
+    parsed = urlparse(url)
+    domain = parsed.hostname or ""
+    path = parsed.path
+
+    # Known ATS patterns where company is in subdomain
+    ats_with_subdomain = ["personio", "recruitee", "bamboohr", "workday"]
+    for ats in ats_with_subdomain:
+        if ats in domain:
+            # Company is likely the subdomain: company.jobs.personio.de
+            parts = domain.split(".")
+            if len(parts) > 2:
+                return parts[0].replace("-", " ").title()
+            break
+
+    # Known ATS patterns where company is in path
+    ats_with_path = ["greenhouse", "lever", "ashby", "workable", "screenloop"]
+    for ats in ats_with_path:
+        if ats in domain:
+            # Company is in path: /careers/{company}/ or /{company}/jobs/
+            path_parts = [p for p in path.split("/") if p]
+            if path_parts:
+                return path_parts[0].replace("-", " ").title()
+            break
+
+    # Last resort: use domain name if not a known ATS
+    known_ats = [
+        "greenhouse", "lever", "ashby", "workable", "personio",
+        "smartrecruiters", "bamboohr", "recruitee", "screenloop",
+        "workday", "icims", "taleo", "jobvite", "breezy",
+    ]
+    if not any(ats in domain for ats in known_ats):
+        return domain.split(".")[0].title()
+    return ""
+
+
+# Readability-style fallback when no description selector matched: score the
+# text blocks, credit their containers, penalise link-heavy and boilerplate-
+# named containers (cookie banners, menus, related jobs), keep the winner and
+# its strong siblings.
+_BOILERPLATE_HINTS = re.compile(
+    r"cookie|consent|gdpr|banner|nav|menu|breadcrumb|footer|sidebar|share|"
+    r"social|newsletter|related|similar|comment|promo|modal|popup|subscribe",
+    re.I,
+)
+_CONTENT_HINTS = re.compile(
+    r"job|posting|vacanc|position|description|content|article|main|details", re.I
+)
+_TEXT_BLOCKS = ["p", "li", "pre", "td", "dd", "h2", "h3", "h4"]
+
+
+def _class_weight(el) -> int:
+    hints = " ".join(el.get("class") or []) + " " + (el.get("id") or "")
+    weight = 0
+    if _BOILERPLATE_HINTS.search(hints):
+        weight -= 25
+    if _CONTENT_HINTS.search(hints):
+        weight += 25
+    return weight
+
+
+def _link_density(el) -> float:
+    text_len = len(el.get_text(strip=True)) or 1
+    link_len = sum(len(a.get_text(strip=True)) for a in el.find_all("a"))
+    return min(1.0, link_len / text_len)
+
+
+def _main_content_text(soup: BeautifulSoup) -> str:
+    """Text of the page's main content block, or "" if none stands out."""
+    scores: dict[int, list] = {}  # id(container) -> [container, score]
+    for block in soup.find_all(_TEXT_BLOCKS):
+        text = block.get_text(" ", strip=True)
+        if len(text) < 25:
+            continue
+        points = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = block.parent
+        if block.name == "li" and parent is not None and parent.name in ("ul", "ol"):
+            parent = parent.parent  # credit the section, not one list
+        grandparent = parent.parent if parent is not None else None
+        for container, share in ((parent, 1.0), (grandparent, 0.5)):
+            if container is None or container.name in ("[document]", "html"):
+                continue
+            entry = scores.setdefault(id(container), [container, _class_weight(container)])
+            entry[1] += points * share
+    if not scores:
+        return ""
+
+    for entry in scores.values():
+        entry[1] *= 1 - _link_density(entry[0])
+    top, top_score = max(scores.values(), key=lambda e: e[1])
+    if top_score <= 0:
+        return ""
+
+    # Sections split into sibling containers: keep siblings scoring close to top
+    parts = [top]
+    if top.parent is not None:
+        threshold = max(10, top_score * 0.2)
+        parts = [
+            sibling for sibling in top.parent.find_all(recursive=False)
+            if sibling is top or scores.get(id(sibling), [None, 0])[1] >= threshold
+        ]
+    return "\n".join(p.get_text(separator="\n", strip=True) for p in parts).strip()
+
+
+def _main_or_page_text(soup: BeautifulSoup) -> tuple[str, int]:
+    """(description, full page chars): the main content block when it holds
+    200+ chars, else the whole page text."""
+    page_text = soup.get_text(separator="\n", strip=True)
+    main = _main_content_text(soup)
+    return (main if len(main) >= 200 else page_text), len(page_text)
+
+
+def _extract_from_html(html: str, url: str) -> dict:
+    """Parse HTML and extract job posting data using multiple strategies.
+
+    A complete JSON-LD JobPosting returns before any DOM parse; otherwise one
+    pass over the tree collects every candidate (see _collect_candidates).
+    """
+    # Strategy 1: JSON-LD structured data (most reliable when present)
+    title, company, description = _jsonld_fields(_jsonld_job_posting(html))
+    if title and company and len(description) >= 200:
+        return {
+            "title": title,
+            "company": company,
+            "description": description,
+            "url": url,
+            "source": "html",
+            "questions": [],
+        }
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+    found = _collect_candidates(soup)
+
+    # Strategy 2: Open Graph meta tags (widely used)
+    title = title or found["og:title"] or ""
+    company = company or found["og:site_name"] or ""
+
+    # Strategy 3: Common CSS selectors for job boards
+    if not title:
+        for el in filter(None, found["title"]):
+            title = el.get_text(strip=True)
+            if title:
+                break
+
+    if not company:
+        for el in filter(None, found["company"]):
+            company = el.get_text(strip=True)
+            if company:
+                break
+
+    # Strategy 4: Extract company from URL subdomain or path
+    if not company:
+        company = _company_from_url(url)
+
+    # Clean up HTML for description
+    for tag in found["noise"]:
+        tag.decompose()
+
+    page_chars = None
+    if not description:
+        # Try to find job description container
+        for el in filter(None, found["description"]):
+            description = el.get_text(separator="\n", strip=True)
+            if len(description) > 200:
+                break
+
+        # Fallback: the page's main content block, else full page text
+        if len(description) < 200:
+            description, page_chars = _main_or_page_text(soup)
+
+    result = {
+        "title": title,
+        "company": company,
+        "description": description,
+        "url": url,
+        "source": "html",
+        "questions": [],
+    }
+    if page_chars is not None:
+        result["page_chars"] = page_chars  # reported by step 1 as boilerplate removed
+    return result
+
+
+def _empty_result(url: str) -> dict:
+    return {
+        "title": "",
+        "company": "",
+        "description": "",
+        "url": url,
+        "source": "empty",
+        "questions": [],
+    }
+
+
+# ─── Strategy Memory ─────────────────────────────────────────────
+
+# Per-site record of which strategy produced adequate content, its latency
+# and failures. Counts halve every STRATEGY_HALF_LIFE, so an API that failed
+# or a site that once needed Playwright gets re-probed as the evidence fades;
+# learned generic preferences are also dropped for one full probe every
+# STRATEGY_REPROBE_AFTER.
+STRATEGY_HALF_LIFE = float(os.getenv("STRATEGY_HALF_LIFE_DAYS", "14")) * 86400
+STRATEGY_REPROBE_AFTER = float(os.getenv("STRATEGY_REPROBE_DAYS", "7")) * 86400
+_STRATEGY_FAIL_LIMIT = 1.5  # ~two recent failures (counts are decayed floats)
+
+_strategy_lock = threading.Lock()
+
+
+def _site_key(url: str, match: re.Match | None = None) -> str:
+    """Hostname, plus the board/company for ATS URLs (shared hosts)."""
+    host = urlparse(url).hostname or ""
+    if match and match.group(1) and match.group(1) != host:
+        return f"{host}/{match.group(1)}"
+    return host
+
+
+def _load_site_memory(site: str) -> dict:
+    entry = cache_get("strategies", site, ttl=STRATEGY_HALF_LIFE * 8)
+    return entry or {}
+
+
+def _decayed(stats: dict, now: float) -> dict:
+    age = max(0.0, now - stats.get("updated", now))
+    factor = 0.5 ** (age / STRATEGY_HALF_LIFE)
+    return {
+        **stats,
+        "ok": stats.get("ok", 0) * factor,
+        "fail": stats.get("fail", 0) * factor,
+    }
+
+
+def _record_strategy(site: str, strategy: str, ok: bool, latency: float):
+    now = time.time()
+    with _strategy_lock:
+        entry = _load_site_memory(site)
+        stats = _decayed(entry.get(strategy, {}), now)
+        stats["ok" if ok else "fail"] += 1
+        if ok:
+            ms = latency * 1000
+            prev = stats.get("latency_ms")
+            stats["latency_ms"] = round(ms if prev is None else 0.7 * prev + 0.3 * ms)
+        stats["updated"] = now
+        entry[strategy] = stats
+        cache_put("strategies", site, entry)
+
+
+def _mark_probed(site: str):
+    with _strategy_lock:
+        entry = _load_site_memory(site)
+        entry["probed_at"] = time.time()
+        cache_put("strategies", site, entry)
+
+
+# Client errors that are not about this strategy (timeouts, rate limits)
+_TRANSIENT_STATUSES = (408, 429)
+# A single-posting lookup answering these means the posting was closed or
+# removed, not that the board's API stopped working
+_POSTING_GONE_STATUSES = (404, 410)
+
+
+def _strategy_rejected(exc: Exception, posting_lookup: bool = False) -> bool:
+    """True if `exc` says the strategy does not work for the site (an HTTP
+    4xx: board gone, blocked, bad id). Connection errors, timeouts, an
+    expired deadline and 5xx are transient and not held against it, nor is
+    a 404/410 for one posting (`posting_lookup`)."""
+    status = getattr(getattr(exc, "response", None), "status_code", None) or 0
+    if posting_lookup and status in _POSTING_GONE_STATUSES:
+        return False
+    return 400 <= status < 500 and status not in _TRANSIENT_STATUSES
+
+
+def _run_strategy(
+    site: str, strategy: str, fn, *args, posting_lookup: bool = False
+) -> dict:
+    """Run one scrape strategy and record its outcome in strategy memory:
+    success, a thin result or a 4xx count; transient errors are not recorded,
+    nor is anything from a hedged strategy cancelled by the winner.
+    `posting_lookup`: `fn` fetches one posting, whose 404 is the posting's."""
+    start = time.monotonic()
+    try:
+        result = fn(*args)
+    except Exception as e:
+        if _strategy_rejected(e, posting_lookup) and not budget_cancelled():
+            _record_strategy(site, strategy, False, time.monotonic() - start)
+        raise
+    if not budget_cancelled():
+        _record_strategy(
+            site, strategy, not _needs_enhanced(result), time.monotonic() - start
+        )
+    return result
+
+
+def _strategy_failing(site: str, strategy: str) -> bool:
+    """True when a strategy keeps failing here and hasn't decayed back yet."""
+    stats = _load_site_memory(site).get(strategy)
+    if not stats:
+        return False
+    stats = _decayed(stats, time.time())
+    return stats["fail"] >= _STRATEGY_FAIL_LIMIT and stats["ok"] < 0.5
+
+
+def _preferred_strategy(site: str) -> str | None:
+    """Fastest generic strategy that has produced adequate content here."""
+    entry = _load_site_memory(site)
+    now = time.time()
+    if now - entry.get("probed_at", 0) > STRATEGY_REPROBE_AFTER:
+        return None  # Due for a full probe
+
+    best, best_ms = None, None
+    for name, _ in _generic_strategies():
+        if name not in entry:
+            continue
+        stats = _decayed(entry[name], now)
+        if stats["ok"] >= 0.5 and stats["ok"] > stats["fail"]:
+            ms = stats.get("latency_ms") or 0
+            if best is None or ms < best_ms:
+                best, best_ms = name, ms
+    return best
+
+
+# ─── Main Entry Point ────────────────────────────────────────────
+
+# (strategy name, label, URL pattern, adapter(group1, group2)) — tried in order
+_ATS_ADAPTERS = [
+    ("greenhouse_api", "Greenhouse", _GREENHOUSE_PATTERN, _scrape_greenhouse),
+    ("lever_api", "Lever", _LEVER_PATTERN, _scrape_lever),
+    ("ashby_api", "Ashby", _ASHBY_PATTERN, _scrape_ashby),
+    ("workable_api", "Workable", _WORKABLE_PATTERN, _scrape_workable),
+    ("personio", "Personio", _PERSONIO_PATTERN, _scrape_personio),
+    ("smartrecruiters_api", "SmartRecruiters", _SMARTRECRUITERS_PATTERN, _scrape_smartrecruiters),
+    ("recruitee_api", "Recruitee", _RECRUITEE_PATTERN, _scrape_recruitee),
+    ("join", "JOIN", _JOIN_PATTERN, _scrape_join),
+    ("screenloop", "Screenloop", _SCREENLOOP_PATTERN, _scrape_screenloop),
+]
+
+
+def scrape_job_posting(
+    url: str, console: Console | None = None, budget: float | None = None
+) -> dict:
+    """Scrape a job posting URL. Tries ATS APIs first, then HTML,
+    then Playwright.
+
+    Returns dict: title, company, description, url, source, questions
+
+    Complete results are cached on disk for SCRAPE_CACHE_TTL, so re-running a
+    job (after a failure, or for another resume variant) skips the network.
+    Per-site strategy memory skips failing ATS APIs and goes straight to the
+    generic strategy that worked last time.
+
+    `budget` caps the whole scrape in seconds (default: none): every fetch
+    and browser wait is cut to the time left, and when it runs out the best
+    partial result so far is returned.
     """
+    with deadline_scope(budget):
+        return _scrape_job_posting_cached(url, console)
+
+
+def _scrape_job_posting_cached(url: str, console: Console | None) -> dict:
     log = console.print if console else print
 
-    # Check for known ATS API patterns
-    gh = _GREENHOUSE_PATTERN.search(url)
-    if gh:
-        log("  [dim]Greenhouse detected — using API...[/dim]")
-        try:
-            return _scrape_greenhouse(gh.group(1), gh.group(2))
-        except Exception as e:
-            log(f"  [yellow]Greenhouse API failed: {e}. Falling back to HTML.[/yellow]")
+    cached = cache_get("jobs", url)
+    if cached:
+        age_min = int((time.time() - cached["stored_at"]) / 60)
+        log(f"  [dim]Using cached scrape ({age_min} min old)[/dim]")
+        return cached["result"]
 
-    lever = _LEVER_PATTERN.search(url)
-    if lever:
-        log("  [dim]Lever detected — using API...[/dim]")
-        try:
-            return _scrape_lever(lever.group(1), lever.group(2))
-        except Exception as e:
-            log(f"  [yellow]Lever API failed: {e}. Falling back to HTML.[/yellow]")
+    result = _scrape_job_posting_uncached(url, log)
+    if len(result.get("description", "")) >= 200 and result.get("title"):
+        cache_put("jobs", url, {"result": result})
+    return result
 
-    ashby = _ASHBY_PATTERN.search(url)
-    if ashby:
-        log("  [dim]Ashby detected — using API...[/dim]")
-        try:
-            return _scrape_ashby(ashby.group(1), ashby.group(2))
-        except Exception as e:
-            log(f"  [yellow]Ashby API failed: {e}. Falling back to HTML.[/yellow]")
 
-    workable = _WORKABLE_PATTERN.search(url)
-    if workable:
-        log("  [dim]Workable detected — using API...[/dim]")
-        try:
-            return _scrape_workable(workable.group(1), workable.group(2))
-        except Exception as e:
-            log(f"  [yellow]Workable API failed: {e}. Falling back to HTML.[/yellow]")
+# ─── Batch Scraping ──────────────────────────────────────────────
+
+# Concurrency for scrape_many: total in-flight scrapes, and per host so one
+# ATS or career site is never hit by more than a couple of requests at once
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "8"))
+SCRAPE_PER_HOST = int(os.getenv("SCRAPE_PER_HOST", "2"))
+
+# scrape_many worker threads, one pool per concurrency level. asyncio's
+# default executor can be smaller than `concurrency` (cpu count + 4), and
+# long-lived workers keep their warm browsers between batches.
+_batch_executors: dict[int, ThreadPoolExecutor] = {}
+_batch_executors_lock = threading.Lock()
+
+
+def _get_batch_executor(concurrency: int) -> ThreadPoolExecutor:
+    with _batch_executors_lock:
+        if concurrency not in _batch_executors:
+            _batch_executors[concurrency] = ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="scrape-batch"
+            )
+        return _batch_executors[concurrency]
+
+
+async def async_scrape_job_posting(
+    url: str, console: Console | None = None, budget: float | None = None
+) -> dict:
+    """Async scrape_job_posting: same cache, adapter dispatch and fallbacks.
+
+    The scrape runs in a worker thread on the shared pooled session (and the
+    thread's warm browser when Playwright is needed), so it never blocks the
+    event loop.
+    """
+    return await asyncio.to_thread(scrape_job_posting, url, console, budget)
+
+
+async def scrape_many(
+    urls: list[str],
+    console: Console | None = None,
+    concurrency: int = SCRAPE_CONCURRENCY,
+    per_host: int = SCRAPE_PER_HOST,
+    budget: float | None = None,
+):
+    """Scrape many postings concurrently, yielding (url, result, error) as
+    each one finishes (completion order, not input order).
+
+    `error` is None on success, else the exception message with an empty
+    result. Duplicate URLs are scraped once. `budget` applies per posting,
+    from the moment its scrape starts.
+    """
+    overall = asyncio.Semaphore(concurrency)
+    host_slots: dict[str, asyncio.Semaphore] = {}
+    loop = asyncio.get_running_loop()
+    workers = _get_batch_executor(max(concurrency, 1))
+
+    async def scrape_one(url: str):
+        host = urlparse(url).hostname or ""
+        slots = host_slots.setdefault(host, asyncio.Semaphore(per_host))
+        async with slots, overall:
+            try:
+                result = await loop.run_in_executor(
+                    workers, copy_context().run, scrape_job_posting, url, console, budget
+                )
+                return url, result, None
+            except Exception as e:
+                return url, _empty_result(url), str(e)
+
+    tasks = [asyncio.ensure_future(scrape_one(u)) for u in dict.fromkeys(urls)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
 
-    personio = _PERSONIO_PATTERN.search(url)
-    if personio:
-        log("  [dim]Personio detected...[/dim]")
+def _scrape_job_posting_uncached(url: str, log) -> dict:
+    site = _site_key(url)
+
+    # Known ATS patterns first, skipping adapters that keep failing for this board
+    for name, label, pattern, adapter in _ATS_ADAPTERS:
+        match = pattern.search(url)
+        if not match:
+            continue
+        site = _site_key(url, match)
+        if _strategy_failing(site, name):
+            log(f"  [dim]{label} detected — skipping {name} (failed recently)[/dim]")
+            continue
+        log(f"  [dim]{label} detected — using {name}...[/dim]")
         try:
-            return _scrape_personio(personio.group(1), personio.group(2))
+            return _run_strategy(
+                site, name, adapter, match.group(1), match.group(2),
+                posting_lookup=bool(match.group(2)),
+            )
         except Exception as e:
-            log(f"  [yellow]Personio scrape failed: {e}. Falling back to generic.[/yellow]")
+            log(f"  [yellow]{label} scrape failed: {e}. Falling back to generic.[/yellow]")
+
+    # JS-only pages whose posting endpoint was captured on an earlier render
+    captured = _try_xhr_template(url, log)
+    if captured:
+        return captured
+
+    preferred = _preferred_strategy(site)
+    if preferred and preferred != "html":
+        log(f"  [dim]{site}: {preferred} worked before — trying it first[/dim]")
+    elif not preferred:
+        _mark_probed(site)
+
+    if SCRAPE_HEDGED:
+        return _scrape_hedged(url, log, site, preferred)
+    return _scrape_sequential(url, log, site, preferred)
+
+
+def _needs_enhanced(result: dict) -> bool:
+    """True when content is too short or missing title/company (JS probably didn't render)."""
+    return (
+        len(result.get("description", "")) < 200
+        or not result.get("title")
+        or not result.get("company")
+    )
+
+
+def _generic_strategies(preferred: str | None = None) -> list[tuple[str, object]]:
+    """Generic fallback chain, cheapest first; a learned preference goes first."""
+    strategies = [("html", _scrape_generic)]
+    if FIRECRAWL_API_KEY:
+        strategies.append(("firecrawl", _scrape_with_firecrawl))
+    strategies.append(("playwright", _scrape_with_playwright))
+    strategies.sort(key=lambda s: s[0] != preferred)
+    return strategies
+
 
-    screenloop = _SCREENLOOP_PATTERN.search(url)
-    if screenloop:
-        log("  [dim]Screenloop detected...[/dim]")
+def _scrape_sequential(
+    url: str, log, site: str, preferred: str | None = None
+) -> dict:
+    """Generic fallback chain, one strategy at a time: HTML → Firecrawl → Playwright."""
+    if preferred and preferred != "html":
         try:
-            return _scrape_screenloop(screenloop.group(1), screenloop.group(2))
+            fn = dict(_generic_strategies())[preferred]
+            result = _run_strategy(site, preferred, fn, url)
+            if not _needs_enhanced(result):
+                if preferred == "playwright":
+                    result["source"] = "playwright"
+                return result
         except Exception as e:
-            log(f"  [yellow]Screenloop scrape failed: {e}. Falling back to generic.[/yellow]")
+            log(f"  [dim]{preferred} failed: {e}[/dim]")
 
-    # Generic HTML scraping
     log("  [dim]Fetching page...[/dim]")
     try:
-        result = _scrape_generic(url)
+        result = _run_strategy(site, "html", _scrape_generic, url)
     except Exception as e:
         log(f"  [yellow]HTTP fetch failed: {e}. Trying Playwright...[/yellow]")
-        result = _scrape_with_playwright(url)
+        result = _run_strategy(site, "playwright", _scrape_with_playwright, url)
 
-    # If content is too short or missing title/company, JS probably didn't render
-    needs_enhanced = (
-        len(result.get("description", "")) < 200
-        or not result.get("title")
-        or not result.get("company")
-    )
+    if _needs_enhanced(result) and budget_expired():
+        log("  [yellow]Time budget used up — using partial data.[/yellow]")
+        return result
 
-    if needs_enhanced:
+    if _needs_enhanced(result):
         # Try Firecrawl first (better anti-bot, JS handling)
         if FIRECRAWL_API_KEY:
             log("  [yellow]Incomplete data — trying Firecrawl...[/yellow]")
             try:
-                fc_result = _scrape_with_firecrawl(url)
+                fc_result = _run_strategy(site, "firecrawl", _scrape_with_firecrawl, url)
                 if fc_result.get("description") and len(fc_result.get("description", "")) > len(result.get("description", "")):
                     result = fc_result
                     return result
             except Exception as e:
                 log(f"  [dim]Firecrawl failed: {e}[/dim]")
 
+        if budget_expired():
+            log("  [yellow]Time budget used up — using partial data.[/yellow]")
+            return result
+
         # Fall back to Playwright
         log("  [yellow]Retrying with Playwright...[/yellow]")
         try:
-            pw_result = _scrape_with_playwright(url)
+            pw_result = _run_strategy(site, "playwright", _scrape_with_playwright, url)
             # Merge: prefer Playwright results but keep any good data from HTML
             if pw_result.get("title") or not result.get("title"):
                 result["title"] = pw_result.get("title") or result.get("title", "")
@@ -731,154 +2170,577 @@ def scrape_job_posting(
     return result
 
 
-# ─── Company Research ─────────────────────────────────────────────
+_hedge_executor: ThreadPoolExecutor | None = None
+_hedge_executor_lock = threading.Lock()
 
+# How often a hedged scrape checks whether its newest strategy has started
+# (it can sit queued while the executor is busy with other scrapes)
+_HEDGE_START_POLL = 0.1
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    # Long-lived so worker threads (and anything they keep warm) are reused.
+    # Sized so scrape_many's concurrent scrapes can each run the whole chain.
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=max(SCRAPE_CONCURRENCY, 1) * len(_generic_strategies()),
+                    thread_name_prefix="scrape-hedge",
+                )
+    return _hedge_executor
 
-def _discover_important_pages(base_url: str) -> list[str]:
-    """Discover important pages on a company website for research.
 
-    Companies use different names for similar content. We look for all variations.
+def _scrape_hedged(
+    url: str, log, site: str, preferred: str | None = None
+) -> dict:
+    """Generic fallback chain with hedging: HTML → Firecrawl → Playwright.
+
+    The next strategy starts in parallel when the newest running one has
+    been running longer than SCRAPE_HEDGE_DELAY (time spent queued for a
+    worker does not count) or the running ones come back thin
+    (_needs_enhanced). The first result that passes the quality check wins
+    and the rest are cancelled: not-yet-started ones are dropped, running
+    ones have their own deadline cancelled, so their requests and browser
+    waits stop early and their outcome stays out of strategy memory. If
+    none passes, or the time budget runs out first, the partial results
+    are merged, preferring the longest description.
     """
-    from urllib.parse import urljoin, urlparse
-
-    # Comprehensive list of paths - companies use different naming conventions
-    important_paths = [
-        # About / Company
-        "/about", "/about-us", "/company", "/our-story", "/who-we-are",
-        "/team", "/our-team", "/leadership", "/our-mission",
-        # Products / Solutions / Services
-        "/solutions", "/products", "/services", "/platform", "/offerings",
-        "/what-we-do", "/our-work", "/features", "/capabilities",
-        # Case Studies / Clients / Success
-        "/case-studies", "/case-study", "/customers", "/success-stories",
-        "/clients", "/portfolio", "/our-impact", "/results", "/testimonials",
-        "/partners", "/trusted-by",
-        # Industries / Use Cases
-        "/industries", "/sectors", "/use-cases", "/for-banks", "/for-enterprise",
-        # Insights / News / Blog
-        "/insights", "/blog", "/resources", "/news", "/press",
-        "/updates", "/announcements", "/articles",
-        # Why Us / How it Works
-        "/why-us", "/why-choose-us", "/how-it-works", "/our-approach",
-    ]
+    strategies = _generic_strategies(preferred)
+
+    executor = _get_hedge_executor()
+    pending: dict[Future, str] = {}
+    deadlines: dict[Future, Deadline] = {}  # Each strategy's own, cancellable
+    partials: list[dict] = []
+    started_at: dict[str, float] = {}  # Strategy name -> when a worker picked it up
+    next_idx = 0
+
+    def run(name, fn, deadline):
+        started_at[name] = time.monotonic()
+        with use_deadline(deadline):
+            return _run_strategy(site, name, fn, url)
+
+    def launch_next():
+        nonlocal next_idx
+        name, fn = strategies[next_idx]
+        next_idx += 1
+        log(f"  [dim]Fetching page ({name})...[/dim]")
+        # Each worker gets a copy of this context, under a deadline of its own
+        deadline = child_deadline()
+        future = executor.submit(copy_context().run, run, name, fn, deadline)
+        pending[future] = name
+        deadlines[future] = deadline
+
+    def cancel_pending():
+        for fut in pending:
+            fut.cancel()
+            deadlines[fut].cancel()
+
+    launch_next()
+    while pending:
+        deadline = current_deadline()
+        if deadline and deadline.expired():
+            cancel_pending()
+            log("  [yellow]Time budget used up[/yellow]")
+            break
+        newest_start = started_at.get(strategies[next_idx - 1][0])
+        if next_idx == len(strategies):
+            # Nothing left to hedge with: block until a result or the budget
+            delay = None
+        elif newest_start is None:
+            delay = _HEDGE_START_POLL
+        else:
+            delay = max(
+                SCRAPE_HEDGE_DELAY - (time.monotonic() - newest_start),
+                _HEDGE_START_POLL,
+            )
+        if deadline:
+            delay = deadline.remaining() if delay is None else min(delay, deadline.remaining())
+        done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+        if not done:
+            slow = (
+                newest_start is not None
+                and time.monotonic() - newest_start >= SCRAPE_HEDGE_DELAY
+            )
+            if slow and next_idx < len(strategies) and not budget_expired():
+                log("  [dim]Slow response — hedging with next strategy[/dim]")
+                launch_next()
+            continue
+
+        for fut in done:
+            name = pending.pop(fut)
+            try:
+                result = fut.result()
+            except Exception as e:
+                log(f"  [yellow]{name} failed: {e}[/yellow]")
+                continue
+            if name == "playwright":
+                result["source"] = "playwright"
+            if not _needs_enhanced(result):
+                cancel_pending()
+                return result
+            log(f"  [yellow]Incomplete data from {name}[/yellow]")
+            partials.append(result)
+
+        # A strategy finished thin or failed: start the next one now
+        if next_idx < len(strategies) and not budget_expired():
+            launch_next()
+
+    if not partials:
+        if budget_expired():
+            raise RuntimeError(f"Time budget used up before any strategy finished for {url}")
+        raise RuntimeError(f"All scraping strategies failed for {url}")
+
+    # Nothing passed: merge partials, keeping any title/company found
+    result = dict(max(partials, key=lambda r: len(r.get("description", ""))))
+    for r in partials:
+        result["title"] = result.get("title") or r.get("title", "")
+        result["company"] = result.get("company") or r.get("company", "")
+    log("  [yellow]Using partial data.[/yellow]")
+    return result
+
+
+# ─── Company Research ─────────────────────────────────────────────
 
-    pages = [base_url]  # Always include homepage
 
-    # Try to fetch homepage and find links
+# Research page vocabulary (URL path segments) by kind, most useful first —
+# companies use different names for similar content
+_RESEARCH_PAGE_KINDS = [
+    ("about", (
+        "about", "about-us", "company", "our-story", "who-we-are", "team",
+        "our-team", "leadership", "our-mission", "mission",
+    )),
+    ("products", (
+        "solutions", "products", "product", "services", "platform", "offerings",
+        "what-we-do", "our-work", "features", "capabilities", "how-it-works",
+        "our-approach", "why-us", "why-choose-us",
+    )),
+    ("customers", (
+        "case-studies", "case-study", "customers", "success-stories", "clients",
+        "portfolio", "our-impact", "results", "testimonials", "partners",
+        "trusted-by", "industries", "sectors", "use-cases", "for-banks",
+        "for-enterprise",
+    )),
+    ("blog", (
+        "insights", "blog", "resources", "news", "press", "updates",
+        "announcements", "articles",
+    )),
+]
+_RESEARCH_KIND_WEIGHT = {kind: len(_RESEARCH_PAGE_KINDS) - i for i, (kind, _) in enumerate(_RESEARCH_PAGE_KINDS)}
+_RESEARCH_SEGMENTS = {seg: kind for kind, segs in _RESEARCH_PAGE_KINDS for seg in segs}
+
+# Probed directly when neither the sitemap nor the homepage nav turn much up
+_RESEARCH_PROBE_PATHS = ["/about", "/solutions", "/case-studies", "/customers"]
+
+_SITEMAP_LOC = re.compile(r"<loc>\s*(.*?)\s*</loc>", re.I | re.S)
+_MAX_SITEMAPS = 3
+# Sitemaps can run to tens of MB; the first MB holds thousands of URLs,
+# plenty to find a few research pages (a cut-off <loc> is simply missed)
+_SITEMAP_MAX_BYTES = 1024 * 1024
+_SITEMAP_TYPES = ("application/xml", "text/xml", "text/plain")
+_RESEARCH_MAX_PAGES = 5
+
+
+def _research_page_kind(url: str) -> tuple[str, float] | None:
+    """(kind, score) for a research candidate URL, None if no vocabulary match.
+
+    Section index pages (/about, /customers) beat pages beneath them
+    (/blog/some-post), and shallow paths beat deep ones.
+    """
+    segments = [seg for seg in urlparse(url).path.lower().split("/") if seg]
+    for depth, seg in enumerate(segments):
+        kind = _RESEARCH_SEGMENTS.get(seg)
+        if kind:
+            score = _RESEARCH_KIND_WEIGHT[kind] - 0.5 * depth
+            if depth < len(segments) - 1:
+                score -= 1.5  # An article / sub-page, not the section itself
+            return kind, score
+    return None
+
+
+def _same_site(url: str, base_url: str) -> bool:
+    host = (urlparse(url).hostname or "").removeprefix("www.")
+    return host == (urlparse(base_url).hostname or "").removeprefix("www.")
+
+
+def _sitemap_urls(base_url: str) -> list[str]:
+    """Page URLs from the site's sitemaps (listed in robots.txt, else
+    /sitemap.xml), minus anything robots.txt disallows. Follows a sitemap
+    index one level, preferring page sitemaps over post / product ones."""
+    from urllib.parse import urljoin
+    from urllib.robotparser import RobotFileParser
+
+    robots = RobotFileParser()
+    lines = []
     try:
-        resp = requests.get(base_url, headers=_HEADERS, timeout=10)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # Find links in navigation
-        for nav in soup.find_all(["nav", "header"]):
-            for a in nav.find_all("a", href=True):
-                href = a["href"]
-                # Check if it matches important paths
-                for path in important_paths:
-                    if path in href.lower():
-                        full_url = urljoin(base_url, href)
-                        # Only add if same domain
-                        if urlparse(full_url).netloc == urlparse(base_url).netloc:
-                            if full_url not in pages:
-                                pages.append(full_url)
-                                if len(pages) >= 5:  # Limit to 5 pages
-                                    return pages
+        resp = http_get(urljoin(base_url, "/robots.txt"), headers=_HEADERS,
+                        timeout=5, cache=True, max_bytes=256 * 1024)
+        if resp.ok:
+            lines = resp.text.splitlines()
     except Exception:
         pass
+    robots.parse(lines)
+    sitemaps = [
+        line.split(":", 1)[1].strip() for line in lines
+        if line.lower().startswith("sitemap:")
+    ]
+    sitemaps = sitemaps or [urljoin(base_url, "/sitemap.xml")]
 
-    # Fallback: try common paths directly
-    if len(pages) < 3:
-        for path in ["/about", "/solutions", "/case-studies", "/customers"]:
-            try:
-                test_url = urljoin(base_url, path)
-                resp = requests.head(test_url, headers=_HEADERS, timeout=5, allow_redirects=True)
-                if resp.status_code == 200 and test_url not in pages:
-                    pages.append(test_url)
-                    if len(pages) >= 5:
-                        break
-            except Exception:
+    urls: list[str] = []
+    seen = set()
+    while sitemaps and len(seen) < _MAX_SITEMAPS:
+        sitemap = sitemaps.pop(0)
+        if sitemap in seen or sitemap.endswith(".gz"):
+            continue
+        seen.add(sitemap)
+        try:
+            resp = http_get(sitemap, headers=_HEADERS, timeout=5, cache=True,
+                            max_bytes=_SITEMAP_MAX_BYTES, content_types=_SITEMAP_TYPES)
+            if not resp.ok:
                 continue
+        except Exception:
+            continue
+        locs = _SITEMAP_LOC.findall(resp.text)
+        if "<sitemapindex" in resp.text[:1000].lower():
+            # Page sitemaps first: post / product sitemaps are mostly articles
+            sitemaps.extend(sorted(locs, key=lambda loc: "page" not in loc.lower()))
+        else:
+            urls.extend(unescape(loc) for loc in locs)
+
+    return [u for u in urls if _same_site(u, base_url) and robots.can_fetch("*", u)]
+
+
+def _nav_urls(base_url: str) -> list[str]:
+    """Links in the homepage's nav and header."""
+    from urllib.parse import urljoin
+
+    try:
+        resp = http_get(
+            base_url, headers=_HEADERS, timeout=10, content_types=HTML_CONTENT_TYPES
+        )
+    except Exception:
+        return []
+    soup = BeautifulSoup(resp.text, "html.parser")
+    return [
+        urljoin(base_url, a["href"])
+        for nav in soup.find_all(["nav", "header"])
+        for a in nav.find_all("a", href=True)
+    ]
+
+
+def _pick_research_pages(base_url: str, candidates: list[str]) -> list[str]:
+    """Homepage, then the best page of each kind, then the next best overall."""
+    scored = {}
+    for url in candidates:
+        url = url.split("#")[0].rstrip("/")
+        if not url or url in scored or not _same_site(url, base_url):
+            continue
+        match = _research_page_kind(url)
+        if match:
+            scored[url] = match
+
+    ranked = sorted(scored, key=lambda u: scored[u][1], reverse=True)
+    pages = [base_url]
+    for kind, _ in _RESEARCH_PAGE_KINDS:
+        best = next((u for u in ranked if scored[u][0] == kind), None)
+        if best:
+            pages.append(best)
+    pages += [u for u in ranked if u not in pages]
+    return pages[:_RESEARCH_MAX_PAGES]
+
+
+def _probe_page(url: str) -> bool:
+    try:
+        resp = http_head(url, headers=_HEADERS, timeout=5, allow_redirects=True)
+        return resp.status_code == 200
+    except Exception:
+        return False
+
+
+def _discover_important_pages(base_url: str) -> list[str]:
+    """Discover important pages on a company website for research.
+
+    Candidates come from the sitemap (via robots.txt) and the homepage nav,
+    fetched concurrently, and are scored against the page vocabulary. Common
+    paths are HEAD-probed in parallel only when that turns up little.
+    """
+    from urllib.parse import urljoin
+
+    executor = _get_research_executor()
+    nav = executor.submit(copy_context().run, _nav_urls, base_url)
+    candidates = _sitemap_urls(base_url) + nav.result()
+    pages = _pick_research_pages(base_url, candidates)
+
+    if len(pages) < 3:
+        probes = [
+            url for url in (urljoin(base_url, path) for path in _RESEARCH_PROBE_PATHS)
+            if url not in pages
+        ]
+        found = [executor.submit(copy_context().run, _probe_page, url) for url in probes]
+        pages += [url for url, fut in zip(probes, found) if fut.result()]
+
+    return pages[:_RESEARCH_MAX_PAGES]
+
+
+# Research pages all come from the company's own site: fetch at most this
+# many at once (parallel browser tabs / crawl4ai crawls)
+RESEARCH_PER_DOMAIN = int(os.getenv("RESEARCH_PER_DOMAIN", "3"))
 
-    return pages
 
+# Characters kept for the whole research text (pages are fetched until it is
+# filled) and per page, after cross-page deduplication. A page gets at most
+# 1/_RESEARCH_MIN_PAGES of the budget, so several pages contribute.
+RESEARCH_CHAR_BUDGET = int(os.getenv("RESEARCH_CHAR_BUDGET", "2000"))
+_RESEARCH_PAGE_CHARS = 2500
+_RESEARCH_MIN_PAGES = 3
 
-def _fetch_company_pages_crawl4ai(pages: list[str], log) -> list[str]:
+# Between research sections in the returned text (counted in the budget)
+_RESEARCH_SEPARATOR = "\n\n---\n\n"
+
+# Page kinds in research priority order; the homepage ranks as an overview
+_RESEARCH_PRIORITY = ["about", "home", "products", "customers", "blog"]
+
+
+def _research_section(url: str, text: str) -> str:
+    """A "## Section" block for one page (full text; _ResearchCollector cuts it)."""
+    section = url.rstrip("/").split("/")[-1] or "Homepage"
+    section = section.replace("-", " ").replace("_", " ").title()
+    return f"## {section}\nSource: {url}\n\n{text}"
+
+
+def _cut_text(text: str, limit: int) -> str:
+    """`text` cut to `limit` chars at the last line or sentence end, unless
+    that would lose more than half of it."""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    end = max(cut.rfind("\n"), cut.rfind(". ") + 1)
+    return (cut[:end] if end > limit // 2 else cut).rstrip()
+
+
+def _join_research(sections: list[str], max_chars: int) -> str:
+    """Sections joined by _RESEARCH_SEPARATOR, as many whole sections as fit
+    in `max_chars`; a first section that alone is too long is cut."""
+    text = ""
+    for section in sections:
+        joined = f"{text}{_RESEARCH_SEPARATOR}{section}" if text else section
+        if len(joined) > max_chars:
+            return text or _cut_text(section, max_chars)
+        text = joined
+    return text
+
+
+def _research_priority(url: str) -> int:
+    if not urlparse(url).path.strip("/"):
+        return _RESEARCH_PRIORITY.index("home")
+    match = _research_page_kind(url)
+    return _RESEARCH_PRIORITY.index(match[0]) if match else len(_RESEARCH_PRIORITY)
+
+
+class _ResearchCollector:
+    """Research pages, deduplicated and cut to a character budget.
+
+    Pages are added in priority order. Lines already seen on an earlier page
+    (nav, hero and footer text repeated site-wide) are dropped, each page is
+    cut to page_chars (a share of the budget, at most _RESEARCH_PAGE_CHARS)
+    at a line or sentence end, and pages with nothing new are skipped.
+    `chars` counts section headers and separators too, so the sections
+    joined by _RESEARCH_SEPARATOR fit in `max_chars`. add() returns True
+    once the budget is filled, so fetchers can stop early.
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.page_chars = min(_RESEARCH_PAGE_CHARS, -(-max_chars // _RESEARCH_MIN_PAGES))
+        self.sections: list[str] = []
+        self.chars = 0
+        self.removed = 0  # Characters dropped as repeats
+        self._seen: set[str] = set()
+
+    @property
+    def full(self) -> bool:
+        return self.chars >= self.max_chars
+
+    def add(self, section: str) -> bool:
+        if self.full:
+            return True
+        head, sep, body = section.partition("\n\n")  # "## Section\nSource: ..." header
+        if not sep:
+            head, body = "", section
+        kept = []
+        for line in body.splitlines():
+            key = " ".join(line.split()).lower().removeprefix("- ")
+            if not key:
+                kept.append("")
+            elif key in self._seen:
+                self.removed += len(line) + 1
+            else:
+                self._seen.add(key)
+                kept.append(line)
+        body = re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+        if body:
+            overhead = len(_RESEARCH_SEPARATOR) if self.sections else 0
+            overhead += len(head) + 2 if head else 0
+            room = min(self.page_chars, self.max_chars - self.chars - overhead)
+            # A sliver of a page is not worth its header
+            body = _cut_text(body, room) if room >= 100 else ""
+            if body:
+                self.sections.append(f"{head}\n\n{body}" if head else body)
+                self.chars += overhead + len(body)
+            else:
+                self.chars = self.max_chars  # No room left for another page
+        return self.full
+
+
+def _fetch_company_pages_crawl4ai(
+    pages: list[str], log, collector: _ResearchCollector
+) -> list[str]:
     """Fetch pages using crawl4ai — handles JS-heavy SPAs better than plain Playwright.
 
-    Falls back to per-page async crawl. Free, no API key required.
+    Pages are crawled concurrently (RESEARCH_PER_DOMAIN at a time) and
+    collected in order; the rest are cancelled once the collector is full.
+    Free, no API key required.
     """
     import asyncio
 
     async def _crawl(urls):
         from crawl4ai import AsyncWebCrawler
-        results = []
+        slots = asyncio.Semaphore(RESEARCH_PER_DOMAIN)
+
         async with AsyncWebCrawler(headless=True) as crawler:
-            for url in urls:
-                try:
-                    result = await crawler.arun(url=url)
-                    text = result.markdown or result.cleaned_html or ""
-                    if len(text) > 200:
-                        section = url.rstrip("/").split("/")[-1] or "Homepage"
-                        section = section.replace("-", " ").replace("_", " ").title()
-                        results.append(f"## {section}\nSource: {url}\n\n{text[:2500]}")
-                        log(f"  [dim]✓ crawl4ai: {section}[/dim]")
-                except Exception:
-                    continue
-        return results
+            async def crawl_one(url):
+                async with slots:
+                    if budget_expired():
+                        return None
+                    try:
+                        result = await asyncio.wait_for(
+                            crawler.arun(url=url), timeout=budget_timeout(60)
+                        )
+                    except Exception:
+                        return None
+                text = result.markdown or result.cleaned_html or ""
+                if len(text) <= 200:
+                    return None
+                section = _research_section(url, text)
+                log(f"  [dim]✓ crawl4ai: {section.splitlines()[0][3:]}[/dim]")
+                return section
+
+            tasks = [asyncio.ensure_future(crawl_one(url)) for url in urls]
+            try:
+                for task in tasks:
+                    section = await task
+                    if section and collector.add(section):
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
 
     try:
-        return asyncio.run(_crawl(pages[:5]))
+        asyncio.run(_crawl(pages[:5]))
     except Exception as e:
         log(f"  [yellow]crawl4ai failed: {e}[/yellow]")
-        return []
+    return collector.sections
 
 
-def _fetch_company_pages_playwright(pages: list[str], log) -> list[str]:
-    """Fetch multiple company pages using a single Playwright browser instance.
+_research_executor: ThreadPoolExecutor | None = None
+_research_executor_lock = threading.Lock()
+
+
+def _get_research_executor() -> ThreadPoolExecutor:
+    # Long-lived so each worker's connection to the shared browser is reused
+    # across research runs. Locked: background refreshes call this too.
+    global _research_executor
+    if _research_executor is None:
+        with _research_executor_lock:
+            if _research_executor is None:
+                _research_executor = ThreadPoolExecutor(
+                    max_workers=RESEARCH_PER_DOMAIN, thread_name_prefix="research"
+                )
+    return _research_executor
 
-    Returns list of text strings, one per successfully fetched page.
-    """
-    from playwright.sync_api import sync_playwright
 
-    results = []
+def _fetch_company_page_playwright(url: str, log) -> str | None:
+    """One research page in a warm-browser tab, as a "## Section" block."""
+    if budget_expired():
+        return None
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            for url in pages[:5]:
-                try:
-                    pg = browser.new_page()
-                    pg.goto(url, wait_until="domcontentloaded", timeout=20000)
-                    # Extra wait for JS-heavy SPAs to render page-specific content
-                    pg.wait_for_timeout(2500)
-                    html = pg.content()
-                    pg.close()
-
-                    soup = BeautifulSoup(html, "html.parser")
-                    # Strip boilerplate
-                    for tag in soup(["script", "style", "nav", "header", "footer",
-                                     "aside", "form", "noscript"]):
-                        tag.decompose()
-
-                    text = soup.get_text(separator=" ", strip=True)
-                    # Collapse whitespace
-                    text = " ".join(text.split())
-
-                    if len(text) > 200:
-                        section = url.rstrip("/").split("/")[-1] or "Homepage"
-                        section = section.replace("-", " ").replace("_", " ").title()
-                        results.append(f"## {section}\nSource: {url}\n\n{text[:2500]}")
-                        log(f"  [dim]✓ Playwright: {section}[/dim]")
-                except Exception:
-                    continue
-            browser.close()
+        with browser_page() as pg:
+            pg.goto(url, wait_until="domcontentloaded", timeout=_budget_ms(20000))
+            # JS-heavy SPAs render page-specific content after DOMContentLoaded:
+            # give the network up to 2.5s to settle
+            try:
+                pg.wait_for_load_state("networkidle", timeout=_budget_ms(2500))
+            except Exception:
+                pass  # Still busy (analytics, polling) — use what has rendered
+            html = pg.content()
     except Exception as e:
-        log(f"  [yellow]Playwright company research failed: {e}[/yellow]")
+        log(f"  [dim]Playwright skipped {url}: {e}[/dim]")
+        return None
+
+    soup = BeautifulSoup(html, "html.parser")
+    # Strip boilerplate
+    for tag in soup(["script", "style", "nav", "header", "footer",
+                     "aside", "form", "noscript"]):
+        tag.decompose()
+
+    text = _html_lines(str(soup))
+
+    if len(text) <= 200:
+        return None
+    section = _research_section(url, text)
+    log(f"  [dim]✓ Playwright: {section.splitlines()[0][3:]}[/dim]")
+    return section
+
+
+def _fetch_company_pages_playwright(
+    pages: list[str], log, collector: _ResearchCollector
+) -> list[str]:
+    """Fetch company pages in parallel tabs (RESEARCH_PER_DOMAIN at a time)
+    of the process's one shared browser (modules/browser_pool.py); each
+    worker thread drives its tab through its own connection to it.
+
+    Pages are collected in the given order; once the collector is full,
+    pages not yet started are cancelled. Returns the collected sections.
+    """
+    executor = _get_research_executor()
+    # Each worker gets a copy of this context so it sees the deadline
+    futures = [
+        executor.submit(copy_context().run, _fetch_company_page_playwright, url, log)
+        for url in pages[:5]
+    ]
+    for i, fut in enumerate(futures):
+        section = fut.result()
+        if section and collector.add(section):
+            skipped = sum(f.cancel() for f in futures[i + 1:])
+            if skipped:
+                log(f"  [dim]Research budget filled — skipped {skipped} pages[/dim]")
+            break
+    if budget_expired() and not collector.full:
+        log("  [yellow]Time budget used up — stopped page fetches[/yellow]")
+    return collector.sections
+
+
+# Per-domain research cache: served as-is while younger than the TTL, served
+# and refreshed in the background up to the max age, refetched after that
+RESEARCH_CACHE_TTL = float(os.getenv("RESEARCH_CACHE_TTL_DAYS", "7")) * 86400
+RESEARCH_CACHE_MAX_AGE = float(os.getenv("RESEARCH_CACHE_MAX_AGE_DAYS", "60")) * 86400
 
-    return results
+# Background refreshes get their own short budget, whatever the run's is
+_RESEARCH_REFRESH_BUDGET = 60
+
+_SECTION_SOURCE = re.compile(r"^Source: (\S+)", re.M)
+_revalidating: set[str] = set()
+_revalidating_lock = threading.Lock()
+_refresh_threads: list[threading.Thread] = []
 
 
 def research_company(
-    company_name: str, company_url: str | None = None, console: Console | None = None
+    company_name: str,
+    company_url: str | None = None,
+    console: Console | None = None,
+    budget: float | None = None,
+    max_chars: int | None = None,
 ) -> str:
     """Research a company comprehensively for cover letter writing.
 
@@ -886,95 +2748,244 @@ def research_company(
     Returns company information as text for LLM context.
 
     Scraping order (cheapest first):
-      1. Playwright — free, renders JS, one browser instance for all pages
+      1. Playwright — free, renders JS, parallel tabs in the shared browser
       2. Firecrawl  — paid, better markdown; only if Playwright yields thin content
       3. Plain HTML — last resort single-page fetch
       4. Web search — when no company URL is provided
+
+    Site research is cached per domain: a second role at the same company,
+    or a re-run, returns instantly. Entries older than RESEARCH_CACHE_TTL
+    are still served, and refreshed in a background thread (see
+    wait_for_research_refreshes); the next run logs which pages changed.
+
+    `budget` caps the research in seconds (default: none); when it runs out,
+    whatever pages were fetched so far are returned. `max_chars` (default
+    RESEARCH_CHAR_BUDGET) caps the returned text: site pages are fetched in
+    priority order only until it is filled with distinct content.
     """
+    max_chars = max_chars or RESEARCH_CHAR_BUDGET
     log = console.print if console else print
     log(f"  [dim]Researching {company_name}...[/dim]")
 
     results_text = []
+    domain = _research_domain(company_url) if company_url else ""
+    if domain:
+        cached = cache_get("research", domain, ttl=RESEARCH_CACHE_MAX_AGE)
+        # Pages collected under a smaller character budget are not enough
+        if cached and cached.get("pages") and cached.get("max_chars", 0) >= max_chars:
+            age = time.time() - cached["stored_at"]
+            log(f"  [dim]Using cached research for {domain} ({age / 3600:.0f}h old)[/dim]")
+            if "changed" in cached:
+                changed = ", ".join(cached["changed"]) or "no page changed"
+                log(f"  [dim]Last refresh of {domain}: {changed}[/dim]")
+            if age > RESEARCH_CACHE_TTL:
+                _revalidate_research(company_url, domain, cached, log, max_chars)
+            results_text = [page["text"] for page in cached["pages"]]
+
+    with deadline_scope(budget):
+        if company_url and not results_text:
+            results_text = _research_site(company_url, log, max_chars)
+            # Budget cut-offs are partial: not worth keeping for a week
+            if results_text and not budget_expired():
+                _store_research(domain, results_text, max_chars)
+
+        # Strategy 4: Search (no URL provided, or all fetches failed)
+        if not results_text and budget_expired():
+            log("  [yellow]Time budget used up — skipping web search[/yellow]")
+        elif not results_text:
+            results_text = _research_search(company_name, log)
+
+    if not results_text:
+        log("  [yellow]No research results found.[/yellow]")
+        return ""
+
+    return _join_research(results_text, max_chars)
+
 
-    if company_url:
-        pages_to_fetch = _discover_important_pages(company_url)
-        log(f"  [dim]Found {len(pages_to_fetch)} pages to research[/dim]")
+def _research_domain(company_url: str) -> str:
+    return (urlparse(company_url).hostname or "").removeprefix("www.")
 
-        # Strategy 1: Playwright (free, JS-rendering)
-        results_text = _fetch_company_pages_playwright(pages_to_fetch, log)
+
+def _section_page(section: str) -> str:
+    """The page a research section came from, as host + path (no www.)."""
+    match = _SECTION_SOURCE.search(section)
+    if not match:
+        return ""
+    parsed = urlparse(match.group(1))
+    return (parsed.hostname or "").removeprefix("www.") + parsed.path.rstrip("/")
+
+
+def _store_research(
+    domain: str, sections: list[str], max_chars: int, previous: dict | None = None
+):
+    """Cache a domain's research pages. When refreshing `previous`, the
+    entry also lists the pages that are new or whose text changed."""
+    now = time.time()
+    old_digests = {p["url"]: p.get("digest") for p in (previous or {}).get("pages", [])}
+    pages = []
+    for section in sections:
+        url = _section_page(section)
+        body = section.split("\n\n", 1)[-1]  # Without the heading / Source lines
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+        pages.append({"url": url, "text": section, "digest": digest, "fetched_at": now})
+    entry = {"pages": pages, "max_chars": max_chars}
+    if previous is not None:
+        entry["changed"] = [
+            p["url"] for p in pages if old_digests.get(p["url"]) != p["digest"]
+        ]
+    cache_put("research", domain, entry)
+
+
+def _revalidate_research(
+    company_url: str, domain: str, cached: dict, log, max_chars: int
+):
+    """Refetch a stale domain in a background daemon thread for the next run.
+
+    The refresh has its own _RESEARCH_REFRESH_BUDGET and never logs (the run
+    may have finished); callers that exit right after the run give it time
+    to land with wait_for_research_refreshes().
+    """
+    with _revalidating_lock:
+        if domain in _revalidating:
+            return
+        _revalidating.add(domain)
+
+    def refresh():
+        try:
+            with deadline_scope(_RESEARCH_REFRESH_BUDGET):
+                sections = _research_site(
+                    company_url, lambda *args, **kwargs: None, max_chars
+                )
+                if not sections or budget_expired():
+                    return  # Unreachable or cut short: keep serving the old pages
+            _store_research(domain, sections, max_chars, previous=cached)
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(domain)
+
+    log(f"  [dim]Refreshing {domain} research in the background (used on the next run)[/dim]")
+    thread = threading.Thread(
+        target=refresh, name=f"research-refresh-{domain}", daemon=True
+    )
+    _refresh_threads.append(thread)
+    thread.start()
+
+
+def wait_for_research_refreshes(timeout: float = _RESEARCH_REFRESH_BUDGET, log=None):
+    """Wait up to `timeout` seconds for background research refreshes.
+
+    Call before the process exits (the refresh threads are daemons and
+    would be killed mid-fetch); refreshes still running after that are
+    dropped, and the stale entry is refreshed again next time.
+    """
+    deadline = time.monotonic() + timeout
+    running = [t for t in _refresh_threads if t.is_alive()]
+    if running and log:
+        log(f"  [dim]Finishing {len(running)} background research refresh(es)...[/dim]")
+    for thread in running:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    _refresh_threads[:] = [t for t in _refresh_threads if t.is_alive()]
+
+
+def _research_site(company_url: str, log, max_chars: int) -> list[str]:
+    """Research sections from the company's own site, cheapest strategy first.
+
+    Pages are fetched in priority order (about, homepage, products,
+    customers, blog) until `max_chars` of distinct text is collected.
+    """
+    pages_to_fetch = sorted(_discover_important_pages(company_url), key=_research_priority)
+    log(f"  [dim]Found {len(pages_to_fetch)} pages to research[/dim]")
+
+    # Strategy 1: Playwright (free, JS-rendering)
+    collector = _ResearchCollector(max_chars)
+    results_text = _fetch_company_pages_playwright(pages_to_fetch, log, collector)
+    if results_text:
+        total_chars = sum(len(r) for r in results_text)
+        log(f"  [green]✓ Playwright research: {len(results_text)} pages, {total_chars} chars[/green]")
+
+    # Detect SPA trap: all pages labelled "Homepage" means Playwright got the same
+    # shell page for every URL (React/Next.js SPA that requires JS routing).
+    all_homepage = results_text and all("## Homepage" in r for r in results_text)
+    playwright_thin = not results_text or all_homepage
+
+    # Strategy 1b: crawl4ai if Playwright was thin (SPA or no content)
+    if playwright_thin and not budget_expired():
+        log(f"  [dim]Playwright thin/SPA — trying crawl4ai[/dim]")
+        collector = _ResearchCollector(max_chars)
+        results_text = _fetch_company_pages_crawl4ai(pages_to_fetch, log, collector)
         if results_text:
             total_chars = sum(len(r) for r in results_text)
-            log(f"  [green]✓ Playwright research: {len(results_text)} pages, {total_chars} chars[/green]")
-
-        # Detect SPA trap: all pages labelled "Homepage" means Playwright got the same
-        # shell page for every URL (React/Next.js SPA that requires JS routing).
-        all_homepage = results_text and all("## Homepage" in r for r in results_text)
-        playwright_thin = not results_text or all_homepage
+            log(f"  [green]✓ crawl4ai research: {len(results_text)} pages, {total_chars} chars[/green]")
 
-        # Strategy 1b: crawl4ai if Playwright was thin (SPA or no content)
-        if playwright_thin:
-            log(f"  [dim]Playwright thin/SPA — trying crawl4ai[/dim]")
-            results_text = _fetch_company_pages_crawl4ai(pages_to_fetch, log)
+    # Strategy 2: Firecrawl if still thin
+    if not results_text and FIRECRAWL_API_KEY and not budget_expired():
+        log(f"  [dim]Playwright thin — trying Firecrawl: {company_url}[/dim]")
+        try:
+            from firecrawl import FirecrawlApp
+            app = FirecrawlApp(api_key=FIRECRAWL_API_KEY)
+            collector = _ResearchCollector(max_chars)
+            for page_url in pages_to_fetch[:5]:
+                if budget_expired() or collector.full:
+                    break
+                try:
+                    doc = app.scrape(
+                        page_url, formats=["markdown"], wait_for=2000,
+                        timeout=_budget_ms(30000),
+                    )
+                    markdown = doc.markdown or ""
+                    if markdown and len(markdown) > 100:
+                        section = _research_section(page_url, markdown)
+                        collector.add(section)
+                        log(f"  [dim]✓ Firecrawl: {section.splitlines()[0][3:]}[/dim]")
+                except Exception:
+                    continue
+            results_text = collector.sections
             if results_text:
-                total_chars = sum(len(r) for r in results_text)
-                log(f"  [green]✓ crawl4ai research: {len(results_text)} pages, {total_chars} chars[/green]")
+                log(f"  [green]✓ Firecrawl research: {len(results_text)} pages[/green]")
+        except Exception as e:
+            log(f"  [yellow]Firecrawl failed: {e}[/yellow]")
 
-        # Strategy 2: Firecrawl if still thin
-        if not results_text and FIRECRAWL_API_KEY:
-            log(f"  [dim]Playwright thin — trying Firecrawl: {company_url}[/dim]")
-            try:
-                from firecrawl import FirecrawlApp
-                app = FirecrawlApp(api_key=FIRECRAWL_API_KEY)
-                for page_url in pages_to_fetch[:5]:
-                    try:
-                        doc = app.scrape(page_url, formats=["markdown"], wait_for=2000)
-                        markdown = doc.markdown or ""
-                        if markdown and len(markdown) > 100:
-                            section = page_url.rstrip("/").split("/")[-1] or "Homepage"
-                            section = section.replace("-", " ").replace("_", " ").title()
-                            results_text.append(f"## {section}\nSource: {page_url}\n\n{markdown[:2500]}")
-                            log(f"  [dim]✓ Firecrawl: {section}[/dim]")
-                    except Exception:
-                        continue
-                if results_text:
-                    log(f"  [green]✓ Firecrawl research: {len(results_text)} pages[/green]")
-            except Exception as e:
-                log(f"  [yellow]Firecrawl failed: {e}[/yellow]")
+    if results_text:
+        log(
+            f"  [dim]Research text: {collector.chars}/{max_chars} chars over "
+            f"{len(results_text)} pages ({collector.removed} chars repeated "
+            "across pages removed)[/dim]"
+        )
 
-        # Strategy 3: Plain HTML single-page fallback
-        if not results_text:
-            try:
-                direct_info = _fetch_company_page(company_url)
-                if direct_info:
-                    results_text.append(f"Source: {company_url}\n\n{direct_info}")
-                    log("  [dim]✓ Plain HTML fetch[/dim]")
-            except Exception as e:
-                log(f"  [yellow]Could not fetch company URL: {e}[/yellow]")
+    # Strategy 3: Plain HTML single-page fallback
+    if not results_text and not budget_expired():
+        try:
+            direct_info = _fetch_company_page(company_url)
+            if direct_info:
+                results_text.append(f"Source: {company_url}\n\n{direct_info}")
+                log("  [dim]✓ Plain HTML fetch[/dim]")
+        except Exception as e:
+            log(f"  [yellow]Could not fetch company URL: {e}[/yellow]")
 
-    # Strategy 4: Search (no URL provided, or all fetches failed)
-    if not results_text:
-        queries = [
-            f"{company_name} recent news product launches 2025 2026",
-            f"{company_name} product features latest",
-        ]
+    return results_text
 
-        # Try Google first
-        search_results = _search_google(queries)
+
+def _research_search(company_name: str, log) -> list[str]:
+    """Web search snippets, when there is no company site to read."""
+    results_text = []
+    queries = [
+        f"{company_name} recent news product launches 2025 2026",
+        f"{company_name} product features latest",
+    ]
+
+    # Try Google first
+    search_results = _search_google(queries)
+    if search_results:
+        log("  [dim]Found research via Google[/dim]")
+        results_text.append(search_results)
+    else:
+        # Fallback to DuckDuckGo
+        log("  [dim]Google unavailable, using DuckDuckGo...[/dim]")
+        search_results = _search_duckduckgo(queries)
         if search_results:
-            log("  [dim]Found research via Google[/dim]")
             results_text.append(search_results)
-        else:
-            # Fallback to DuckDuckGo
-            log("  [dim]Google unavailable, using DuckDuckGo...[/dim]")
-            search_results = _search_duckduckgo(queries)
-            if search_results:
-                results_text.append(search_results)
-
-    if not results_text:
-        log("  [yellow]No research results found.[/yellow]")
-        return ""
 
-    return "\n\n---\n\n".join(results_text)
+    return results_text
 
 
 def _fetch_company_page(url: str) -> str:
@@ -986,7 +2997,9 @@ def _fetch_company_page(url: str) -> str:
         try:
             from firecrawl import FirecrawlApp
             app = FirecrawlApp(api_key=FIRECRAWL_API_KEY)
-            doc = app.scrape(url, formats=["markdown"], wait_for=2000)
+            doc = app.scrape(
+                url, formats=["markdown"], wait_for=2000, timeout=_budget_ms(30000)
+            )
             markdown = doc.markdown or ""
             if markdown and len(markdown) > 100:
                 # Truncate to reasonable size for company research
@@ -994,7 +3007,7 @@ def _fetch_company_page(url: str) -> str:
         except Exception:
             pass  # Fall through to regular fetch
 
-    resp = requests.get(url, headers=_HEADERS, timeout=15)
+    resp = http_get(url, headers=_HEADERS, content_types=HTML_CONTENT_TYPES)
     resp.raise_for_status()
     soup = BeautifulSoup(resp.text, "html.parser")
 
@@ -1036,6 +3049,9 @@ def _fetch_company_page(url: str) -> str:
     return "\n\n".join(info_parts[:8]) if info_parts else ""
 
 
+_SNIPPET_MAX_BYTES = 256 * 1024
+
+
 def _search_google(queries: list[str]) -> str:
     """Search via googlesearch-python (no API key needed)."""
     try:
@@ -1045,6 +3061,8 @@ def _search_google(queries: list[str]) -> str:
 
     results_text = []
     for query in queries:
+        if budget_expired():
+            break
         try:
             for url in gsearch(query, num_results=3, lang="en"):
                 results_text.append(f"URL: {url}")
@@ -1053,10 +3071,14 @@ def _search_google(queries: list[str]) -> str:
 
     # Google only returns URLs, so fetch snippets from each
     for url in results_text[:4]:
+        if budget_expired():
+            break
         url_str = url.replace("URL: ", "")
         try:
-            resp = requests.get(
-                url_str, headers=_HEADERS, timeout=10
+            # Only the meta description / first paragraphs are used
+            resp = http_get(
+                url_str, headers=_HEADERS, timeout=10,
+                max_bytes=_SNIPPET_MAX_BYTES, content_types=HTML_CONTENT_TYPES,
             )
             soup = BeautifulSoup(resp.text, "html.parser")
             # Get meta description or first paragraphs
@@ -1089,6 +3111,8 @@ def _search_duckduckgo(queries: list[str]) -> str:
     ddgs = DDGS()
 
     for query in queries:
+        if budget_expired():
+            break
         try:
             results = list(ddgs.text(query, max_results=3))
             for r in results:
@@ -19,6 +19,8 @@ from rich.prompt import Confirm
 
 from modules.llm_client import LLMClient, create_writing_client
 from modules.job_scraper import scrape_job_posting, research_company
+from modules.http_client import format_transport_stats
+from modules.jd_sections import STEP_CHAR_LIMITS, STEP_LABELS, STEP_SECTIONS, build_view, estimate_tokens, split_sections
 from modules.parsers import extract_latex, fix_markdown_lists, parse_ats_report, parse_qa_answers, parse_resume_edits, apply_resume_edits
 
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -103,7 +105,9 @@ def _safe_filename(name: str) -> str:
 def step_scrape_job(ctx: dict, llm: LLMClient, console: Console) -> dict:
     console.print("\n[bold]Step 1/9:[/bold] Scraping job posting...")
 
-    job = scrape_job_posting(ctx["job_url"], console=console)
+    job = scrape_job_posting(
+        ctx["job_url"], console=console, budget=ctx.get("scrape_budget")
+    )
     ctx["job"] = job
 
     # Create run output directory
@@ -124,16 +128,68 @@ def step_scrape_job(ctx: dict, llm: LLMClient, console: Console) -> dict:
         f"  Job: [bold]{job.get('title', '?')}[/bold] "
         f"at [bold]{job.get('company', '?')}[/bold]"
     )
+    desc_chars = len(job.get("description", ""))
     console.print(
         f"  Source: {job.get('source', '?')} | "
-        f"Description: {len(job.get('description', ''))} chars"
+        f"Description: {desc_chars} chars"
     )
+    page_chars = job.get("page_chars")
+    if page_chars and page_chars > desc_chars:
+        console.print(
+            f"  [dim]Main content: {desc_chars:,} of {page_chars:,} page chars "
+            f"({100 - desc_chars * 100 // page_chars}% boilerplate dropped)[/dim]"
+        )
     if all_qs:
         console.print(f"  Application questions found: {len(all_qs)}")
+    console.print(f"  [dim]{format_transport_stats()}[/dim]")
+
+    _prepare_jd_views(ctx, console)
 
     return ctx
 
 
+def _prepare_jd_views(ctx: dict, console: Console):
+    """Section the JD and store a trimmed view per LLM step in ctx["jd_views"].
+
+    The full description stays in ctx["job"] and is saved to the run dir,
+    along with the sections and per-step token savings.
+    """
+    full = ctx["job"].get("description", "")
+    if not full:
+        return
+    sections = split_sections(full)
+    ctx["jd_views"] = {step: build_view(sections, step, full) for step in STEP_SECTIONS}
+
+    savings = {}
+    for step in STEP_SECTIONS:
+        limit = STEP_CHAR_LIMITS[step]
+        before = estimate_tokens(full[:limit])
+        after = estimate_tokens(ctx["jd_views"][step][:limit])
+        savings[STEP_LABELS[step]] = {"tokens_before": before, "tokens_after": after}
+    ctx["jd_savings"] = savings
+
+    run_dir = Path(ctx["run_dir"])
+    (run_dir / f"job_description_{ctx['company_safe']}.md").write_text(full)
+    (run_dir / f"jd_sections_{ctx['company_safe']}.json").write_text(
+        json.dumps({"sections": sections, "token_savings": savings}, indent=2)
+    )
+
+    kinds = ", ".join(dict.fromkeys(s["kind"] for s in sections))
+    saved = ", ".join(
+        f"{label} −{v['tokens_before'] - v['tokens_after']}"
+        for label, v in savings.items()
+    )
+    console.print(f"  [dim]JD sections: {kinds}[/dim]")
+    console.print(f"  [dim]JD tokens saved per step: {saved}[/dim]")
+
+
+def _jd(ctx: dict, step: str) -> str:
+    """The JD text for an LLM step: its section view, else the full text,
+    cut to the step's STEP_CHAR_LIMITS."""
+    text = ctx.get("jd_views", {}).get(step) or ctx["job"]["description"]
+    return text[:STEP_CHAR_LIMITS[step]]
+
+
 # ─── Step 2: Read Master Resume ──────────────────────────────────
 
 
@@ -274,7 +330,7 @@ def step_tailor_resume(ctx: dict, llm: LLMClient, console: Console) -> dict:
         f"## Job Posting\n\n"
         f"**Title:** {ctx['job']['title']}\n"
         f"**Company:** {ctx['job']['company']}\n\n"
-        f"{ctx['job']['description']}\n\n"
+        f"{_jd(ctx, 'analysis')}\n\n"
         f"---\n\n"
         f"## Candidate Resume (structure summary — step 3b has the full text)\n\n"
         f"{_slim_resume_for_analysis(ctx['master_resume'])}\n\n"
@@ -354,7 +410,7 @@ def step_tailor_resume(ctx: dict, llm: LLMClient, console: Console) -> dict:
             f"**URL:** {ctx['job']['url']}\n"
             f"**Title:** {ctx['job']['title']}\n"
             f"**Company:** {ctx['job']['company']}\n\n"
-            f"{ctx['job']['description']}\n\n"
+            f"{_jd(ctx, 'tailor')}\n\n"
             f"---\n\n"
             f"Generate the complete tailored LaTeX resume following the tailoring brief above.\n\n"
             f"CRITICAL: The output MUST include every single section of the master resume — "
@@ -517,7 +573,7 @@ def step_ats_check(ctx: dict, llm: LLMClient, console: Console) -> dict:
         f"## Job Posting\n\n"
         f"**Title:** {ctx['job']['title']}\n"
         f"**Company:** {ctx['job']['company']}\n\n"
-        f"{ctx['job']['description']}\n\n"
+        f"{_jd(ctx, 'ats')}\n\n"
         f"---\n\n"
         f"## Tailored Resume (.tex)\n\n"
         f"{ctx['tailored_latex']}\n\n"
@@ -679,9 +735,16 @@ def step_generate_qa(ctx: dict, llm: LLMClient, console: Console) -> dict:
     company_url = ctx.get("company_url")
     company_name = ctx["job"].get("company", "")
     company_research = research_company(
-        company_name, company_url=company_url, console=console
+        company_name, company_url=company_url, console=console,
+        budget=ctx.get("scrape_budget"),
     )
     ctx["company_research"] = company_research
+    if company_research:
+        console.print(
+            f"  [dim]Company research: {len(company_research)} chars "
+            f"(~{estimate_tokens(company_research)} tokens)[/dim]"
+        )
+    console.print(f"  [dim]{format_transport_stats()}[/dim]")
 
     # Load Q&A templates (cached on ctx; graceful empty fallback)
     if "qa_templates" not in ctx:
@@ -754,9 +817,9 @@ def step_generate_qa(ctx: dict, llm: LLMClient, console: Console) -> dict:
         f"## Job Posting\n\n"
         f"**Title:** {ctx['job']['title']}\n"
         f"**Company:** {ctx['job']['company']}\n\n"
-        f"{ctx['job']['description'][:3000]}\n\n"
+        f"{_jd(ctx, 'qa')}\n\n"
         f"---\n\n"
-        f"## Company Research\n\n{company_research[:2000]}\n\n"
+        f"## Company Research\n\n{company_research}\n\n"
         f"---\n\n"
         f"## Questions to Answer\n\n{questions_text}\n\n"
         f"---\n\n"
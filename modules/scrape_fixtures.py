@@ -0,0 +1,239 @@
+"""Record / replay fixtures for offline scraper runs and benchmarks.
+
+SCRAPE_FIXTURES=record captures every response the shared HTTP session and
+the warm browser receive into SCRAPE_FIXTURE_DIR (one JSON file per request).
+SCRAPE_FIXTURES=replay serves them back without network access:
+
+  - HTTP requests are sent to a local stand-in server, which answers with
+    the recorded status, headers and body, so pooling, redirects and
+    streaming run through the real transport
+  - Playwright requests are fulfilled in the browser from the same store
+
+A request with no fixture fails like an unreachable host. Fixture runs
+bypass the .scrape_cache/ disk cache so every request is recorded/replayed.
+Firecrawl and crawl4ai use their own clients and are not captured.
+"""
+
+import os
+import json
+import base64
+import atexit
+import hashlib
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+SCRAPE_FIXTURES = os.getenv("SCRAPE_FIXTURES", "")  # "", "record" or "replay"
+SCRAPE_FIXTURE_DIR = Path(
+    os.getenv(
+        "SCRAPE_FIXTURE_DIR",
+        Path(__file__).parent.parent / ".scrape_fixtures",
+    )
+)
+
+# Browser responses worth keeping (images, fonts and media are aborted on replay)
+_BROWSER_TYPES = ("document", "xhr", "fetch", "script", "stylesheet")
+
+# Headers that describe the original wire encoding, not the stored body
+_DROP_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection")
+
+_KEY_HEADER = "X-Fixture-Key"
+_MISS_HEADER = "X-Fixture-Miss"
+
+_mode = SCRAPE_FIXTURES
+_directory = SCRAPE_FIXTURE_DIR
+_server: ThreadingHTTPServer | None = None
+_server_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"recorded": 0, "served": 0, "missed": 0, "bytes": 0}
+
+
+def _count(key: str, n: int = 1):
+    with _stats_lock:
+        _stats[key] += n
+
+
+def active() -> bool:
+    """True while recording or replaying."""
+    return _mode in ("record", "replay")
+
+
+def recording() -> bool:
+    return _mode == "record"
+
+
+def replaying() -> bool:
+    return _mode == "replay"
+
+
+@contextmanager
+def fixture_mode(mode: str, directory: str | Path | None = None):
+    """Record or replay (mode "record" / "replay") inside the block."""
+    global _mode, _directory
+    previous = _mode, _directory
+    _mode = mode
+    _directory = Path(directory) if directory else SCRAPE_FIXTURE_DIR
+    try:
+        yield _directory
+    finally:
+        _mode, _directory = previous
+
+
+def fixture_stats() -> dict:
+    """Counters since process start: recorded, served, missed, bytes served."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+# ─── Store ───────────────────────────────────────────────────────
+
+
+def fixture_key(method: str, url: str, body: bytes | str | None = None) -> str:
+    """Stable id of a request: method + full URL + body digest."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body_digest = hashlib.sha256(body or b"").hexdigest()[:16]
+    return hashlib.sha256(f"{method} {url} {body_digest}".encode("utf-8")).hexdigest()[:32]
+
+
+def _fixture_path(kind: str, key: str) -> Path:
+    return _directory / kind / f"{key}.json"
+
+
+def _store(kind: str, key: str, method: str, url: str, status: int, headers, body: bytes):
+    path = _fixture_path(kind, key)
+    entry = {
+        "method": method,
+        "url": url,
+        "status": status,
+        "headers": {
+            k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS
+        },
+        "body": base64.b64encode(body).decode("ascii"),
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry))
+        tmp.replace(path)
+        _count("recorded")
+    except OSError:
+        pass
+
+
+def _load(kind: str, key: str) -> dict | None:
+    try:
+        entry = json.loads(_fixture_path(kind, key).read_text())
+    except (OSError, ValueError):
+        _count("missed")
+        return None
+    entry["body"] = base64.b64decode(entry["body"])
+    _count("served")
+    _count("bytes", len(entry["body"]))
+    return entry
+
+
+# ─── HTTP (shared session) ───────────────────────────────────────
+
+
+def record_response(request: requests.PreparedRequest, resp: requests.Response):
+    """Store a response received by the shared session (reads the body)."""
+    key = fixture_key(request.method, request.url, request.body)
+    _store("http", key, request.method, request.url, resp.status_code,
+           resp.headers, resp.content)
+
+
+def to_replay(request: requests.PreparedRequest) -> str:
+    """Point `request` at the stand-in server; returns its original URL."""
+    original = request.url
+    request.headers[_KEY_HEADER] = fixture_key(request.method, original, request.body)
+    request.url = f"{_replay_server_url()}/"
+    return original
+
+
+def replay_missed(resp: requests.Response) -> bool:
+    return resp.headers.get(_MISS_HEADER) == "1"
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like a real server
+
+    def _serve(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        entry = _load("http", self.headers.get(_KEY_HEADER, ""))
+        if entry is None:
+            self.send_response(404)
+            self.send_header(_MISS_HEADER, "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(entry["status"])
+        for name, value in entry["headers"].items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(entry["body"])))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(entry["body"])
+
+    do_GET = do_POST = do_HEAD = do_PUT = do_OPTIONS = _serve
+
+    def log_message(self, format, *args):
+        pass  # quiet
+
+
+def _replay_server_url() -> str:
+    """Start the stand-in server on first use; returns its base URL."""
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                server = ThreadingHTTPServer(("127.0.0.1", 0), _ReplayHandler)
+                server.daemon_threads = True
+                threading.Thread(
+                    target=server.serve_forever, name="fixture-server", daemon=True
+                ).start()
+                atexit.register(server.shutdown)
+                _server = server
+    host, port = _server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+# ─── Browser (Playwright) ────────────────────────────────────────
+
+
+def attach_to_context(context):
+    """Record or replay a Playwright browser context's traffic."""
+    if recording():
+        context.on("response", _record_browser_response)
+    elif replaying():
+        context.route("**/*", _replay_browser_route)
+
+
+def _record_browser_response(response):
+    request = response.request
+    if request.resource_type not in _BROWSER_TYPES:
+        return
+    try:
+        body = response.body()
+    except Exception:
+        return  # Redirects and aborted requests have no body
+    key = fixture_key(request.method, response.url, request.post_data_buffer)
+    _store("browser", key, request.method, response.url, response.status,
+           response.headers, body)
+
+
+def _replay_browser_route(route):
+    request = route.request
+    if request.resource_type not in _BROWSER_TYPES:
+        route.abort()
+        return
+    entry = _load("browser", fixture_key(request.method, request.url, request.post_data_buffer))
+    if entry is None:
+        route.abort("internetdisconnected")
+        return
+    route.fulfill(status=entry["status"], headers=entry["headers"], body=entry["body"])
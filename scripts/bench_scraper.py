@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""Scraper benchmarks. Prints a table per benchmark to stdout.
+
+Usage:
+    python scripts/bench_scraper.py ashby <company> <job_uuid>
+    python scripts/bench_scraper.py html <dir_of_saved_pages>
+    python scripts/bench_scraper.py fragments <saved_api_payload.json> ...
+    python scripts/bench_scraper.py record <urls.txt> [--fixtures DIR]
+    python scripts/bench_scraper.py adapters [--fixtures DIR]
+
+`record` scrapes each URL live, storing every HTTP / browser response and
+the extracted result under the fixture directory; `adapters` replays them
+offline and compares against the recorded results.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from rich.console import Console
+from rich.table import Table
+
+from modules import job_scraper, scrape_fixtures
+from modules.http_client import http_post, transport_stats
+
+console = Console()
+
+# The pre-change board query, verbatim: every job at the company with
+# descriptionHtml, grouped by team, plus the board's organization name
+_ASHBY_FULL_BOARD_QUERY = """
+    query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {
+        jobBoard: jobBoardWithTeams(
+            organizationHostedJobsPageName: $organizationHostedJobsPageName
+        ) {
+            teams {
+                ... on JobBoardTeam {
+                    jobs {
+                        id
+                        title
+                        descriptionHtml
+                        locationName
+                        employmentType
+                    }
+                }
+            }
+            jobBoardSetting {
+                organizationName
+            }
+        }
+    }
+"""
+
+
+def _timed_post(payload: dict, runs: int) -> tuple[float, int]:
+    """Median latency (ms) and payload size (bytes) of an uncached POST."""
+    timings = []
+    size = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        resp = http_post(
+            job_scraper._ASHBY_API, json=payload, headers=job_scraper._HEADERS
+        )
+        resp.raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+        size = len(resp.content)
+    timings.sort()
+    return timings[len(timings) // 2], size
+
+
+def bench_ashby(company: str, job_id: str, runs: int):
+    """Single-posting query vs the full board download it replaced."""
+    variants = {
+        "full board (descriptionHtml)": {
+            "operationName": "ApiJobBoardWithTeams",
+            "variables": {"organizationHostedJobsPageName": company},
+            "query": _ASHBY_FULL_BOARD_QUERY,
+        },
+        "board index (id, title)": {
+            "operationName": "ApiJobBoardWithTeams",
+            "variables": {"organizationHostedJobsPageName": company},
+            "query": job_scraper._ASHBY_BOARD_QUERY,
+        },
+        "single posting": {
+            "operationName": "ApiJobPosting",
+            "variables": {
+                "organizationHostedJobsPageName": company,
+                "jobPostingId": job_id,
+            },
+            "query": job_scraper._ASHBY_POSTING_QUERY,
+        },
+    }
+
+    table = Table(title=f"Ashby: {company} ({runs} runs, median)")
+    table.add_column("Query")
+    table.add_column("Payload", justify="right")
+    table.add_column("Latency", justify="right")
+    for name, payload in variants.items():
+        ms, size = _timed_post(payload, runs)
+        table.add_row(name, f"{size / 1024:.1f} KB", f"{ms:.0f} ms")
+    console.print(table)
+
+
+def _legacy_extract_from_html(html: str, url: str) -> dict:
+    """The pre-change extractor: html.parser tree, one select_one per selector."""
+    soup = BeautifulSoup(html, "html.parser")
+    title = company = description = ""
+
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string)
+            if isinstance(data, list):
+                for item in data:
+                    if item.get("@type") == "JobPosting":
+                        data = item
+                        break
+            if data.get("@type") == "JobPosting":
+                title = title or data.get("title", "")
+                company = company or data.get("hiringOrganization", {}).get("name", "")
+                description = description or data.get("description", "")
+                if "<" in description:
+                    description = BeautifulSoup(description, "html.parser").get_text(
+                        separator="\n", strip=True
+                    )
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            continue
+
+    if not title:
+        og_title = soup.select_one("meta[property='og:title']")
+        if og_title:
+            title = og_title.get("content", "")
+    if not company:
+        og_site = soup.select_one("meta[property='og:site_name']")
+        if og_site:
+            company = og_site.get("content", "")
+
+    if not title:
+        for selector in job_scraper._TITLE_SELECTORS:
+            el = soup.select_one(selector)
+            if el and el.get_text(strip=True):
+                title = el.get_text(strip=True)
+                break
+    if not company:
+        for selector in job_scraper._COMPANY_SELECTORS:
+            el = soup.select_one(selector)
+            if el and el.get_text(strip=True):
+                company = el.get_text(strip=True)
+                break
+    if not company:
+        company = job_scraper._company_from_url(url)
+
+    for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
+        tag.decompose()
+    if not description:
+        for selector in job_scraper._DESCRIPTION_SELECTORS:
+            el = soup.select_one(selector)
+            if el:
+                description = el.get_text(separator="\n", strip=True)
+                if len(description) > 200:
+                    break
+        if len(description) < 200:
+            description = soup.get_text(separator="\n", strip=True)
+
+    return {"title": title, "company": company, "description": description}
+
+
+def _median_ms(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def bench_html(corpus: str, runs: int):
+    """Single-pass extractor (per parser backend) vs the legacy extractor
+    over a directory of saved career pages (*.html)."""
+    pages = sorted(Path(corpus).glob("*.html"))
+    if not pages:
+        console.print(f"[red]No .html files in {corpus}[/red]")
+        sys.exit(1)
+
+    parsers = ["html.parser"]
+    if job_scraper._default_html_parser() == "lxml":
+        parsers.append("lxml")
+
+    table = Table(title=f"HTML extraction: {len(pages)} pages ({runs} runs, median)")
+    table.add_column("Page")
+    table.add_column("Size", justify="right")
+    table.add_column("Legacy", justify="right")
+    for parser in parsers:
+        table.add_column(parser, justify="right")
+    table.add_column("Same result")
+
+    totals = [0.0] * (len(parsers) + 1)
+    default_parser = job_scraper.HTML_PARSER
+    try:
+        for page in pages:
+            html = page.read_text(errors="replace")
+            url = f"https://{page.stem}/"
+            legacy = _legacy_extract_from_html(html, url)
+            row = [_median_ms(lambda: _legacy_extract_from_html(html, url), runs)]
+            same = True
+            for parser in parsers:
+                job_scraper.HTML_PARSER = parser
+                row.append(_median_ms(lambda: job_scraper._extract_from_html(html, url), runs))
+                result = job_scraper._extract_from_html(html, url)
+                same = same and all(
+                    result[k] == legacy[k] for k in ("title", "company", "description")
+                )
+            totals = [t + ms for t, ms in zip(totals, row)]
+            table.add_row(
+                page.name, f"{len(html) / 1024:.0f} KB",
+                *(f"{ms:.1f} ms" for ms in row),
+                "yes" if same else "[yellow]differs[/yellow]",
+            )
+    finally:
+        job_scraper.HTML_PARSER = default_parser
+
+    table.add_row("[bold]total[/bold]", "", *(f"[bold]{ms:.0f} ms[/bold]" for ms in totals), "")
+    console.print(table)
+
+
+def _html_fragments(value) -> list[str]:
+    """Every HTML-looking string in a saved ATS API payload."""
+    if isinstance(value, dict):
+        return [f for v in value.values() for f in _html_fragments(v)]
+    if isinstance(value, list):
+        return [f for v in value for f in _html_fragments(v)]
+    if isinstance(value, str) and ("<" in value or "&lt;" in value):
+        return [job_scraper.unescape(value) if "&lt;" in value else value]
+    return []
+
+
+def bench_fragments(paths: list[str], runs: int):
+    """Cached fragment converter vs a BeautifulSoup per fragment, over saved
+    Greenhouse / Lever / Ashby / Workable API responses."""
+    fragments = []
+    for path in paths:
+        fragments.extend(_html_fragments(json.loads(Path(path).read_text())))
+    if not fragments:
+        console.print("[red]No HTML fragments found in the given payloads[/red]")
+        sys.exit(1)
+
+    def soup_per_fragment():
+        for fragment in fragments:
+            BeautifulSoup(fragment, "html.parser").get_text(separator="\n", strip=True)
+
+    def converter_cold():
+        job_scraper._fragment_cache.clear()
+        for fragment in fragments:
+            job_scraper._fragment_to_text(fragment)
+
+    def converter_warm():
+        for fragment in fragments:
+            job_scraper._fragment_to_text(fragment)
+
+    size = sum(len(f) for f in fragments)
+    table = Table(
+        title=f"HTML fragments: {len(fragments)} fragments, {size / 1024:.0f} KB "
+        f"({runs} runs, median)"
+    )
+    table.add_column("Converter")
+    table.add_column("Total", justify="right")
+    table.add_column("Per fragment", justify="right")
+    for name, fn in [
+        ("BeautifulSoup per fragment", soup_per_fragment),
+        ("_fragment_to_text (cold)", converter_cold),
+        ("_fragment_to_text (cached)", converter_warm),
+    ]:
+        ms = _median_ms(fn, runs)
+        table.add_row(name, f"{ms:.1f} ms", f"{ms * 1000 / len(fragments):.0f} µs")
+    console.print(table)
+
+
+def _fixture_run():
+    """Scrape settings for fixture runs: one strategy at a time (hedging
+    races make the recorded path timing-dependent) and no Firecrawl
+    (its client is not captured)."""
+    job_scraper.SCRAPE_HEDGED = False
+    job_scraper.FIRECRAWL_API_KEY = ""
+
+
+def record_fixtures(urls_file: str, directory: Path):
+    """Scrape URLs live, recording responses and results for `adapters`."""
+    urls = [
+        line.strip() for line in Path(urls_file).read_text().splitlines()
+        if line.strip() and not line.startswith("#")
+    ]
+    _fixture_run()
+    manifest = []
+    with scrape_fixtures.fixture_mode("record", directory):
+        for url in dict.fromkeys(urls):
+            console.print(f"[bold]{url}[/bold]")
+            try:
+                result = job_scraper.scrape_job_posting(url, console=console)
+            except Exception as e:
+                console.print(f"  [red]{e}[/red]")
+                continue
+            manifest.append({"url": url, "result": result})
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    stats = scrape_fixtures.fixture_stats()
+    console.print(
+        f"Recorded {len(manifest)}/{len(urls)} postings, "
+        f"{stats['recorded']} responses → {directory}"
+    )
+
+
+def _line_overlap(a: str, b: str) -> float:
+    """Jaccard similarity of the non-empty lines of two descriptions."""
+    lines_a = {line.strip() for line in a.splitlines() if line.strip()}
+    lines_b = {line.strip() for line in b.splitlines() if line.strip()}
+    if not lines_a and not lines_b:
+        return 1.0
+    return len(lines_a & lines_b) / len(lines_a | lines_b)
+
+
+def _quality(result: dict, expected: dict) -> float:
+    """0–1: title and company match the recording, description line overlap."""
+    return (
+        (result.get("title") == expected.get("title"))
+        + (result.get("company") == expected.get("company"))
+        + _line_overlap(result.get("description", ""), expected.get("description", ""))
+    ) / 3
+
+
+def _clear_memory_caches():
+    """Drop in-process caches so every run fetches and parses from scratch."""
+    job_scraper._board_snapshots.clear()
+    job_scraper._fragment_cache.clear()
+
+
+def bench_adapters(directory: Path, runs: int):
+    """Replay recorded postings offline: per-adapter latency, bytes parsed
+    per run and extraction quality against the recorded results."""
+    manifest_path = directory / "manifest.json"
+    if not manifest_path.exists():
+        console.print(f"[red]No manifest.json in {directory} — run `record` first[/red]")
+        sys.exit(1)
+    manifest = json.loads(manifest_path.read_text())
+    _fixture_run()
+    quiet = Console(quiet=True)
+
+    rows: dict[str, dict] = {}
+    with scrape_fixtures.fixture_mode("replay", directory):
+        for item in manifest:
+            expected = item["result"]
+            timings = []
+            size = 0
+            for _ in range(runs):
+                _clear_memory_caches()
+                fixture_bytes = scrape_fixtures.fixture_stats()["bytes"]
+                start = time.perf_counter()
+                try:
+                    result = job_scraper.scrape_job_posting(item["url"], console=quiet)
+                except Exception as e:
+                    result = {"source": expected.get("source", "?"), "error": str(e)}
+                timings.append((time.perf_counter() - start) * 1000)
+                size += scrape_fixtures.fixture_stats()["bytes"] - fixture_bytes
+            timings.sort()
+            row = rows.setdefault(expected.get("source", "?"), {
+                "postings": 0, "ms": [], "bytes": 0, "complete": 0, "quality": 0.0,
+                "changed": 0,
+            })
+            row["postings"] += 1
+            row["ms"].append(timings[len(timings) // 2])
+            row["bytes"] += size / runs
+            row["complete"] += not job_scraper._needs_enhanced(result)
+            quality = _quality(result, expected)
+            row["quality"] += quality
+            if quality < 1 or result.get("source") != expected.get("source"):
+                row["changed"] += 1
+                console.print(
+                    f"  [yellow]changed:[/yellow] {item['url']} "
+                    f"({result.get('error') or result.get('source')}, quality {quality:.2f})"
+                )
+
+    stats = scrape_fixtures.fixture_stats()
+    table = Table(
+        title=f"Adapters (replayed): {len(manifest)} postings ({runs} runs, median)"
+    )
+    table.add_column("Adapter")
+    table.add_column("Postings", justify="right")
+    table.add_column("Latency", justify="right")
+    table.add_column("Parsed / run", justify="right")
+    table.add_column("Complete", justify="right")
+    table.add_column("Quality", justify="right")
+    table.add_column("Changed", justify="right")
+    for source, row in sorted(rows.items()):
+        ms = sorted(row["ms"])
+        table.add_row(
+            source,
+            str(row["postings"]),
+            f"{ms[len(ms) // 2]:.1f} ms",
+            f"{row['bytes'] / row['postings'] / 1024:.1f} KB",
+            f"{row['complete']}/{row['postings']}",
+            f"{row['quality'] / row['postings']:.2f}",
+            str(row["changed"]) if row["changed"] else "-",
+        )
+    console.print(table)
+    console.print(
+        f"[dim]{stats['served']} responses replayed, {stats['missed']} missing, "
+        f"{transport_stats()['requests']} HTTP requests[/dim]"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JobQuest scraper benchmarks")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per case")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ashby = sub.add_parser("ashby", help="Ashby single-posting vs board query")
+    ashby.add_argument("company", help="Ashby hosted jobs page name")
+    ashby.add_argument("job_id", help="Job posting UUID")
+
+    html = sub.add_parser("html", help="Single-pass HTML extractor vs legacy")
+    html.add_argument("corpus", help="Directory of saved career pages (*.html)")
+
+    fragments = sub.add_parser("fragments", help="Fragment converter vs BeautifulSoup")
+    fragments.add_argument("payloads", nargs="+", help="Saved ATS API JSON responses")
+
+    record = sub.add_parser("record", help="Record live scrapes as offline fixtures")
+    record.add_argument("urls", help="File with one posting URL per line")
+    record.add_argument(
+        "--fixtures", type=Path, default=scrape_fixtures.SCRAPE_FIXTURE_DIR,
+        help="Fixture directory (default: SCRAPE_FIXTURE_DIR)",
+    )
+
+    adapters = sub.add_parser("adapters", help="Per-adapter benchmark over recorded fixtures")
+    adapters.add_argument(
+        "--fixtures", type=Path, default=scrape_fixtures.SCRAPE_FIXTURE_DIR,
+        help="Fixture directory (default: SCRAPE_FIXTURE_DIR)",
+    )
+
+    args = parser.parse_args()
+    if args.command == "ashby":
+        bench_ashby(args.company, args.job_id, args.runs)
+    elif args.command == "html":
+        bench_html(args.corpus, args.runs)
+    elif args.command == "fragments":
+        bench_fragments(args.payloads, args.runs)
+    elif args.command == "record":
+        record_fixtures(args.urls, args.fixtures)
+    elif args.command == "adapters":
+        bench_adapters(args.fixtures, args.runs)
+
+
+if __name__ == "__main__":
+    main()
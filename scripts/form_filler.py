@@ -15,7 +15,7 @@ import re
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from playwright.sync_api import sync_playwright
+from modules.browser_pool import interactive_page
 
 
 # Field classification patterns
@@ -284,11 +284,9 @@ def run_form_filler(url, resume_pdf, data):
     """Main form filling logic."""
     all_reports = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
-
+    # Headed: the user reviews and submits in this window, so it gets its
+    # own visible browser, outside the scrape page limit and fixtures
+    with interactive_page() as page:
         print(f"Navigating to {url}...", file=sys.stderr)
         page.goto(url, wait_until="domcontentloaded")
         time.sleep(3)
@@ -376,7 +374,6 @@ def run_form_filler(url, resume_pdf, data):
                 page.wait_for_event("close", timeout=0)
             except Exception:
                 pass
-        browser.close()
 
 
 def main():
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Batch-scrape job postings to JSONL.
+
+Reads URLs (one per line, # comments allowed) from a file or stdin and writes
+one JSON object per posting as each scrape finishes:
+    {"url", "title", "company", "description", "source", "questions", "error"}
+
+Usage:
+    python scripts/scrape_jobs.py urls.txt -o postings.jsonl
+    cat urls.txt | python scripts/scrape_jobs.py - --per-host 1
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+
+from modules.job_scraper import SCRAPE_CONCURRENCY, SCRAPE_PER_HOST, scrape_many
+from modules.http_client import format_transport_stats
+
+# Progress goes to stderr so stdout stays valid JSONL
+console = Console(stderr=True)
+
+
+def _read_urls(source: str) -> list[str]:
+    stream = sys.stdin if source == "-" else open(source)
+    with stream:
+        lines = [line.strip() for line in stream]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+async def _harvest(urls: list[str], out, args) -> int:
+    # Per-scrape strategy logs only with --verbose; they interleave otherwise
+    scrape_console = console if args.verbose else Console(stderr=True, quiet=True)
+    failed = 0
+    done = 0
+    async for url, result, error in scrape_many(
+        urls, scrape_console, concurrency=args.concurrency, per_host=args.per_host
+    ):
+        done += 1
+        if error or not result.get("description"):
+            failed += 1
+        out.write(json.dumps({**result, "url": url, "error": error}) + "\n")
+        out.flush()
+        status = f"[red]{error}[/red]" if error else f"[dim]{result.get('source')}[/dim]"
+        console.print(f"  [{done}/{len(urls)}] {url} {status}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-scrape job postings to JSONL")
+    parser.add_argument("urls", help="File with one URL per line, or - for stdin")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument(
+        "--concurrency", type=int, default=SCRAPE_CONCURRENCY,
+        help=f"Max scrapes in flight (default: {SCRAPE_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--per-host", type=int, default=SCRAPE_PER_HOST,
+        help=f"Max concurrent scrapes per host (default: {SCRAPE_PER_HOST})",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show per-scrape logs")
+    args = parser.parse_args()
+
+    urls = list(dict.fromkeys(_read_urls(args.urls)))  # dedupe, keep order
+    if not urls:
+        console.print("[red]No URLs given[/red]")
+        sys.exit(1)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        failed = asyncio.run(_harvest(urls, out, args))
+    finally:
+        if args.output:
+            out.close()
+
+    console.print(
+        f"[bold]{len(urls) - failed} scraped, {failed} failed[/bold]  "
+        f"[dim]{format_transport_stats()}[/dim]"
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,10 @@ def check_imports():
         ("modules.pipeline", "modules.pipeline"),
         ("modules.llm_client", "modules.llm_client"),
         ("modules.job_scraper", "modules.job_scraper"),
+        ("modules.http_client", "modules.http_client"),
+        ("modules.browser_pool", "modules.browser_pool"),
+        ("modules.scrape_fixtures", "modules.scrape_fixtures"),
+        ("modules.jd_sections", "modules.jd_sections"),
         ("modules.parsers", "modules.parsers"),
     ]
     
@@ -54,6 +58,760 @@ def check_files():
             all_exist = False
     return all_exist
 
+def check_jd_sections():
+    """Check that JD sectioning keeps list items that start with a keyword."""
+    from modules.jd_sections import build_view, split_sections
+
+    # Unprefixed list, as HTML get_text() produces it
+    jd = "\n".join([
+        "Acme builds payments software.",
+        "Your responsibilities",
+        "Own the payouts service",
+        "Data protection compliance for payouts",
+        "Run incident reviews",
+        "Requirements",
+        "Familiarity with GDPR and data protection requirements",
+        "Inclusion-minded leadership",
+        "Compensation benchmarking",
+        "About 30% travel required",
+        "* Benefits of microservices knowledge",
+        "- SQL",
+        "Benefits",
+        "Free lunch",
+    ])
+    view = build_view(split_sections(jd), "tailor", jd)
+    kept = jd.splitlines()[2:12]
+    all_kept = True
+    for line in kept:
+        if line not in view:
+            print(f"✗ dropped from the tailor view: {line!r}")
+            all_kept = False
+    if "Free lunch" in view:
+        print("✗ benefits section kept in the tailor view")
+        all_kept = False
+
+    # Long privacy bullets are duties; EEO prose is boilerplate
+    duty = (
+        "- Drive our data protection roadmap across product teams, partnering "
+        "with legal and security to ship compliant features"
+    )
+    eeo = (
+        "Acme is an equal opportunity employer and considers all applicants "
+        "without regard to race, religion, gender or disability."
+    )
+    jd = "\n".join(["Responsibilities", duty, "Own the privacy review process", eeo])
+    view = build_view(split_sections(jd), "tailor", jd)
+    if duty not in view:
+        print("✗ data protection bullet dropped as legal boilerplate")
+        all_kept = False
+    if eeo in view:
+        print("✗ EEO paragraph kept in the tailor view")
+        all_kept = False
+    if all_kept:
+        print("✓ jd_sections keeps keyword-led list items")
+    return all_kept
+
+def check_jd_headings():
+    """Check that common plain-line headings keep their requirements."""
+    from modules.jd_sections import build_view, split_sections
+
+    ok = True
+    for heading in (
+        "Minimum Qualifications", "Preferred Qualifications",
+        "What we're looking for", "What We Need From You",
+        "Who we're looking for", "Your Background",
+        "Day to day", "How you will contribute",
+    ):
+        jd = "\n".join([
+            "About Acme", "Acme builds ledgers.", "Our values", "We ship carefully.",
+            heading, "- 5+ years of backend engineering",
+            "Responsibilities", "- Build the ledger",
+            "Meet the team", "Twelve engineers in Berlin.",
+        ])
+        view = build_view(split_sections(jd), "tailor", jd)
+        if "- 5+ years of backend engineering" not in view:
+            print(f"✗ lines under {heading!r} dropped from the tailor view")
+            ok = False
+        if "We ship carefully." in view or "Twelve engineers" in view:
+            print(f"✗ about sections kept around {heading!r}")
+            ok = False
+
+    # An unknown heading inside "about" may start real content: keep it all
+    jd = "\n".join([
+        "About Acme", "Acme builds ledgers.",
+        "Engineering Principles", "- Go and Postgres in production",
+        "Responsibilities", "- Build the ledger",
+    ])
+    if build_view(split_sections(jd), "tailor", jd) != jd:
+        print("✗ text after an unknown heading in 'about' was dropped")
+        ok = False
+    if ok:
+        print("✓ jd_sections recognises plain-line headings")
+    return ok
+
+# Saved career-page shapes: OG meta, descendant and substring selectors,
+# a description inside a noise tag, and the whole-page fallback
+_HTML_SAMPLES = {
+    "og-meta": (
+        "<html><head><meta property='og:title' content='Backend Engineer'>"
+        "<meta property='og:site_name' content='Acme'></head><body>"
+        "<nav>Jobs Blog</nav><div class='job-description'>"
+        + "<p>Build the payouts ledger.</p>" * 12
+        + "</div><footer>© Acme</footer></body></html>"
+    ),
+    "descendant-title": (
+        "<html><body><header><h1>Acme careers</h1></header>"
+        "<div class='job-title'><span>Remote · </span><h1>Data Engineer</h1></div>"
+        "<span class='hiring-company'>Globex</span>"
+        "<section class='JobDescription-module__body'>"
+        + "Own the warehouse models and the pipelines feeding them<br>" * 8
+        + "</section><p>Apply by Friday</p></body></html>"
+    ),
+    "noise-description": (
+        "<html><body><aside><div class='job-description'>Similar jobs</div></aside>"
+        "<h1 data-qa='job-title'>Site Reliability Engineer</h1>"
+        "<div data-testid='company-name'>Initech</div>"
+        "<article>" + "<p>Keep the fleet healthy and the pagers quiet.</p>" * 10
+        + "</article></body></html>"
+    ),
+    "page-fallback": (
+        "<html><body><h1 class='posting-headline'>Designer</h1>"
+        "<div class='job-details'>Short teaser.</div>"
+        + "<p>Work with product on the onboarding flow.</p>" * 8
+        + "</body></html>"
+    ),
+}
+
+
+def check_html_engines():
+    """Check that the single-pass HTML extractor matches the select_one one."""
+    from modules import job_scraper
+    from scripts.bench_scraper import _legacy_extract_from_html
+
+    parsers = ["html.parser"]
+    if job_scraper._default_html_parser() == "lxml":
+        parsers.append("lxml")
+    default_parser = job_scraper.HTML_PARSER
+    ok = True
+    try:
+        for name, html in _HTML_SAMPLES.items():
+            url = f"https://careers.example.com/{name}"
+            legacy = _legacy_extract_from_html(html, url)
+            for parser in parsers:
+                job_scraper.HTML_PARSER = parser
+                result = job_scraper._extract_from_html(html, url)
+                for key in ("title", "company", "description"):
+                    if result[key] != legacy[key]:
+                        print(f"✗ {name} ({parser}): {key} {result[key][:60]!r} "
+                              f"!= select_one {legacy[key][:60]!r}")
+                        ok = False
+    finally:
+        job_scraper.HTML_PARSER = default_parser
+    if ok:
+        print(f"✓ single-pass extractor matches select_one on {len(_HTML_SAMPLES)} samples")
+    return ok
+
+def check_hedge_wait():
+    """Check that a hedged scrape blocks, not spins, once every strategy runs."""
+    import time
+    from modules import job_scraper
+
+    def slow(url):
+        time.sleep(1)
+        return {"title": "Engineer", "company": "Acme", "description": "x" * 300}
+
+    calls = []
+    real_wait = job_scraper.wait
+
+    def counting_wait(*args, **kwargs):
+        calls.append(kwargs.get("timeout"))
+        return real_wait(*args, **kwargs)
+
+    saved = (
+        job_scraper._generic_strategies,
+        job_scraper._record_strategy,
+        job_scraper.SCRAPE_HEDGE_DELAY,
+    )
+    job_scraper._generic_strategies = lambda preferred=None: [("slow", slow)]
+    job_scraper._record_strategy = lambda *args: None
+    job_scraper.SCRAPE_HEDGE_DELAY = 0.05
+    job_scraper.wait = counting_wait
+    try:
+        job_scraper._scrape_hedged("https://example.com/job", lambda msg: None, "example.com")
+    finally:
+        (
+            job_scraper._generic_strategies,
+            job_scraper._record_strategy,
+            job_scraper.SCRAPE_HEDGE_DELAY,
+        ) = saved
+        job_scraper.wait = real_wait
+    if len(calls) > 20:
+        print(f"✗ hedged scrape polled {len(calls)} times while waiting")
+        return False
+    print("✓ hedged scrape waits on its last strategy")
+    return True
+
+def check_hedge_cancel():
+    """Check that a hedged scrape stops its losers and leaves them unrecorded."""
+    import threading
+    import time
+    from modules import job_scraper
+    from modules.http_client import budget_timeout
+
+    stopped = threading.Event()
+
+    def slow(url):
+        try:
+            for _ in range(100):  # 5s unless cancelled
+                budget_timeout(1)
+                time.sleep(0.05)
+        finally:
+            stopped.set()
+        return {}
+
+    def fast(url):
+        time.sleep(0.2)
+        return {"title": "Engineer", "company": "Acme", "description": "x" * 300}
+
+    recorded = []
+    saved = (
+        job_scraper._generic_strategies,
+        job_scraper._record_strategy,
+        job_scraper.SCRAPE_HEDGE_DELAY,
+    )
+    job_scraper._generic_strategies = lambda preferred=None: [("slow", slow), ("fast", fast)]
+    job_scraper._record_strategy = lambda site, strategy, *args: recorded.append(strategy)
+    job_scraper.SCRAPE_HEDGE_DELAY = 0.05
+    try:
+        job_scraper._scrape_hedged("https://example.com/job", lambda msg: None, "example.com")
+        stopped.wait(1)
+    finally:
+        (
+            job_scraper._generic_strategies,
+            job_scraper._record_strategy,
+            job_scraper.SCRAPE_HEDGE_DELAY,
+        ) = saved
+    ok = True
+    if not stopped.is_set():
+        print("✗ losing hedged strategy kept running after the winner")
+        ok = False
+    if recorded != ["fast"]:
+        print(f"✗ strategy memory recorded {recorded}, expected only the winner")
+        ok = False
+    if ok:
+        print("✓ hedged scrape cancels the losing strategy")
+    return ok
+
+def check_dead_posting():
+    """Check that 404s for closed postings don't demote a board's ATS API."""
+    import tempfile
+    import requests
+    from modules import http_client, job_scraper
+
+    def status_error(status):
+        def fetch(board, posting_id):
+            resp = requests.Response()
+            resp.status_code = status
+            raise requests.HTTPError(f"{status}", response=resp)
+        return fetch
+
+    saved_dir = http_client.CACHE_DIR
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        http_client.CACHE_DIR = Path(tmp)
+        try:
+            for status, should_fail in ((404, False), (403, True)):
+                site = f"boards.greenhouse.io/acme-{status}"
+                for _ in range(2):
+                    try:
+                        job_scraper._run_strategy(
+                            site, "greenhouse_api", status_error(status),
+                            "acme", "123", posting_lookup=True,
+                        )
+                    except requests.HTTPError:
+                        pass
+                if job_scraper._strategy_failing(site, "greenhouse_api") != should_fail:
+                    print(f"✗ two {status}s for one posting: failing != {should_fail}")
+                    ok = False
+        finally:
+            http_client.CACHE_DIR = saved_dir
+    if ok:
+        print("✓ dead postings don't demote the board API")
+    return ok
+
+def check_research_budget():
+    """Check that the default research budget is shared by several pages
+    and the returned text ends on a section boundary."""
+    from modules.job_scraper import (
+        RESEARCH_CHAR_BUDGET, _RESEARCH_SEPARATOR, _ResearchCollector, _join_research,
+    )
+
+    collector = _ResearchCollector(RESEARCH_CHAR_BUDGET)
+    for page in ("about", "home", "products", "customers"):
+        body = "\n".join(f"{page} fact {i}: " + "x" * 60 for i in range(100))
+        if collector.add(f"## {page}\nSource: https://acme.com/{page}\n\n{body}"):
+            break
+    if len(collector.sections) < 2:
+        print(f"✗ one page filled the {RESEARCH_CHAR_BUDGET}-char research budget")
+        return False
+    joined = _RESEARCH_SEPARATOR.join(collector.sections)
+    if _join_research(collector.sections, RESEARCH_CHAR_BUDGET) != joined:
+        print("✗ collected research (headers included) overruns the budget")
+        return False
+    if not all(s.endswith("x" * 60) for s in collector.sections):
+        print("✗ a research page was cut mid-line")
+        return False
+    print(f"✓ {len(collector.sections)} pages share the research budget")
+    return True
+
+def check_board_snapshots_off():
+    """Check that BOARD_SNAPSHOTS=0 keeps every ATS adapter off board downloads."""
+    from modules import job_scraper
+
+    loaded = []
+
+    def no_network(*args, **kwargs):
+        raise OSError("offline")
+
+    saved = {
+        name: getattr(job_scraper, name)
+        for name in (
+            "BOARD_SNAPSHOTS", "_board_index", "http_get", "http_post",
+            "_scrape_generic", "_scrape_personio_html",
+        )
+    }
+    job_scraper.BOARD_SNAPSHOTS = False
+    job_scraper._board_index = lambda ats, board, loader: loaded.append(ats) or {}
+    job_scraper.http_get = job_scraper.http_post = no_network
+    job_scraper._scrape_generic = lambda url: job_scraper._empty_result(url)
+    job_scraper._scrape_personio_html = lambda company, job_id: {}
+    try:
+        for _, _, pattern, adapter in job_scraper._ATS_ADAPTERS:
+            try:
+                adapter("acme", "some-posting")
+            except Exception:
+                pass
+    finally:
+        for name, value in saved.items():
+            setattr(job_scraper, name, value)
+    if loaded:
+        print(f"✗ board snapshots loaded while disabled: {sorted(set(loaded))}")
+        return False
+    print("✓ BOARD_SNAPSHOTS=0 skips every board download")
+    return True
+
+def check_ashby_fallback():
+    """Check that a GraphQL error on the organization field retries the
+    posting alone, and that a posting without errors takes one request."""
+    from modules import job_scraper
+
+    job_id = "0d5c8a64-6a0e-4f3b-9a57-2c1f1d2b3e4f"
+    posting = {"id": job_id, "title": "Platform Engineer", "descriptionHtml": "<p>Ship it</p>"}
+
+    class Response:
+        def __init__(self, body):
+            self.body = body
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.body
+
+    queries = []
+
+    def fake_post(url, json=None, **kwargs):
+        queries.append(json["query"])
+        if json["query"] == job_scraper._ASHBY_POSTING_QUERY and fail_organization:
+            return Response({"data": None, "errors": [{"message": "Cannot query field"}]})
+        data = {"jobPosting": posting}
+        if json["query"] == job_scraper._ASHBY_POSTING_QUERY:
+            data["organization"] = {"name": "Acme Inc"}
+        return Response({"data": data})
+
+    saved = job_scraper.http_post, job_scraper._scrape_generic
+    job_scraper.http_post = fake_post
+    job_scraper._scrape_generic = job_scraper._empty_result
+    ok = True
+    try:
+        fail_organization = True
+        result = job_scraper._scrape_ashby("acme", job_id)
+        if queries != [job_scraper._ASHBY_POSTING_QUERY, job_scraper._ASHBY_POSTING_ONLY_QUERY]:
+            print(f"✗ GraphQL error sent {len(queries)} queries, expected the posting-only retry")
+            ok = False
+        if result.get("source") != "ashby_api" or result.get("title") != "Platform Engineer":
+            print(f"✗ posting-only retry not used: {result.get('source')!r}")
+            ok = False
+
+        fail_organization = False
+        queries.clear()
+        result = job_scraper._scrape_ashby("acme", job_id)
+        if len(queries) != 1 or result.get("company") != "Acme Inc":
+            print(f"✗ clean response took {len(queries)} queries, company {result.get('company')!r}")
+            ok = False
+    finally:
+        job_scraper.http_post, job_scraper._scrape_generic = saved
+    if ok:
+        print("✓ Ashby retries the posting alone after a GraphQL error")
+    return ok
+
+def check_personio_feed():
+    """Check that the Personio feed refuses DTDs and is read from the posting's
+    own domain, as is the HTML fallback when snapshots are off."""
+    from modules import job_scraper
+
+    feed = (
+        b"<workzag-jobs><position><id>42</id><name>Data Engineer</name>"
+        b"<subcompany>Acme GmbH</subcompany><jobDescriptions><jobDescription>"
+        b"<name>Tasks</name><value>&lt;p&gt;Build pipelines&lt;/p&gt;</value>"
+        b"</jobDescription></jobDescriptions></position></workzag-jobs>"
+    )
+    bomb = (
+        b'<?xml version="1.0"?><!DOCTYPE lolz [<!ENTITY lol "lol">'
+        b'<!ENTITY lol2 "&lol;&lol;&lol;&lol;">]><workzag-jobs><position>'
+        b"<id>42</id><name>&lol2;</name></position></workzag-jobs>"
+    )
+
+    class Response:
+        status_code = 200
+        text = "<html><h1>Data Engineer</h1></html>"
+
+        def __init__(self, content):
+            self.content = content
+
+        def raise_for_status(self):
+            pass
+
+    fetched = []
+    body = feed
+
+    def fake_get(url, **kwargs):
+        fetched.append(url)
+        return Response(body)
+
+    saved = job_scraper.http_get, job_scraper._board_index, job_scraper.BOARD_SNAPSHOTS
+    job_scraper.http_get = fake_get
+    job_scraper._board_index = lambda ats, board, loader: loader(board)
+    ok = True
+    try:
+        job_scraper.BOARD_SNAPSHOTS = True
+        result = job_scraper._scrape_personio("acme.jobs.personio.com", "42")
+        if fetched != ["https://acme.jobs.personio.com/xml"]:
+            print(f"✗ Personio feed fetched from {fetched}")
+            ok = False
+        if result.get("title") != "Data Engineer" or "Build pipelines" not in result.get("description", ""):
+            print(f"✗ Personio feed position not parsed: {result.get('title')!r}")
+            ok = False
+
+        body = bomb
+        try:
+            job_scraper._load_personio_feed("acme.jobs.personio.com")
+            print("✗ Personio feed with a DOCTYPE was parsed")
+            ok = False
+        except Exception:
+            pass
+
+        job_scraper.BOARD_SNAPSHOTS = False
+        fetched.clear()
+        job_scraper._scrape_personio("acme.jobs.personio.com", "42")
+        if fetched != ["https://acme.jobs.personio.com/job/42"]:
+            print(f"✗ Personio page fetched from {fetched}")
+            ok = False
+    finally:
+        job_scraper.http_get, job_scraper._board_index, job_scraper.BOARD_SNAPSHOTS = saved
+    if ok:
+        print("✓ Personio feed rejects DTDs and keeps the posting's domain")
+    return ok
+
+def check_http_cache():
+    """Check ETag revalidation, stale-on-error and streamed-body limits
+    against a local server."""
+    import tempfile
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from modules import http_client
+
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append((self.path, self.headers.get("If-None-Match")))
+            if self.path == "/posting" and self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body, ctype = b"<html>posting</html>", "text/html"
+            if self.path == "/big":
+                body = b"<p>" + b"x" * 20000 + b"</p>"
+            elif self.path == "/brochure.pdf":
+                body, ctype = b"%PDF-1.4", "application/pdf"
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            if self.path == "/posting":
+                self.send_header("ETag", '"v1"')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    saved_dir = http_client.CACHE_DIR
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        http_client.CACHE_DIR = Path(tmp)
+        try:
+            # Stale entry revalidated with its ETag: 304 serves the cached body
+            http_client.http_get(f"{base}/posting", cache=True, ttl=0.05)
+            time.sleep(0.1)
+            before = http_client.transport_stats()["revalidated"]
+            resp = http_client.http_get(f"{base}/posting", cache=True, ttl=0.05)
+            if seen[-1] != ("/posting", '"v1"') or resp.status_code != 200:
+                print(f"✗ stale entry not revalidated with If-None-Match: {seen[-1]}")
+                ok = False
+            if resp.text != "<html>posting</html>" or (
+                http_client.transport_stats()["revalidated"] != before + 1
+            ):
+                print("✗ 304 did not serve the cached body")
+                ok = False
+
+            # Byte cap and Content-Type check on streamed fetches
+            resp = http_client.http_get(f"{base}/big", max_bytes=1000)
+            if not resp.truncated or len(resp.content) != 1000:
+                print(f"✗ max_bytes=1000 kept {len(resp.content)} bytes")
+                ok = False
+            try:
+                http_client.http_get(
+                    f"{base}/brochure.pdf", content_types=http_client.HTML_CONTENT_TYPES
+                )
+                print("✗ application/pdf accepted by an HTML-only fetch")
+                ok = False
+            except http_client.UnexpectedContent:
+                pass
+
+            # Network down: the stale entry is served instead of an error
+            server.shutdown()
+            server.server_close()
+            time.sleep(0.1)
+            try:
+                resp = http_client.http_get(f"{base}/posting", cache=True, ttl=0.05)
+                if not getattr(resp, "from_cache", False):
+                    print("✗ network error did not fall back to the stale entry")
+                    ok = False
+            except Exception as e:
+                print(f"✗ network error raised instead of serving stale: {e}")
+                ok = False
+        finally:
+            http_client.CACHE_DIR = saved_dir
+            server.server_close()
+    if ok:
+        print("✓ HTTP cache revalidates, serves stale, and enforces body limits")
+    return ok
+
+# Career pages wrapping an ATS embed: (page URL, page HTML, expected
+# (adapter, args, verify) or None)
+_GH_JID = "4012345"
+_POSTING_UUID = "5ac1e7a2-93d4-4f0e-8a6b-1c2d3e4f5a6b"
+_OTHER_UUID = "0f9e8d7c-6b5a-4c3d-9e2f-1a0b9c8d7e6f"
+_EMBED_SAMPLES = {
+    "greenhouse-iframe": (
+        "https://acme.com/careers",
+        "<iframe src='https://boards.greenhouse.io/embed/job_app?for=acme&amp;token=4012345'>",
+        ("_scrape_greenhouse", ("acme", _GH_JID), False),
+    ),
+    "greenhouse-board-script": (
+        f"https://acme.com/careers/job?gh_jid={_GH_JID}",
+        "<script src='https://boards.greenhouse.io/embed/job_board/js?for=acme'></script>",
+        ("_scrape_greenhouse", ("acme", _GH_JID), False),
+    ),
+    "ashby-embed": (
+        f"https://acme.com/careers?ashby_jid={_POSTING_UUID}",
+        "<script src='https://jobs.ashbyhq.com/acme/embed?version=2'></script>",
+        ("_scrape_ashby", ("acme", _POSTING_UUID), False),
+    ),
+    "lever-api-script": (
+        f"https://acme.com/jobs?lever-via=site&leverId={_POSTING_UUID}",
+        "<script src='https://api.lever.co/v0/postings/acme?mode=json'></script>",
+        ("_scrape_lever", ("acme", _POSTING_UUID), False),
+    ),
+    "lever-widget": (
+        f"https://acme.com/jobs?lever_job={_POSTING_UUID}",
+        "<div id='lever-jobs-embed'></div><script>window.leverJobsOptions = "
+        "{accountName: 'acme', includeCss: true};</script>",
+        ("_scrape_lever", ("acme", _POSTING_UUID), False),
+    ),
+    "lever-link-guessed": (
+        f"https://acme.com/jobs/{_POSTING_UUID}",
+        "<a href='https://jobs.lever.co/acme'>All jobs</a>",
+        ("_scrape_lever", ("acme", _POSTING_UUID), True),
+    ),
+    "lever-two-links": (
+        "https://acme.com/jobs/backend",
+        f"<a href='https://jobs.lever.co/acme/{_POSTING_UUID}'>Backend</a>"
+        f"<a href='https://jobs.lever.co/acme/{_OTHER_UUID}'>Frontend</a>",
+        None,
+    ),
+    "greenhouse-jid-without-board": (
+        f"https://acme.com/careers/job?gh_jid={_GH_JID}",
+        "<h1>Backend Engineer</h1>",
+        None,
+    ),
+}
+
+
+def check_embedded_ats():
+    """Check ATS fingerprinting on career pages that wrap an embed."""
+    from modules import job_scraper
+
+    ok = True
+    for name, (url, html, expected) in _EMBED_SAMPLES.items():
+        found = job_scraper._embedded_ats(url, html)
+        if found:
+            adapter, args, verify = found
+            found = (adapter.__name__, tuple(args), verify)
+        if found != expected:
+            print(f"✗ {name}: fingerprinted as {found}, expected {expected}")
+            ok = False
+    if ok:
+        print(f"✓ embedded ATS fingerprinting on {len(_EMBED_SAMPLES)} pages")
+    return ok
+
+def check_xhr_template():
+    """Check that a captured posting endpoint is learned from the right payload,
+    reused only on matching URLs, and dropped when it serves another posting."""
+    import tempfile
+    from modules import http_client, job_scraper
+
+    description = "<p>Lead discovery for the payouts product.</p>" * 6
+
+    def posting(posting_id, title):
+        return {"job": {"id": posting_id, "title": title, "body": description, "org": "Acme"}}
+
+    listing = {
+        "url": "https://careers.acme.com/api/jobs?page=1",
+        "method": "GET", "body": "", "headers": {},
+        "data": {"jobs": [{"title": "Senior PM", "body": description}]},
+    }
+    # A listing requested with the posting id, no id beside each title
+    similar = {
+        "url": "https://careers.acme.com/api/postings/4821/similar",
+        "method": "GET", "body": "", "headers": {},
+        "data": {"jobs": [{"title": "Senior PM", "body": description}]},
+    }
+    # The same posting object, but from an endpoint without its id
+    featured = {
+        "url": "https://careers.acme.com/api/featured",
+        "method": "GET", "body": "", "headers": {},
+        "data": posting(4821, "Senior PM"),
+    }
+    detail = {
+        "url": "https://careers.acme.com/api/postings/4821",
+        "method": "GET", "body": "", "headers": {"accept": "application/json"},
+        "data": posting(4821, "Senior PM"),
+    }
+
+    class Response:
+        def __init__(self, data):
+            self.data = data
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.data
+
+    served = {}
+
+    def fake_get(url, **kwargs):
+        return Response(served[url])
+
+    saved = http_client.CACHE_DIR, job_scraper.http_get
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        http_client.CACHE_DIR = Path(tmp)
+        job_scraper.http_get = fake_get
+        try:
+            page = "https://careers.acme.com/jobs/4821-senior-pm"
+            rendered = {"title": "Senior PM", "company": "Acme"}
+
+            # No posting id in the request, or a listing: nothing to learn
+            job_scraper._learn_xhr_template(page, rendered, [listing, similar, featured])
+            if job_scraper._xhr_template("https://careers.acme.com/jobs/5133-data-engineer"):
+                print("✗ template learned from a listing or an id-less endpoint")
+                ok = False
+
+            job_scraper._learn_xhr_template(page, rendered, [listing, similar, featured, detail])
+            template = job_scraper._xhr_template("https://careers.acme.com/jobs/5133-data-engineer")
+            if not template or template["api"] != "https://careers.acme.com/api/postings/{seg1_id}":
+                print(f"✗ posting endpoint not templated: {template and template['api']}")
+                ok = False
+            if job_scraper._xhr_template("https://careers.acme.com/blog/5133-launch-notes"):
+                print("✗ template reused on a URL of another shape")
+                ok = False
+
+            served["https://careers.acme.com/api/postings/5133"] = posting(5133, "Data Engineer")
+            result = job_scraper._try_xhr_template("https://careers.acme.com/jobs/5133-data-engineer")
+            if not result or result["title"] != "Data Engineer" or result["company"] != "Acme":
+                print(f"✗ captured endpoint not reused: {result}")
+                ok = False
+
+            # The endpoint now answers with another posting: drop the template
+            served["https://careers.acme.com/api/postings/6002"] = posting(4821, "Senior PM")
+            if job_scraper._try_xhr_template("https://careers.acme.com/jobs/6002-designer"):
+                print("✗ endpoint serving another posting was trusted")
+                ok = False
+            if job_scraper._xhr_template("https://careers.acme.com/jobs/5133-data-engineer"):
+                print("✗ failing template kept")
+                ok = False
+        finally:
+            http_client.CACHE_DIR, job_scraper.http_get = saved
+    if ok:
+        print("✓ XHR endpoint templates are learned, matched and dropped")
+    return ok
+
+def check_retry_deadline():
+    """Check that a 503 with a long Retry-After fails within the deadline
+    instead of sleeping through it."""
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from modules import http_client
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(503)
+            self.send_header("Retry-After", "5")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    start = time.monotonic()
+    try:
+        with http_client.deadline_scope(1):
+            http_client.http_get(f"http://127.0.0.1:{server.server_port}/busy")
+        outcome = "returned"
+    except http_client.DeadlineExceeded:
+        outcome = "deadline"
+    except Exception as e:
+        outcome = type(e).__name__
+    finally:
+        server.shutdown()
+        server.server_close()
+    elapsed = time.monotonic() - start
+    if outcome != "deadline" or elapsed > 1.5:
+        print(f"✗ retry on 503 {outcome} after {elapsed:.1f}s under a 1s deadline")
+        return False
+    print("✓ retry backoff stays within the deadline")
+    return True
+
 def check_subprocess():
     """Check that CLI commands run without errors."""
     checks = [
@@ -94,6 +852,20 @@ def main():
         ("Python", check_python),
         ("Imports", check_imports),
         ("Files", check_files),
+        ("JD sections", check_jd_sections),
+        ("JD headings", check_jd_headings),
+        ("HTML engines", check_html_engines),
+        ("Hedged scrape", check_hedge_wait),
+        ("Hedge cancel", check_hedge_cancel),
+        ("Strategy memory", check_dead_posting),
+        ("Research budget", check_research_budget),
+        ("Board snapshots", check_board_snapshots_off),
+        ("Ashby fallback", check_ashby_fallback),
+        ("Personio feed", check_personio_feed),
+        ("HTTP cache", check_http_cache),
+        ("Retry deadline", check_retry_deadline),
+        ("Embedded ATS", check_embedded_ats),
+        ("XHR templates", check_xhr_template),
         ("Subprocess", check_subprocess),
     ]
     
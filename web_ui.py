@@ -3,6 +3,7 @@
 
 import subprocess
 import signal
+import atexit
 import json
 import os
 from pathlib import Path
@@ -27,6 +28,9 @@ RESUME_VARIANTS = {
 running_processes = {1: None, 2: None, 3: None}
 process_lock = Lock()
 
+# Shared headless Chromium for all pipeline subprocesses (see modules/browser_pool.py)
+browser_server = None
+
 
 def load_stats():
     """Load usage stats from file."""
@@ -115,7 +119,7 @@ def stop_process(slot_num):
         return "No process to stop"
 
 
-def _run_pipeline(job_url, company_url, questions, provider, writing_model, resume_variant, slot_num):
+def _run_pipeline(job_url, company_url, questions, provider, writing_model, resume_variant, scrape_budget, slot_num):
     """Internal generator for running the pipeline."""
     global running_processes
 
@@ -133,6 +137,9 @@ def _run_pipeline(job_url, company_url, questions, provider, writing_model, resu
             if q.strip():
                 cmd.extend(["--questions", q.strip()])
 
+    if scrape_budget is not None:
+        cmd.extend(["--scrape-budget", str(int(scrape_budget))])
+
     full_env = os.environ.copy()
     full_env["LLM_PROVIDER"] = provider
     full_env["PYTHONUNBUFFERED"] = "1"
@@ -166,24 +173,35 @@ def _run_pipeline(job_url, company_url, questions, provider, writing_model, resu
     wm_label = writing_model or "Gemini Flash"
     yield f"🚀 Starting with {provider} (ATS) · {wm_label} (writing) · {variant_label} resume...\n\n"
 
-    try:
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            cwd=str(PROJECT_ROOT),
-            env=full_env,
-            preexec_fn=os.setsid,
-        )
-    except Exception as e:
-        yield f"❌ Failed to start: {e}"
-        return
-
+    # Recycle the shared browser only while no run is using it; the lock
+    # keeps another slot from starting in between
+    process = None
     with process_lock:
-        running_processes[slot_num] = process
+        if browser_server:
+            if any(running_processes.values()):
+                endpoint = browser_server.endpoint
+            else:
+                endpoint = browser_server.recycle_if_due()
+            if endpoint:
+                full_env["BROWSER_WS_ENDPOINT"] = endpoint
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                cwd=str(PROJECT_ROOT),
+                env=full_env,
+                preexec_fn=os.setsid,
+            )
+            running_processes[slot_num] = process
+        except Exception as e:
+            start_error = e
+    if process is None:
+        yield f"❌ Failed to start: {start_error}"
+        return
 
     output_lines = []
     providers_used = set()
@@ -232,14 +250,14 @@ def _run_pipeline(job_url, company_url, questions, provider, writing_model, resu
 
 
 # Create separate generator functions for each slot (can't use lambda with generators)
-def run_slot_1(job_url, company_url, questions, provider, writing_model, resume_variant):
-    yield from _run_pipeline(job_url, company_url, questions, provider, writing_model, resume_variant, 1)
+def run_slot_1(job_url, company_url, questions, provider, writing_model, resume_variant, scrape_budget):
+    yield from _run_pipeline(job_url, company_url, questions, provider, writing_model, resume_variant, scrape_budget, 1)
 
-def run_slot_2(job_url, company_url, questions, provider, writing_model, resume_variant):
-    yield from _run_pipeline(job_url, company_url, questions, provider, writing_model, resume_variant, 2)
+def run_slot_2(job_url, company_url, questions, provider, writing_model, resume_variant, scrape_budget):
+    yield from _run_pipeline(job_url, company_url, questions, provider, writing_model, resume_variant, scrape_budget, 2)
 
-def run_slot_3(job_url, company_url, questions, provider, writing_model, resume_variant):
-    yield from _run_pipeline(job_url, company_url, questions, provider, writing_model, resume_variant, 3)
+def run_slot_3(job_url, company_url, questions, provider, writing_model, resume_variant, scrape_budget):
+    yield from _run_pipeline(job_url, company_url, questions, provider, writing_model, resume_variant, scrape_budget, 3)
 
 
 def create_app_form(slot_num):
@@ -278,6 +296,13 @@ def create_app_form(slot_num):
                 value="gemini",
                 label="ATS provider (step 5)",
             )
+        scrape_budget = gr.Slider(
+            minimum=0,
+            maximum=300,
+            step=15,
+            value=float(os.getenv("SCRAPE_BUDGET", "90")),
+            label="Scrape / research time budget (s, 0 = no limit)",
+        )
 
         with gr.Row():
             submit_btn = gr.Button("▶ Run", variant="primary", scale=3)
@@ -302,7 +327,7 @@ def create_app_form(slot_num):
                 show_label=False,
             )
 
-    return job_url, company_url, questions, provider, writing_model, resume_variant, submit_btn, stop_btn, output, console
+    return job_url, company_url, questions, provider, writing_model, resume_variant, scrape_budget, submit_btn, stop_btn, output, console
 
 
 def create_ui():
@@ -321,20 +346,20 @@ def create_ui():
         with gr.Row():
             with gr.Column():
                 gr.Markdown("### Application 1")
-                j1, c1, q1, p1, wm1, r1, b1, s1, o1, con1 = create_app_form(1)
+                j1, c1, q1, p1, wm1, r1, t1, b1, s1, o1, con1 = create_app_form(1)
 
             with gr.Column():
                 gr.Markdown("### Application 2")
-                j2, c2, q2, p2, wm2, r2, b2, s2, o2, con2 = create_app_form(2)
+                j2, c2, q2, p2, wm2, r2, t2, b2, s2, o2, con2 = create_app_form(2)
 
             with gr.Column():
                 gr.Markdown("### Application 3")
-                j3, c3, q3, p3, wm3, r3, b3, s3, o3, con3 = create_app_form(3)
+                j3, c3, q3, p3, wm3, r3, t3, b3, s3, o3, con3 = create_app_form(3)
 
         # Run buttons - use dedicated generator functions (not lambdas)
-        b1.click(fn=run_slot_1, inputs=[j1, c1, q1, p1, wm1, r1], outputs=[o1], concurrency_limit=None)
-        b2.click(fn=run_slot_2, inputs=[j2, c2, q2, p2, wm2, r2], outputs=[o2], concurrency_limit=None)
-        b3.click(fn=run_slot_3, inputs=[j3, c3, q3, p3, wm3, r3], outputs=[o3], concurrency_limit=None)
+        b1.click(fn=run_slot_1, inputs=[j1, c1, q1, p1, wm1, r1, t1], outputs=[o1], concurrency_limit=None)
+        b2.click(fn=run_slot_2, inputs=[j2, c2, q2, p2, wm2, r2, t2], outputs=[o2], concurrency_limit=None)
+        b3.click(fn=run_slot_3, inputs=[j3, c3, q3, p3, wm3, r3, t3], outputs=[o3], concurrency_limit=None)
 
         # Stop buttons
         s1.click(fn=lambda: stop_process(1), outputs=[con1])
@@ -353,7 +378,20 @@ def create_ui():
     return app
 
 
+def start_shared_browser():
+    """Start one warm Chromium that every pipeline subprocess connects to.
+    It is restarted between runs once BROWSER_RECYCLE_MINUTES have passed
+    (BROWSER_RECYCLE_PAGES does not apply: pages open in the subprocesses)."""
+    global browser_server
+    from modules.browser_pool import BrowserServer
+
+    browser_server = BrowserServer()
+    if browser_server.recycle_if_due():
+        atexit.register(browser_server.stop)
+
+
 if __name__ == "__main__":
+    start_shared_browser()
     app = create_ui()
     app.queue(default_concurrency_limit=None)
     app.launch(